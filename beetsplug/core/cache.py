@@ -56,6 +56,12 @@ class Cache:
         logger.debug("Initializing cache at: {}", db_path)
         self._initialize_db()
         self._initialize_spotify_cache()
+        self._initialize_sync_tables()
+        self._initialize_sonic_cache()
+        self._initialize_server_query_cache()
+        self._initialize_playlist_validators()
+        self._initialize_import_state()
+        self._initialize_spotify_resolution_cache()
 
     def _initialize_db(self):
         """Initialize the SQLite database."""
@@ -158,6 +164,446 @@ class Cache:
             logger.error("Failed to initialize Spotify cache tables: {}", e)
             raise
 
+    def _initialize_sync_tables(self):
+        """Initialize tables that track library sync progress."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS sync_watermark (
+                        section_id TEXT PRIMARY KEY,
+                        watermark REAL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize sync tables: {}", e)
+            raise
+
+    def get_sync_watermark(self, section_id):
+        """Return the last synced Plex timestamp for a library section."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    "SELECT watermark FROM sync_watermark WHERE section_id = ?",
+                    (str(section_id),),
+                )
+                row = cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error("Sync watermark lookup failed: {}", e)
+            return None
+
+    def set_sync_watermark(self, section_id, watermark):
+        """Advance the sync watermark for a library section.
+
+        The stored value never moves backwards.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    INSERT INTO sync_watermark (section_id, watermark, updated_at)
+                    VALUES (?, ?, CURRENT_TIMESTAMP)
+                    ON CONFLICT(section_id) DO UPDATE SET
+                        watermark = MAX(watermark, excluded.watermark),
+                        updated_at = CURRENT_TIMESTAMP
+                """,
+                    (str(section_id), float(watermark)),
+                )
+                conn.commit()
+                logger.debug("Sync watermark for section {} set to {}", section_id, watermark)
+        except Exception as e:
+            logger.error("Sync watermark storage failed: {}", e)
+
+    def _initialize_sonic_cache(self):
+        """Initialize the sonically similar neighbor cache."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS sonic_neighbors (
+                        rating_key INTEGER PRIMARY KEY,
+                        neighbors TEXT,
+                        track_updated_at REAL,
+                        analysis_version TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize sonic neighbor cache: {}", e)
+            raise
+
+    def get_sonic_neighbors(self, rating_keys):
+        """Return cached neighbor rows for ``rating_keys``.
+
+        Maps each cached rating key to a dict with ``neighbors``,
+        ``track_updated_at``, ``analysis_version`` and ``created_at``.
+        """
+        keys = [int(key) for key in rating_keys]
+        found = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    cursor.execute(
+                        f"""
+                        SELECT rating_key, neighbors, track_updated_at,
+                               analysis_version, created_at
+                        FROM sonic_neighbors
+                        WHERE rating_key IN ({', '.join('?' for _ in chunk)})
+                    """,
+                        chunk,
+                    )
+                    for key, neighbors, updated_at, version, created_at in cursor.fetchall():
+                        found[key] = {
+                            "neighbors": json.loads(neighbors),
+                            "track_updated_at": updated_at,
+                            "analysis_version": version,
+                            "created_at": datetime.fromisoformat(created_at),
+                        }
+        except Exception as e:
+            logger.error("Sonic neighbor cache lookup failed: {}", e)
+        return found
+
+    def set_sonic_neighbors(self, rating_key, neighbors, track_updated_at, analysis_version):
+        """Store the sonically similar neighbors of a track."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    REPLACE INTO sonic_neighbors
+                        (rating_key, neighbors, track_updated_at, analysis_version, created_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    (
+                        int(rating_key),
+                        json.dumps(neighbors),
+                        track_updated_at,
+                        None if analysis_version is None else str(analysis_version),
+                    ),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Sonic neighbor cache storage failed: {}", e)
+
+    def get_all_sonic_neighbors(self):
+        """Return ``{rating_key: neighbors}`` for every cached track."""
+        found = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT rating_key, neighbors FROM sonic_neighbors")
+                for key, neighbors in cursor:
+                    found[key] = json.loads(neighbors)
+        except Exception as e:
+            logger.error("Sonic neighbor graph load failed: {}", e)
+        return found
+
+
+    def _initialize_server_query_cache(self):
+        """Initialize the cache of filtered Plex track queries."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS server_query_cache (
+                        query_key TEXT NOT NULL,
+                        section_id TEXT NOT NULL,
+                        rating_keys TEXT,
+                        section_updated_at REAL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (query_key, section_id)
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize server query cache: {}", e)
+            raise
+
+    def get_server_query(self, query_key, section_id):
+        """Return the cached result of a filtered track query, or ``None``.
+
+        The result is a dict with the ordered ``rating_keys``, the section's
+        ``section_updated_at`` when it was stored and ``created_at``.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT rating_keys, section_updated_at, created_at
+                    FROM server_query_cache
+                    WHERE query_key = ? AND section_id = ?
+                """,
+                    (query_key, str(section_id)),
+                )
+                row = cursor.fetchone()
+                if row:
+                    return {
+                        "rating_keys": json.loads(row[0]),
+                        "section_updated_at": row[1],
+                        "created_at": datetime.fromisoformat(row[2]),
+                    }
+        except Exception as e:
+            logger.error("Server query cache lookup failed: {}", e)
+        return None
+
+    def set_server_query(self, query_key, section_id, rating_keys, section_updated_at):
+        """Store the ordered rating keys returned by a filtered track query."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    REPLACE INTO server_query_cache
+                        (query_key, section_id, rating_keys, section_updated_at, created_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    (query_key, str(section_id), json.dumps(list(rating_keys)), section_updated_at),
+                )
+                conn.commit()
+                logger.debug("Cached {} rating keys for server query", len(rating_keys))
+        except Exception as e:
+            logger.error("Server query cache storage failed: {}", e)
+
+    def _initialize_playlist_validators(self):
+        """Initialize the table of HTTP validators for playlist sources."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS playlist_validators (
+                        playlist_id TEXT NOT NULL,
+                        source TEXT NOT NULL,
+                        etag TEXT,
+                        last_modified TEXT,
+                        content_hash TEXT,
+                        data TEXT,
+                        checked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (playlist_id, source)
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize playlist validators: {}", e)
+            raise
+
+    def get_playlist_validators(self, playlist_id, source, max_age_days=30):
+        """Return validators and parsed data of a playlist source, or ``None``.
+
+        Unlike :meth:`get_playlist_cache` the entry outlives the 72h expiry;
+        it is only used to revalidate the source with the server. The result
+        is a dict with ``etag``, ``last_modified``, ``content_hash`` and the
+        song list stored as ``data``.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                expiry = datetime.now() - timedelta(days=max_age_days)
+                cursor.execute(
+                    "DELETE FROM playlist_validators WHERE checked_at < ?",
+                    (expiry.isoformat(),),
+                )
+                cursor.execute(
+                    """
+                    SELECT etag, last_modified, content_hash, data
+                    FROM playlist_validators
+                    WHERE playlist_id = ? AND source = ?
+                """,
+                    (playlist_id, source),
+                )
+                row = cursor.fetchone()
+                conn.commit()
+                if row:
+                    return {
+                        "etag": row[0],
+                        "last_modified": row[1],
+                        "content_hash": row[2],
+                        "data": json.loads(row[3]) if row[3] else None,
+                    }
+        except Exception as e:
+            logger.error("{} playlist validator lookup failed: {}", source, e)
+        return None
+
+    def set_playlist_validators(self, playlist_id, source, data, etag=None,
+                                last_modified=None, content_hash=None):
+        """Store the validators of a playlist source with its parsed songs."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    REPLACE INTO playlist_validators
+                        (playlist_id, source, etag, last_modified, content_hash, data, checked_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        playlist_id,
+                        source,
+                        etag,
+                        last_modified,
+                        content_hash,
+                        json.dumps(
+                            data,
+                            default=lambda obj: obj.isoformat() if isinstance(obj, datetime) else str(obj),
+                        ),
+                        datetime.now().isoformat(),
+                    ),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("{} playlist validator storage failed: {}", source, e)
+
+    def _initialize_import_state(self):
+        """Initialize the table of song-to-track mappings of imported playlists."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS imported_playlist_state (
+                        playlist_name TEXT PRIMARY KEY,
+                        song_hash TEXT,
+                        mapping TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize imported playlist state: {}", e)
+            raise
+
+    def get_import_state(self, playlist_name):
+        """Return the last import of a playlist, or ``None``.
+
+        The result is a dict with the ``song_hash`` of the song list, the
+        ordered ``mapping`` of ``[song_key, rating_key]`` pairs, where the
+        rating key is ``None`` for songs that were not matched, and
+        ``created_at``.
+        """
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT song_hash, mapping, created_at
+                    FROM imported_playlist_state WHERE playlist_name = ?
+                """,
+                    (playlist_name,),
+                )
+                row = cursor.fetchone()
+                if row:
+                    return {
+                        "song_hash": row[0],
+                        "mapping": json.loads(row[1]),
+                        "created_at": datetime.fromisoformat(row[2]),
+                    }
+        except Exception as e:
+            logger.error("Imported playlist state lookup failed: {}", e)
+        return None
+
+    def set_import_state(self, playlist_name, song_hash, mapping):
+        """Store the song list hash and song-to-track mapping of an import."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    REPLACE INTO imported_playlist_state
+                        (playlist_name, song_hash, mapping, created_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    (playlist_name, song_hash, json.dumps([list(pair) for pair in mapping])),
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Imported playlist state storage failed: {}", e)
+
+    def _initialize_spotify_resolution_cache(self):
+        """Initialize the cache of Spotify track ids resolved for beets items."""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS spotify_item_resolution (
+                        item_id INTEGER PRIMARY KEY,
+                        fingerprint TEXT NOT NULL,
+                        spotify_id TEXT,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """
+                )
+                conn.commit()
+        except Exception as e:
+            logger.error("Failed to initialize Spotify resolution cache: {}", e)
+            raise
+
+    def get_spotify_resolutions(self, item_ids, negative_ttl_days=7):
+        """Return ``{item_id: (fingerprint, spotify_id)}`` for cached items.
+
+        ``spotify_id`` is ``None`` for items no match was found for; those
+        entries are ignored once older than ``negative_ttl_days``.
+        """
+        ids = [int(item_id) for item_id in item_ids]
+        found = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    cursor.execute(
+                        f"""
+                        SELECT item_id, fingerprint, spotify_id
+                        FROM spotify_item_resolution
+                        WHERE item_id IN ({', '.join('?' for _ in chunk)})
+                          AND (spotify_id IS NOT NULL OR created_at >= datetime('now', ?))
+                    """,
+                        chunk + [f"-{float(negative_ttl_days)} days"],
+                    )
+                    for item_id, fingerprint, spotify_id in cursor.fetchall():
+                        found[item_id] = (fingerprint, spotify_id)
+        except Exception as e:
+            logger.error("Spotify resolution cache lookup failed: {}", e)
+        return found
+
+    def set_spotify_resolutions(self, entries):
+        """Store ``(item_id, fingerprint, spotify_id)`` search results."""
+        rows = [(int(item_id), fingerprint, spotify_id) for item_id, fingerprint, spotify_id in entries]
+        if not rows:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                cursor = conn.cursor()
+                cursor.executemany(
+                    """
+                    REPLACE INTO spotify_item_resolution
+                        (item_id, fingerprint, spotify_id, created_at)
+                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    rows,
+                )
+                conn.commit()
+                logger.debug("Cached Spotify resolution of {} items", len(rows))
+        except Exception as e:
+            logger.error("Spotify resolution cache storage failed: {}", e)
+
     def clear_expired_spotify_cache(self):
         """Clear expired Spotify cache entries with randomized expiration."""
         try:
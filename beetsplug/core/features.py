@@ -0,0 +1,148 @@
+"""Columnar track features shared by all smart playlists of a run.
+
+Smart playlist generators used to re-read ratings, play counts, years and
+popularity from every beets item with ``getattr`` for each playlist. The
+:class:`FeatureTable` reads them once into NumPy arrays aligned with the
+``plex_lookup`` entries so generators can filter with boolean masks and
+score slices of the same arrays.
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+
+def _float_or(value, default):
+    try:
+        return float(value if value is not None else default)
+    except (TypeError, ValueError):
+        return default
+
+
+def extract_track_features(tracks: Sequence) -> Dict[str, np.ndarray]:
+    """Read the raw scoring inputs of ``tracks`` into NumPy arrays.
+
+    Returns a dict of float arrays: ``rating``, ``last_played`` (NaN when
+    never played, infinite when unparsable), ``play_count``, ``popularity``
+    and ``year`` (NaN when not an integer).
+    """
+    n = len(tracks)
+    rating = np.zeros(n)
+    last_played = np.full(n, np.nan)
+    play_count = np.zeros(n)
+    popularity = np.zeros(n)
+    year = np.full(n, np.nan)
+
+    for i, t in enumerate(tracks):
+        rating[i] = _float_or(getattr(t, 'plex_userrating', 0) or 0, 0.0)
+        ts = getattr(t, 'plex_lastviewedat', None)
+        if ts is not None:
+            last_played[i] = _float_or(ts, np.inf)
+        try:
+            play_count[i] = int(getattr(t, 'plex_viewcount', 0) or 0)
+        except (TypeError, ValueError):
+            pass
+        popularity[i] = _float_or(getattr(t, 'spotify_track_popularity', 0) or 0, 0.0)
+        y = getattr(t, 'year', None)
+        try:
+            year[i] = int(y)
+        except (TypeError, ValueError):
+            pass
+
+    return {
+        'rating': rating,
+        'last_played': last_played,
+        'play_count': play_count,
+        'popularity': popularity,
+        'year': year,
+    }
+
+
+def _genre_set(item) -> frozenset:
+    genre = getattr(item, 'genre', None)
+    if genre is None:
+        genre = getattr(item, 'genres', None)
+    if not genre:
+        return frozenset()
+    if isinstance(genre, str):
+        return frozenset(g.lower().strip() for g in genre.split(','))
+    return frozenset(str(g).lower().strip() for g in genre)
+
+
+class FeatureTable:
+    """NumPy feature columns for the items of a ``plex_lookup``.
+
+    Row ``i`` describes ``items[i]``, whose Plex rating key is ``keys[i]``.
+    """
+
+    def __init__(self, plex_lookup: Dict) -> None:
+        self.source = plex_lookup
+        self.items: List = list(plex_lookup.values())
+        raw_keys = list(plex_lookup.keys())
+        self.row_of: Dict = {key: row for row, key in enumerate(raw_keys)}
+        self.linked = np.array([bool(key) for key in raw_keys], dtype=bool)
+        self.rows = np.arange(len(self.items))
+        features = extract_track_features(self.items)
+        self.features = features
+        self.rating = features['rating']
+        self.play_count = features['play_count']
+        self.year = features['year']
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @cached_property
+    def filter_rating(self) -> np.ndarray:
+        """Rating used by ``min_rating`` filters (``rating`` before Plex's)."""
+        return np.array(
+            [
+                _float_or(
+                    getattr(item, 'rating', 0) or getattr(item, 'plex_userrating', 0) or 0,
+                    0.0,
+                )
+                for item in self.items
+            ]
+        )
+
+    @cached_property
+    def genre_sets(self) -> List[frozenset]:
+        return [_genre_set(item) for item in self.items]
+
+    def genre_mask(self, rows: np.ndarray, genres: Iterable[str]) -> np.ndarray:
+        """Return which ``rows`` share at least one genre with ``genres``."""
+        wanted = {str(g).lower().strip() for g in genres}
+        sets = self.genre_sets
+        return np.fromiter(
+            (not sets[row].isdisjoint(wanted) for row in rows), dtype=bool, count=len(rows)
+        )
+
+    def rows_for_keys(self, keys: Iterable) -> np.ndarray:
+        """Rows of ``keys`` present in the table, in the given order."""
+        row_of = self.row_of
+        return np.fromiter(
+            (row_of[key] for key in keys if key in row_of), dtype=np.int64
+        )
+
+    @cached_property
+    def row_of_id(self) -> Dict:
+        """Row of each beets item id."""
+        return {getattr(item, 'id', None): row for row, item in enumerate(self.items)}
+
+    def rows_for_ids(self, item_ids: Iterable[int]) -> np.ndarray:
+        """Rows of the beets items ``item_ids`` present in the table."""
+        row_of_id = self.row_of_id
+        return np.fromiter(
+            (row_of_id[item_id] for item_id in item_ids if item_id in row_of_id),
+            dtype=np.int64,
+        )
+
+    def items_at(self, rows: Iterable[int]) -> List:
+        items = self.items
+        return [items[row] for row in rows]
+
+    def subset(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """Feature arrays restricted to ``rows`` (for scoring)."""
+        return {name: column[rows] for name, column in self.features.items()}
@@ -0,0 +1,223 @@
+"""Column-projected reads of the beets library.
+
+Building ``plex_lookup`` from ``lib.items()`` materializes every fixed and
+flexible attribute of every item. Smart playlists only need a handful of
+them, so this module reads exactly those columns with a single grouped SQL
+query and wraps each row in a slotted :class:`ProjectedItem`. Anything else
+is loaded lazily from the full beets ``Item`` on first access. The year and
+rating filters of beets-based playlists are also compiled to SQL here.
+"""
+
+from __future__ import annotations
+
+import time
+import weakref
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from beets.library import Item
+
+# Fixed ``items`` columns to project. Only those present in the schema are
+# read: beets renamed ``genre`` to the multi-valued ``genres`` field.
+PROJECTED_FIXED = ("title", "album", "artist", "year", "genre", "genres")
+PROJECTED_FLEX = (
+    "plex_guid",
+    "plex_ratingkey",
+    "plex_userrating",
+    "plex_skipcount",
+    "plex_viewcount",
+    "plex_lastviewedat",
+    "plex_lastratedat",
+    "plex_updated",
+    "spotify_track_id",
+    "spotify_track_popularity",
+    "rating",
+)
+_PROJECTED = frozenset(("id",) + PROJECTED_FIXED + PROJECTED_FLEX)
+
+
+class ProjectedItem:
+    """Read-only stand-in for a beets ``Item`` holding projected fields.
+
+    Projected fields behave like on ``Item``: a flexible attribute that is
+    not set raises ``AttributeError``, so ``hasattr``/``getattr`` checks keep
+    working. Any other attribute loads the full ``Item`` once and delegates.
+    """
+
+    __slots__ = ("id",) + PROJECTED_FIXED + PROJECTED_FLEX + ("_lib", "_item")
+
+    def __init__(self, lib, item_id: int) -> None:
+        self._lib = lib
+        self._item = None
+        self.id = item_id
+
+    def __getattr__(self, name):
+        if name in _PROJECTED or name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.hydrate(), name)
+
+    def __contains__(self, key) -> bool:
+        return hasattr(self, key)
+
+    def hydrate(self):
+        """Return the full beets ``Item`` for this record."""
+        item = self._item
+        if item is None:
+            item = self._lib.get_item(self.id)
+            if item is None:
+                raise AttributeError(f"item {self.id} no longer exists")
+            self._item = item
+        return item
+
+    def __str__(self) -> str:
+        return "{} - {} - {}".format(
+            getattr(self, "artist", ""),
+            getattr(self, "album", ""),
+            getattr(self, "title", ""),
+        )
+
+    def __repr__(self) -> str:
+        return f"ProjectedItem(id={self.id}, title={getattr(self, 'title', '')!r})"
+
+
+def _item_columns(tx) -> List[str]:
+    rows = tx.query("PRAGMA table_info(items)")
+    return [row[1] for row in rows]
+
+
+def _build_query(fixed: Sequence[str], flex: Sequence[str]) -> Tuple[str, List[str]]:
+    select = ["i.id"] + [f"i.{column}" for column in fixed]
+    select += [
+        f"MAX(CASE WHEN a.key = ? THEN a.value END) AS flex_{n}" for n in range(len(flex))
+    ]
+    placeholders = ", ".join("?" for _ in flex)
+    sql = (
+        f"SELECT {', '.join(select)} FROM items i "
+        f"LEFT JOIN item_attributes a ON a.entity_id = i.id AND a.key IN ({placeholders}) "
+        "GROUP BY i.id"
+    )
+    return sql, list(flex) + list(flex)
+
+
+def iter_projected_items(lib, logger=None) -> Iterator[ProjectedItem]:
+    """Yield a :class:`ProjectedItem` for every item in ``lib``."""
+    _t0 = time.time()
+    with lib.transaction() as tx:
+        columns = set(_item_columns(tx))
+        fixed = [column for column in PROJECTED_FIXED if column in columns]
+        sql, subvals = _build_query(fixed, PROJECTED_FLEX)
+        rows = tx.query(sql, subvals)
+
+    converters: Dict[str, object] = {
+        key: Item._type(key) for key in list(fixed) + list(PROJECTED_FLEX)
+    }
+    offset = 1 + len(fixed)
+    for row in rows:
+        record = ProjectedItem(lib, row[0])
+        for n, column in enumerate(fixed, start=1):
+            setattr(record, column, converters[column].from_sql(row[n]))
+        for n, key in enumerate(PROJECTED_FLEX):
+            value = row[offset + n]
+            if value is not None:
+                setattr(record, key, converters[key].from_sql(value))
+        yield record
+
+    if logger is not None:
+        logger.debug(
+            "Projected {} beets items in {:.2f}s", len(rows), time.time() - _t0
+        )
+
+
+# Index letting SQLite find items by flexible attribute name (and value)
+# instead of scanning ``item_attributes``; used for ``plex_ratingkey``.
+ATTRIBUTE_INDEX = "plexsync_item_attributes_by_key"
+_indexed_libraries = weakref.WeakSet()
+
+
+def ensure_attribute_index(lib) -> None:
+    """Create the ``item_attributes (key, value)`` index once per library."""
+    if lib in _indexed_libraries:
+        return
+    with lib.transaction() as tx:
+        tx.script(
+            f"CREATE INDEX IF NOT EXISTS {ATTRIBUTE_INDEX} "
+            "ON item_attributes (key, value);"
+        )
+    _indexed_libraries.add(lib)
+
+
+def _rating_sql() -> str:
+    return "COALESCE(CAST(ur.value AS REAL), 0)"
+
+
+def _filter_rating_sql() -> str:
+    # beets' own ``rating`` wins over Plex's when it is set and non-zero
+    return "COALESCE(NULLIF(CAST(br.value AS REAL), 0), CAST(ur.value AS REAL), 0)"
+
+
+def build_linked_items_query(filters, playlist_type=None) -> Tuple[str, List]:
+    """Compile the year and rating filters of a beets-based playlist to SQL.
+
+    The query returns the ids of items linked to Plex (``plex_ratingkey``
+    set) that pass the ``include``/``exclude`` year filters, ``min_rating``
+    and the built-in constraints of ``playlist_type``. Years of 0 (unknown)
+    pass the year filters, as in the in-memory filters. Genre filters are
+    not compiled: genres are stored as delimited strings.
+    """
+    include = filters.get("include") or {}
+    exclude = filters.get("exclude") or {}
+    has_year = "(i.year IS NOT NULL AND i.year != 0)"
+    where = ["rk.key = 'plex_ratingkey'", "rk.value IS NOT NULL", "rk.value != ''"]
+    params: List = []
+
+    years = include.get("years") or {}
+    if "after" in years:
+        where.append(f"NOT ({has_year} AND i.year <= ?)")
+        params.append(years["after"])
+    if "before" in years:
+        where.append(f"NOT ({has_year} AND i.year >= ?)")
+        params.append(years["before"])
+    if "between" in years:
+        start_year, end_year = years["between"]
+        where.append(f"NOT ({has_year} AND i.year NOT BETWEEN ? AND ?)")
+        params.extend([start_year, end_year])
+
+    years = exclude.get("years") or {}
+    if "before" in years:
+        where.append(f"NOT ({has_year} AND i.year < ?)")
+        params.append(years["before"])
+    if "after" in years:
+        where.append(f"NOT ({has_year} AND i.year > ?)")
+        params.append(years["after"])
+
+    if "min_rating" in filters:
+        rating = _filter_rating_sql()
+        where.append(f"NOT ({rating} > 0 AND {rating} < ?)")
+        params.append(filters["min_rating"])
+
+    if playlist_type == "70s80s_flashback":
+        where.append(f"{has_year} AND i.year BETWEEN 1970 AND 1990")
+    elif playlist_type == "highly_rated":
+        where.append(f"{_rating_sql()} >= 7")
+
+    sql = (
+        "SELECT i.id FROM item_attributes rk "
+        "JOIN items i ON i.id = rk.entity_id "
+        "LEFT JOIN item_attributes ur ON ur.entity_id = i.id AND ur.key = 'plex_userrating' "
+        "LEFT JOIN item_attributes br ON br.entity_id = i.id AND br.key = 'rating' "
+        f"WHERE {' AND '.join(where)} ORDER BY i.id"
+    )
+    return sql, params
+
+
+def query_linked_item_ids(lib, filters, playlist_type=None, logger=None) -> List[int]:
+    """Return ids of Plex-linked items passing ``filters`` (see above)."""
+    _t0 = time.time()
+    ensure_attribute_index(lib)
+    sql, params = build_linked_items_query(filters, playlist_type)
+    with lib.transaction() as tx:
+        ids = [row[0] for row in tx.query(sql, params)]
+    if logger is not None:
+        logger.debug(
+            "SQL filter matched {} linked items in {:.3f}s", len(ids), time.time() - _t0
+        )
+    return ids
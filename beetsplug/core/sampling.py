@@ -0,0 +1,53 @@
+"""Weighted sampling without replacement.
+
+``numpy.random.Generator.choice(..., replace=False, p=...)`` draws one item
+at a time and renormalizes after each draw. Adding independent Gumbel noise
+to the log-weights and keeping the ``k`` largest keys draws from the very
+same distribution (sequential sampling proportional to ``exp(logits)``) in a
+single O(n) pass with ``argpartition``.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+def gumbel_top_k(logits, k: int, exclude: Optional[np.ndarray] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 seed: Optional[int] = None) -> np.ndarray:
+    """Sample ``k`` distinct indices with probabilities ``softmax(logits)``.
+
+    Args:
+        logits: Unnormalized log-weights; ``-inf`` entries are never chosen.
+        k: Number of indices to draw; fewer are returned when fewer are
+            eligible.
+        exclude: Optional boolean mask of indices that must not be chosen,
+            e.g. rows already selected by an earlier draw.
+        rng: Generator to draw the noise from.
+        seed: Seed for a fresh generator when ``rng`` is not given, so a
+            selection can be reproduced.
+
+    Returns:
+        Chosen indices in draw order (largest perturbed key first).
+    """
+    logits = np.asarray(logits, dtype=float)
+    if rng is None:
+        rng = np.random.default_rng(seed)
+
+    keys = logits + rng.gumbel(size=logits.shape)
+    keys[np.isnan(keys)] = -np.inf
+    if exclude is not None:
+        keys[np.asarray(exclude, dtype=bool)] = -np.inf
+
+    eligible = int(np.count_nonzero(keys > -np.inf))
+    k = min(int(k), eligible)
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if k < len(keys):
+        top = np.argpartition(-keys, k - 1)[:k]
+    else:
+        top = np.arange(len(keys))
+    return top[np.argsort(-keys[top], kind="stable")].astype(np.int64)
@@ -0,0 +1,140 @@
+"""Local graph of Plex's sonically similar edges.
+
+Every neighbor list ever cached becomes a set of weighted edges between
+rating keys. Discovery then runs as a random walk with restart (personalized
+PageRank) from recently played seeds over this graph. That reaches tracks
+several hops away from the listening history without extra Plex requests.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+def _similarity(distance) -> float:
+    """Turn a sonic distance (smaller is closer) into a positive edge weight."""
+    try:
+        distance = float(distance)
+    except (TypeError, ValueError):
+        return 1.0
+    if not np.isfinite(distance):
+        return 1.0
+    return 1.0 / (1.0 + max(0.0, distance))
+
+
+class SonicGraph:
+    """Sparse, undirected graph of sonically similar tracks.
+
+    ``adjacency`` maps a seed rating key to its cached neighbor entries
+    ``[key, distance, genres, rating]``. Edges are symmetrized because sonic
+    similarity is mutual even though Plex was only asked from one side.
+    """
+
+    def __init__(self, adjacency: Mapping[int, Sequence]) -> None:
+        index: Dict[int, int] = {}
+        genres: List[frozenset] = []
+        rating: List[Optional[float]] = []
+        distance: List[float] = []
+
+        def node(key) -> int:
+            row = index.get(key)
+            if row is None:
+                row = index[key] = len(index)
+                genres.append(frozenset())
+                rating.append(None)
+                distance.append(np.inf)
+            return row
+
+        sources, targets, weights = [], [], []
+        for seed, neighbors in adjacency.items():
+            src = node(int(seed))
+            for entry in neighbors or []:
+                key, dist, entry_genres, entry_rating = (list(entry) + [None] * 4)[:4]
+                if key is None:
+                    continue
+                dst = node(int(key))
+                if dst == src:
+                    continue
+                if entry_genres:
+                    genres[dst] = genres[dst] | frozenset(entry_genres)
+                if entry_rating is not None:
+                    rating[dst] = entry_rating
+                if dist is not None:
+                    distance[dst] = min(distance[dst], float(dist))
+                sources.append(src)
+                targets.append(dst)
+                weights.append(_similarity(dist))
+
+        n = len(index)
+        self.index = index
+        self.keys = np.fromiter(index.keys(), dtype=np.int64, count=n)
+        self.genres = genres
+        self.rating = rating
+        self.distance = np.asarray(distance, dtype=float)
+
+        forward = sparse.coo_matrix((weights, (sources, targets)), shape=(n, n)).tocsr()
+        # Keep the strongest weight when an edge is known from both ends.
+        weights = forward.maximum(forward.T).tocsr()
+        out_degree = np.asarray(weights.sum(axis=1)).ravel()
+        self.dangling = out_degree == 0
+        inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=~self.dangling)
+        # Column-stochastic transpose: scores flow along edges with P^T x.
+        self._transition_t = (sparse.diags(inverse) @ weights).T.tocsr()
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @property
+    def edge_count(self) -> int:
+        return self._transition_t.nnz // 2
+
+    def personalized_pagerank(self, seeds: Mapping[int, float], restart: float = 0.15,
+                              tol: float = 1e-8, max_iter: int = 100) -> np.ndarray:
+        """Stationary visit probabilities of a walk restarting at ``seeds``.
+
+        ``seeds`` maps rating keys to restart weights; keys outside the graph
+        are ignored. Mass reaching a dangling node restarts at the seeds.
+        """
+        n = len(self)
+        r = np.zeros(n)
+        for key, weight in seeds.items():
+            row = self.index.get(int(key))
+            if row is not None and weight > 0:
+                r[row] += weight
+        total = r.sum()
+        if n == 0 or total <= 0:
+            return np.zeros(n)
+        r /= total
+
+        x = r.copy()
+        walk = 1.0 - restart
+        for _ in range(max_iter):
+            leaked = x[self.dangling].sum()
+            x_next = walk * (self._transition_t @ x) + (restart + walk * leaked) * r
+            if np.abs(x_next - x).sum() < tol:
+                x = x_next
+                break
+            x = x_next
+        return x
+
+    def rank(self, seeds: Mapping[int, float], exclude: Iterable[int] = (),
+             restart: float = 0.15) -> List[Tuple[int, float]]:
+        """Return ``(rating_key, score)`` pairs reachable from ``seeds``.
+
+        Seeds and ``exclude`` keys are left out; best scores come first.
+        """
+        scores = self.personalized_pagerank(seeds, restart=restart)
+        skip = {int(key) for key in seeds} | {int(key) for key in exclude}
+        order = np.argsort(-scores, kind="stable")
+        ranked = []
+        for row in order:
+            score = scores[row]
+            if score <= 0:
+                break
+            key = int(self.keys[row])
+            if key not in skip:
+                ranked.append((key, float(score)))
+        return ranked
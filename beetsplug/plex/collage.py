@@ -1,42 +1,316 @@
-"""Collage creation helpers extracted from plexsync."""
+"""Collage creation helpers extracted from plexsync.
 
+Album art is requested from Plex's photo transcoder at the tile size,
+downloaded concurrently over one pooled session and kept in an on-disk
+cache keyed by album and artwork version. Decoding and resizing run in a
+process pool; only the final paste happens on the main thread.
+"""
+
+import hashlib
 import os
-from datetime import datetime
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timedelta
 from io import BytesIO
 
-import requests
 from PIL import Image
-from plexapi import exceptions
 
+from beetsplug.core.config import get_plexsync_config
+from beetsplug.plex.operations import fetch_items_by_keys
+from beetsplug.providers import http_client
 
-def create_collage(list_image_urls, dimension, logger):
-    """Create a square collage from a list of image urls.
+THUMBNAIL_SIZE = 300
+THUMB_CACHE_DIR = "plexsync_thumbs"
+
+# ``url`` is fetched unless ``cache_path`` already holds the image.
+ThumbJob = namedtuple("ThumbJob", ["url", "cache_path"])
+
+
+def _collage_workers():
+    workers = get_plexsync_config("collage_workers", int, 8) or 8
+    return max(1, workers)
 
-    Returns a PIL.Image. Behavior identical to original.
+
+def thumb_cache_path(cache_dir, rating_key, thumb, size=THUMBNAIL_SIZE):
+    """Cache file of an album's art; a new ``thumb`` version gets a new file.
+
+    Each album has its own directory, so replacing its art only has to look
+    at that album's files.
     """
-    thumbnail_size = 300
-    grid_size = thumbnail_size * dimension
-    grid = Image.new("RGB", (grid_size, grid_size), "black")
+    version = hashlib.sha1(str(thumb).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, str(rating_key), f"{version}-{size}.img")
 
-    for index, url in enumerate(list_image_urls):
-        if index >= dimension * dimension:
-            break
+
+def _read_cached(path):
+    if path and os.path.exists(path):
+        with open(path, "rb") as handle:
+            return handle.read()
+    return None
+
+
+def _write_cached(path, data):
+    directory, name = os.path.split(path)
+    os.makedirs(directory, exist_ok=True)
+    # Drop older versions of this album's art at the same size
+    suffix = "-" + name.rsplit("-", 1)[-1]
+    for old_name in os.listdir(directory):
+        if old_name.endswith(suffix) and old_name != name:
+            try:
+                os.remove(os.path.join(directory, old_name))
+            except OSError:
+                pass
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+
+
+def fetch_thumbnails(jobs, logger, session=None, workers=None, timeout=10):
+    """Return the image bytes of each job (``None`` on failure), in order."""
+    workers = workers or _collage_workers()
+    session = session or http_client.get_session()
+
+    def fetch(job):
+        """Return ``(data, source)``, ``source`` being "cache" or "download"."""
         try:
-            response = requests.get(url, timeout=10)
-            img = Image.open(BytesIO(response.content))
+            data = _read_cached(job.cache_path)
+            if data is not None:
+                return data, "cache"
+            response = session.get(job.url, timeout=timeout)
+            response.raise_for_status()
+            data = response.content
+            if job.cache_path:
+                try:
+                    _write_cached(job.cache_path, data)
+                except OSError as e:
+                    logger.debug("Could not cache image {}: {}", job.cache_path, e)
+            return data, "download"
+        except Exception as e:
+            logger.debug("Failed to download image {}: {}", job.url, e)
+            return None, None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(fetch, jobs))
+    sources = [source for _, source in results]
+    logger.debug(
+        "Collage art: {} from cache, {} downloaded, {} failed",
+        sources.count("cache"), sources.count("download"), sources.count(None),
+    )
+    return [data for data, _ in results]
+
+
+def _decode_thumbnail(data, size):
+    """Decode and shrink one image; returns ``(width, height, rgb_bytes)``."""
+    if data is None:
+        return None
+    try:
+        with Image.open(BytesIO(data)) as img:
             if img.mode != "RGB":
                 img = img.convert("RGB")
-            img.thumbnail((thumbnail_size, thumbnail_size), Image.Resampling.LANCZOS)
-            x = thumbnail_size * (index % dimension)
-            y = thumbnail_size * (index // dimension)
-            grid.paste(img, (x, y))
-            img.close()
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            return img.width, img.height, img.tobytes()
+    except Exception:
+        return None
+
+
+def decode_thumbnails(blobs, logger, size=THUMBNAIL_SIZE):
+    """Decode ``blobs`` in a process pool, falling back to this process."""
+    sizes = [size] * len(blobs)
+    if len([blob for blob in blobs if blob is not None]) > 1:
+        try:
+            with ProcessPoolExecutor() as executor:
+                return list(executor.map(_decode_thumbnail, blobs, sizes))
         except Exception as e:
-            logger.debug("Failed to process image {}: {}", url, e)
+            logger.debug("Process pool unavailable for image decoding: {}", e)
+    return list(map(_decode_thumbnail, blobs, sizes))
+
+
+def create_collage(list_image_urls, dimension, logger, cache_paths=None):
+    """Create a square collage from a list of image urls.
+
+    ``cache_paths`` optionally gives an on-disk cache file per url. Returns
+    a PIL.Image.
+    """
+    thumbnail_size = THUMBNAIL_SIZE
+    grid_size = thumbnail_size * dimension
+    grid = Image.new("RGB", (grid_size, grid_size), "black")
+
+    urls = list(list_image_urls)[: dimension * dimension]
+    paths = list(cache_paths or [])[: len(urls)]
+    paths += [None] * (len(urls) - len(paths))
+    blobs = fetch_thumbnails([ThumbJob(url, path) for url, path in zip(urls, paths)], logger)
+
+    for index, tile in enumerate(decode_thumbnails(blobs, logger, thumbnail_size)):
+        if tile is None:
+            logger.debug("Failed to process image {}", urls[index])
             continue
+        width, height, pixels = tile
+        img = Image.frombytes("RGB", (width, height), pixels)
+        x = thumbnail_size * (index % dimension)
+        y = thumbnail_size * (index // dimension)
+        grid.paste(img, (x, y))
+        img.close()
     return grid
 
 
+def _album_art(plugin, album, cache_dir):
+    """Return ``(url, cache_path)`` for an album's art at tile size."""
+    thumb = getattr(album, "thumb", None)
+    if thumb:
+        try:
+            url = plugin.plex.transcodeImage(
+                thumb, THUMBNAIL_SIZE, THUMBNAIL_SIZE, minSize=False, upscale=False
+            )
+        except Exception:
+            url = getattr(album, "thumbUrl", None)
+        return url, thumb_cache_path(cache_dir, getattr(album, "ratingKey", "album"), thumb)
+    return getattr(album, "thumbUrl", None), None
+
+
+def _key_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _count_play(album_data, album_key, viewed_at, plays=1):
+    data = album_data.setdefault(album_key, {"count": 0, "last_played": None})
+    data["count"] += plays
+    if viewed_at and (data["last_played"] is None or viewed_at > data["last_played"]):
+        data["last_played"] = viewed_at
+
+
+def _server_history_counts(plex, music, tracks, since, logger):
+    """Aggregate play counts per album key from the server-wide history.
+
+    Entries without a ``parentRatingKey`` are resolved through their track,
+    first from ``tracks`` and then with batched track fetches.
+    """
+    section_id = _key_or_none(getattr(music, "key", None)) or None
+    history_entries = plex.history(mindate=since, librarySectionID=section_id, maxresults=None)
+    logger.debug(
+        "Using server history for section {} since {} ({} entries)",
+        section_id, since.strftime("%Y-%m-%d"), len(history_entries),
+    )
+
+    album_of_track = {}
+    for track in tracks:
+        track_key = _key_or_none(getattr(track, "ratingKey", None))
+        album_key = _key_or_none(getattr(track, "parentRatingKey", None))
+        if track_key is not None and album_key is not None:
+            album_of_track[track_key] = album_key
+
+    album_data = {}
+    pending = {}  # track key -> [viewedAt, ...] of entries missing an album
+    skipped = 0
+    for entry in history_entries:
+        viewed_at = getattr(entry, "viewedAt", None)
+        album_key = _key_or_none(getattr(entry, "parentRatingKey", None))
+        track_key = _key_or_none(getattr(entry, "ratingKey", None))
+        if album_key is None and track_key is not None:
+            album_key = album_of_track.get(track_key)
+        if album_key is not None:
+            _count_play(album_data, album_key, viewed_at)
+        elif track_key is not None:
+            pending.setdefault(track_key, []).append(viewed_at)
+        else:
+            skipped += 1
+
+    if pending:
+        for track in fetch_items_by_keys(plex, pending):
+            album_key = _key_or_none(getattr(track, "parentRatingKey", None))
+            views = pending.pop(int(track.ratingKey))
+            if album_key is None:
+                skipped += len(views)
+                continue
+            for viewed_at in views:
+                _count_play(album_data, album_key, viewed_at)
+        skipped += sum(len(views) for views in pending.values())
+    if skipped:
+        logger.debug("Skipped {} history entries that could not resolve to an album", skipped)
+    return album_data
+
+
+def _track_history_counts(tracks, since, logger):
+    """Aggregate play counts per album key from each track's own history."""
+
+    def track_plays(track):
+        try:
+            history = track.history(mindate=since)
+            history_last_played = max(
+                (h.viewedAt for h in history if getattr(h, "viewedAt", None) is not None),
+                default=None,
+            )
+            last_played = max(filter(None, [track.lastViewedAt, history_last_played]), default=None)
+            return _key_or_none(getattr(track, "parentRatingKey", None)), len(history), last_played
+        except Exception as ex:
+            logger.debug("Error processing track history for {}: {}", getattr(track, "title", "unknown"), ex)
+            return None
+
+    album_data = {}
+    with ThreadPoolExecutor(max_workers=_collage_workers()) as executor:
+        for result in executor.map(track_plays, tracks):
+            if result is None or result[0] is None:
+                continue
+            album_key, plays, last_played = result
+            _count_play(album_data, album_key, last_played, plays=plays)
+    return album_data
+
+
+def most_played_albums(plex, music, tracks, interval, logger, limit=None):
+    """Return the albums played in the last ``interval`` days, most played first.
+
+    Each album carries ``count`` and ``last_played_date``. Albums are fetched
+    with multi-ID requests once all plays are counted; with ``limit`` only
+    the top ``limit`` albums found in the library are fetched.
+    """
+    tracks = list(tracks)
+    since = datetime.now() - timedelta(days=interval)
+    try:
+        album_data = _server_history_counts(plex, music, tracks, since, logger)
+    except Exception as e:
+        # Some Plex setups or plexapi versions do not support server.history
+        # with these filters.
+        logger.debug("Falling back to per-track history due to error: {}", e)
+        album_data = _track_history_counts(tracks, since, logger)
+
+    ranked = sorted(
+        ((key, data) for key, data in album_data.items() if data["count"] > 0),
+        key=lambda kv: (-kv[1]["count"], -(kv[1]["last_played"].timestamp() if kv[1]["last_played"] else 0)),
+    )
+    # Fetch in slices of ``limit``; albums gone from the library are
+    # replaced by the next ranked ones.
+    step = limit or len(ranked) or 1
+    albums = {}
+    found = 0
+    for start in range(0, len(ranked), step):
+        chunk = [key for key, _ in ranked[start:start + step]]
+        for album in fetch_items_by_keys(plex, chunk):
+            albums[int(album.ratingKey)] = album
+            found += 1
+        if limit and found >= limit:
+            break
+
+    result = []
+    for key, data in ranked:
+        album = albums.get(key)
+        if album is None:
+            continue
+        if limit and len(result) >= limit:
+            break
+        album.count = data["count"]
+        album.last_played_date = data["last_played"]
+        result.append(album)
+        logger.debug(
+            "{} played {} times, last played on {}",
+            getattr(album, "title", "Unknown Album"),
+            data["count"],
+            (data["last_played"].strftime("%Y-%m-%d %H:%M:%S") if data["last_played"] else "Never"),
+        )
+    return result
+
+
 def plex_collage(plugin, interval, grid):
     """Create a collage of most played albums and save to config dir."""
     interval = int(interval)
@@ -53,16 +327,20 @@ def plex_collage(plugin, interval, grid):
     )
 
     max_albums = grid * grid
-    sorted_albums = plugin._plex_most_played_albums(tracks, interval)[:max_albums]
+    sorted_albums = plugin._plex_most_played_albums(tracks, interval, limit=max_albums)
 
     if not sorted_albums:
         plugin._log.error("No albums found in the specified time period")
         return
 
+    cache_dir = os.path.join(plugin.config_dir, THUMB_CACHE_DIR)
     album_art_urls = []
+    cache_paths = []
     for album in sorted_albums:
-        if hasattr(album, "thumbUrl") and album.thumbUrl:
-            album_art_urls.append(album.thumbUrl)
+        url, cache_path = _album_art(plugin, album, cache_dir)
+        if url:
+            album_art_urls.append(url)
+            cache_paths.append(cache_path)
             plugin._log.debug(
                 "Added album art for: {} (played {} times)",
                 album.title,
@@ -74,7 +352,7 @@ def plex_collage(plugin, interval, grid):
         return
 
     try:
-        collage = create_collage(album_art_urls, grid, plugin._log)
+        collage = create_collage(album_art_urls, grid, plugin._log, cache_paths=cache_paths)
         output_path = os.path.join(plugin.config_dir, "collage.png")
         collage.save(output_path, "PNG", quality=95)
         plugin._log.info("Collage saved to: {}", output_path)
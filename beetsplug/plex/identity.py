@@ -0,0 +1,174 @@
+"""Deterministic identity matching between beets items and Plex tracks.
+
+Plex and beets usually index the very same files, so a MusicBrainz id or the
+file path identifies most tracks exactly. These helpers join on those keys in
+a single pass so fuzzy searching is only needed for the leftovers.
+"""
+
+from __future__ import annotations
+
+import os
+import posixpath
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from beetsplug.core.config import get_plexsync_config
+
+_MBID_PREFIX = "mbid://"
+
+
+def load_path_rewrites(raw=None) -> List[Tuple[str, str]]:
+    """Return configured ``(beets_prefix, plex_prefix)`` path rewrites.
+
+    Accepts either a mapping of beets prefix to Plex prefix or a list of
+    ``{"beets": ..., "plex": ...}`` entries. Longer prefixes win.
+    """
+    if raw is None:
+        raw = get_plexsync_config("path_rewrites", None, None)
+    if not raw:
+        return []
+
+    pairs: List[Tuple[str, str]] = []
+    if isinstance(raw, dict):
+        entries = [{"beets": key, "plex": value} for key, value in raw.items()]
+    elif isinstance(raw, (list, tuple)):
+        entries = raw
+    else:
+        return []
+
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        beets_prefix = entry.get("beets") or entry.get("from")
+        plex_prefix = entry.get("plex") or entry.get("to")
+        if beets_prefix is None or plex_prefix is None:
+            continue
+        pairs.append((normalize_path(beets_prefix), normalize_path(plex_prefix)))
+
+    pairs.sort(key=lambda pair: len(pair[0]), reverse=True)
+    return pairs
+
+
+def normalize_path(path) -> str:
+    """Normalize a filesystem path so beets and Plex paths compare equal."""
+    if not path:
+        return ""
+    if isinstance(path, bytes):
+        path = os.fsdecode(path)
+    path = str(path).replace("\\", "/")
+    normalized = posixpath.normpath(path)
+    return "" if normalized == "." else normalized
+
+
+def rewrite_path(path, rewrites: Iterable[Tuple[str, str]]) -> str:
+    """Translate a beets path into the Plex host's namespace."""
+    normalized = normalize_path(path)
+    for beets_prefix, plex_prefix in rewrites:
+        if normalized == beets_prefix or normalized.startswith(beets_prefix.rstrip("/") + "/"):
+            return plex_prefix.rstrip("/") + normalized[len(beets_prefix.rstrip("/")):]
+    return normalized
+
+
+def _guid_ids(track) -> List[str]:
+    # Read the raw XML of plexapi objects: ``track.guids`` is empty for
+    # tracks without GUIDs, and plexapi reloads a partial object from the
+    # server whenever an attribute is empty.
+    data = getattr(track, "_data", None)
+    if data is not None:
+        return [guid.attrib.get("id") or "" for guid in data.findall("Guid")]
+    try:
+        guids = getattr(track, "guids", None) or []
+    except Exception:  # noqa: BLE001 - guids are parsed lazily by plexapi
+        guids = []
+    return [getattr(guid, "id", None) or "" for guid in guids]
+
+
+def _track_mbids(track) -> List[str]:
+    mbids = []
+    for guid_id in _guid_ids(track):
+        if guid_id.startswith(_MBID_PREFIX):
+            mbids.append(guid_id[len(_MBID_PREFIX):].lower())
+    return mbids
+
+
+def _track_paths(track) -> List[str]:
+    paths = []
+    try:
+        media_list = getattr(track, "media", None) or []
+    except Exception:  # noqa: BLE001 - tolerate partially loaded objects
+        media_list = []
+    for media in media_list:
+        for part in getattr(media, "parts", None) or []:
+            file_path = normalize_path(getattr(part, "file", None))
+            if file_path:
+                paths.append(file_path)
+    return paths
+
+
+class PlexIdentityIndex:
+    """Lookup of Plex tracks by MusicBrainz id and by file path."""
+
+    def __init__(self, path_rewrites: Optional[List[Tuple[str, str]]] = None) -> None:
+        self._rewrites = path_rewrites if path_rewrites is not None else load_path_rewrites()
+        self._by_mbid: Dict[str, object] = {}
+        self._by_path: Dict[str, object] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add_track(self, track) -> None:
+        self._size += 1
+        for mbid in _track_mbids(track):
+            self._by_mbid.setdefault(mbid, track)
+        for path in _track_paths(track):
+            self._by_path.setdefault(path, track)
+
+    def match(self, item):
+        """Return the Plex track that is the same recording as ``item``."""
+        for field in ("mb_trackid", "mb_releasetrackid"):
+            mbid = getattr(item, field, None)
+            if mbid:
+                track = self._by_mbid.get(str(mbid).lower())
+                if track is not None:
+                    return track
+
+        path = getattr(item, "path", None)
+        if path and self._by_path:
+            return self._by_path.get(rewrite_path(path, self._rewrites))
+        return None
+
+
+def identity_match_enabled() -> bool:
+    return bool(get_plexsync_config("identity_match", bool, True))
+
+
+def build_identity_index(music, logger, tracks=None) -> PlexIdentityIndex:
+    """Index Plex tracks by MBID and file path.
+
+    When ``tracks`` is not provided, the whole music section is listed once
+    with GUIDs included.
+    """
+    index = PlexIdentityIndex()
+    _t0 = time.time()
+    if tracks is None:
+        tracks = music.search(libtype="track", includeGuids=True, container_size=1000)
+    for track in tracks:
+        index.add_track(track)
+    logger.debug(
+        "Indexed {} Plex tracks by MBID/path in {:.2f}s", len(index), time.time() - _t0
+    )
+    return index
+
+
+def join_items(items, index: PlexIdentityIndex):
+    """Split ``items`` into identity-matched pairs and unmatched items."""
+    matched = []
+    unmatched = []
+    for item in items:
+        track = index.match(item)
+        if track is None:
+            unmatched.append(item)
+        else:
+            matched.append((item, track))
+    return matched, unmatched
@@ -0,0 +1,256 @@
+"""Bounded producer/consumer pipeline used by ``beet plexsync``.
+
+Items flow through a bounded work queue to a pool of Plex lookup workers.
+Their results are handed to a single writer thread that stores them in
+batches inside ``lib.transaction()``, so only one thread ever writes to the
+beets database. Tag writes optionally run on a separate small pool.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from beetsplug.core.config import get_plexsync_config
+
+_STOP = object()
+
+
+def _positive_int(key, default, minimum=1):
+    value = get_plexsync_config(key, int, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(minimum, value)
+
+
+def get_sync_settings():
+    """Return ``(workers, batch_size, write_workers)`` for library sync."""
+    default_workers = min(32, (os.cpu_count() or 1) + 4)
+    workers = _positive_int("sync_workers", default_workers)
+    batch_size = _positive_int("sync_batch_size", 100)
+    write_workers = _positive_int("sync_write_workers", 2, minimum=0)
+    return workers, batch_size, write_workers
+
+
+def apply_plex_track(item, plex_track):
+    """Copy Plex playback attributes onto a beets item (without storing)."""
+    item.plex_guid = plex_track.guid
+    item.plex_ratingkey = plex_track.ratingKey
+    item.plex_userrating = plex_track.userRating
+    item.plex_skipcount = plex_track.skipCount
+    item.plex_viewcount = plex_track.viewCount
+    item.plex_lastviewedat = plex_track.lastViewedAt
+    item.plex_lastratedat = plex_track.lastRatedAt
+    item.plex_updated = time.time()
+
+
+def sync_items(plugin, lib, items, write, force, identity_index=None, progress=None):
+    """Look up ``items`` in Plex and persist the results.
+
+    Memory stays bounded by the queue sizes and the batch size regardless of
+    how many items are synced. Returns a dict with ``updated``, ``missing``
+    and ``identity`` (matched without searching) counts.
+    """
+    log = plugin._log
+    workers, batch_size, write_workers = get_sync_settings()
+    work_queue = queue.Queue(maxsize=workers * 4)
+    result_queue = queue.Queue(maxsize=batch_size * 2)
+    counts = {"updated": 0, "missing": 0, "identity": 0}
+    counts_lock = threading.Lock()
+
+    def tick():
+        if progress is not None:
+            try:
+                progress.update()
+            except Exception as exc:  # noqa: BLE001 - keep sync resilient
+                log.debug("Progress counter update failed: {}", exc)
+
+    def lookup_worker():
+        while True:
+            job = work_queue.get()
+            if job is _STOP:
+                return
+            index, item, plex_track = job
+            try:
+                log.debug("Processing track {} - {}", index, item)
+                if plex_track is None:
+                    plex_track = plugin.search_plex_track(item)
+                if plex_track is None:
+                    log.info("No track found for: {}", item)
+                    with counts_lock:
+                        counts["missing"] += 1
+                    tick()
+                    continue
+                apply_plex_track(item, plex_track)
+                result_queue.put(item)
+            except Exception as exc:  # noqa: BLE001 - one bad item must not stop the sync
+                log.warning("Failed to sync {}: {}", item, exc)
+                tick()
+
+    write_pool = (
+        ThreadPoolExecutor(max_workers=write_workers) if write and write_workers else None
+    )
+    # Bound the number of pending tag writes so the pool cannot queue the
+    # whole library when file I/O is slower than Plex lookups.
+    write_slots = threading.BoundedSemaphore(max(1, write_workers) * 4)
+
+    def write_tags(item):
+        try:
+            item.try_write()
+        except Exception as exc:  # noqa: BLE001 - surfaced in the log, not the future
+            log.warning("Failed to write tags for {}: {}", item, exc)
+        finally:
+            write_slots.release()
+
+    def flush(batch):
+        try:
+            with lib.transaction():
+                for item in batch:
+                    item.store()
+        except Exception as exc:  # noqa: BLE001 - retry row by row
+            log.warning("Batch store failed ({}), storing items individually", exc)
+            for item in batch:
+                try:
+                    item.store()
+                except Exception as item_exc:  # noqa: BLE001
+                    log.warning("Failed to store {}: {}", item, item_exc)
+        for item in batch:
+            if write:
+                try:
+                    if write_pool is not None:
+                        write_slots.acquire()
+                        try:
+                            write_pool.submit(write_tags, item)
+                        except Exception:
+                            write_slots.release()
+                            raise
+                    else:
+                        item.try_write()
+                except Exception as exc:  # noqa: BLE001 - a failed write must not stop the sync
+                    log.warning("Failed to write tags for {}: {}", item, exc)
+            tick()
+        with counts_lock:
+            counts["updated"] += len(batch)
+
+    writer_errors = []
+
+    def safe_flush(batch):
+        # The writer must keep draining result_queue, or the lookup workers
+        # block on it forever; unexpected errors are re-raised after the join.
+        try:
+            flush(batch)
+        except Exception as exc:  # noqa: BLE001
+            log.error("Storing {} synced tracks failed: {}", len(batch), exc)
+            writer_errors.append(exc)
+
+    def writer():
+        batch = []
+        while True:
+            try:
+                item = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                if batch:
+                    safe_flush(batch)
+                    batch = []
+                continue
+            if item is _STOP:
+                break
+            batch.append(item)
+            if len(batch) >= batch_size:
+                safe_flush(batch)
+                batch = []
+        if batch:
+            safe_flush(batch)
+
+    writer_thread = threading.Thread(target=writer, name="plexsync-writer", daemon=True)
+    writer_thread.start()
+    lookup_threads = [
+        threading.Thread(target=lookup_worker, name=f"plexsync-lookup-{n}", daemon=True)
+        for n in range(workers)
+    ]
+    for thread in lookup_threads:
+        thread.start()
+
+    try:
+        for index, item in enumerate(items, start=1):
+            if not force and "plex_userrating" in item:
+                log.debug("Plex rating already present for: {}", item)
+                tick()
+                continue
+            plex_track = identity_index.match(item) if identity_index is not None else None
+            if plex_track is not None:
+                counts["identity"] += 1
+            work_queue.put((index, item, plex_track))
+    finally:
+        for _ in lookup_threads:
+            work_queue.put(_STOP)
+        for thread in lookup_threads:
+            thread.join()
+        result_queue.put(_STOP)
+        writer_thread.join()
+        if write_pool is not None:
+            write_pool.shutdown(wait=True)
+
+    if writer_errors:
+        raise writer_errors[0]
+    return counts
+
+
+# Plex track fields that change when a track is edited, played or rated.
+WATERMARK_FIELDS = ("updatedAt", "lastViewedAt", "lastRatedAt")
+# Seconds re-scanned below the watermark; re-applying a track is harmless but
+# missing one that shares the watermark second is not.
+WATERMARK_OVERLAP = 1
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def track_watermark(track):
+    """Return the newest change timestamp of a Plex track."""
+    stamps = [_timestamp(getattr(track, field, None)) for field in WATERMARK_FIELDS]
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return max(stamps) if stamps else None
+
+
+def fetch_changed_tracks(music, since, logger, page_size=500):
+    """Return ``(tracks, complete)`` for tracks changed after ``since``.
+
+    Runs one paged, sorted query per watermark field and merges the results
+    by rating key, so an unchanged library costs only a few requests.
+    ``complete`` is false when any field query failed; the changes found are
+    still returned, but the watermark must not be advanced past them.
+    """
+    since_dt = datetime.fromtimestamp(max(0.0, float(since) - WATERMARK_OVERLAP))
+    changed = {}
+    complete = True
+    for field in WATERMARK_FIELDS:
+        try:
+            tracks = music.search(
+                libtype="track",
+                filters={f"track.{field}>>": since_dt},
+                sort=f"track.{field}:asc",
+                container_size=page_size,
+            )
+        except Exception as exc:  # noqa: BLE001 - servers differ in filterable fields
+            logger.warning("Incremental query on {} failed: {}", field, exc)
+            complete = False
+            continue
+        for track in tracks:
+            changed.setdefault(track.ratingKey, track)
+        logger.debug("{} tracks changed by {} since {}", len(tracks), field, since_dt)
+    return list(changed.values()), complete
@@ -1,78 +1,231 @@
 """Plex playlist operations extracted from plexsync.
 
 These helpers encapsulate low-level Plex operations and log consistently.
-They are intentionally thin to avoid behavior changes.
+Playlist updates are applied as a diff of rating keys so that refreshing a
+playlist costs a handful of requests instead of one per track.
 """
 
+import bisect
 from typing import Iterable
 
 from plexapi import exceptions
+from plexapi.base import PlexObject
 
 
-def sort_plex_playlist(plex, playlist_name: str, sort_field: str, logger) -> None:
-    """Sort a Plex playlist by a given datetime field (desc)."""
-    playlist = plex.playlist(playlist_name)
-    items = playlist.items()
-    sorted_items = sorted(
-        items,
-        key=lambda x: (getattr(x, sort_field).timestamp() if getattr(x, sort_field) is not None else 0),
-        reverse=True,
-    )
-    playlist.removeItems(items)
-    for item in sorted_items:
-        playlist.addItems(item)
+def _rating_key(item):
+    return getattr(item, 'plex_ratingkey', None) or getattr(item, 'ratingKey', None)
+
+
+def _sort_value(item, sort_field):
+    value = getattr(item, sort_field, None)
+    if value is None:
+        return 0
+    return value.timestamp() if hasattr(value, 'timestamp') else float(value)
+
+
+def _playlist_entries(plex, playlist):
+    """List a playlist's entries (with ``playlistItemID``) in one request."""
+    return plex.fetchItems(f"{playlist.key}/items")
 
 
-def _resolve_plex_items(plex, items: Iterable, logger):
-    """Normalize incoming items to Plex items via rating key.
+def stable_positions(sequence):
+    """Return the indices of a longest increasing subsequence of ``sequence``.
 
-    Supports objects with either `plex_ratingkey` or `ratingKey` attributes.
+    Entries at these indices are already in relative order and never need to
+    be moved; every other entry needs exactly one move.
     """
-    plex_set = set()
-    for item in items:
+    tails = []  # tails[n]: index of the smallest tail of an increasing run of length n + 1
+    tail_values = []
+    previous = [-1] * len(sequence)
+    for index, value in enumerate(sequence):
+        length = bisect.bisect_left(tail_values, value)
+        if length:
+            previous[index] = tails[length - 1]
+        if length == len(tails):
+            tails.append(index)
+            tail_values.append(value)
+        else:
+            tails[length] = index
+            tail_values[length] = value
+    stable = set()
+    index = tails[-1] if tails else -1
+    while index >= 0:
+        stable.add(index)
+        index = previous[index]
+    return stable
+
+
+def plan_playlist_moves(current_keys, target_keys):
+    """Plan the fewest moves turning ``current_keys`` into ``target_keys``.
+
+    Both are orderings of the same distinct keys. Returns ``(key, after)``
+    pairs to apply in order, where ``after`` is ``None`` for the top.
+    """
+    position = {key: index for index, key in enumerate(target_keys)}
+    stable_indices = stable_positions([position[key] for key in current_keys])
+    stable = {current_keys[index] for index in stable_indices}
+    moves = []
+    after = None
+    for key in target_keys:
+        if key not in stable:
+            moves.append((key, after))
+        after = key
+    return moves
+
+
+def _move_entries(plex, playlist, moves):
+    """Apply ``(playlistItemID, after playlistItemID)`` moves to ``playlist``."""
+    for item_id, after in moves:
+        move_key = f"{playlist.key}/items/{item_id}/move"
+        if after is not None:
+            move_key += f"?after={after}"
+        plex.query(move_key, method=plex._session.put)
+
+
+# Rating keys per multi-ID metadata request; keeps URLs well below limits.
+FETCH_BATCH_SIZE = 200
+
+
+def fetch_items_by_keys(plex, rating_keys, logger=None, batch_size=FETCH_BATCH_SIZE):
+    """Fetch Plex items for ``rating_keys`` with multi-ID metadata requests.
+
+    Returns the items found, in the order of ``rating_keys``; missing keys
+    are skipped (and logged when ``logger`` is given).
+    """
+    keys = list(dict.fromkeys(int(key) for key in rating_keys))
+    found = {}
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
         try:
-            rating_key = getattr(item, 'plex_ratingkey', None) or getattr(item, 'ratingKey', None)
-            if rating_key:
-                plex_set.add(plex.fetchItem(rating_key))
-            else:
-                logger.warning("{} does not have plex_ratingkey or ratingKey attribute. Item details: {}", item, vars(item))
-        except (exceptions.NotFound, AttributeError) as e:
-            logger.warning("{} not found in Plex library. Error: {}", item, e)
-            continue
-    return plex_set
+            items = plex.fetchItems(f"/library/metadata/{','.join(map(str, chunk))}")
+        except exceptions.NotFound:
+            items = []
+        for item in items:
+            found[int(item.ratingKey)] = item
+    if logger is not None:
+        for key in keys:
+            if key not in found:
+                logger.warning("Track {} not found in Plex library", key)
+    return [found[key] for key in keys if key in found]
 
 
-def plex_add_playlist_item(plex, items: Iterable, playlist_name: str, logger) -> None:
-    """Add items to a Plex playlist (no duplicates)."""
-    if not items:
+def sync_plex_playlist(plex, playlist_name: str, items: Iterable, logger,
+                       sort_field="lastViewedAt", replace=True) -> None:
+    """Make a Plex playlist hold ``items`` with as few requests as possible.
+
+    The current and target rating keys are diffed. With ``replace``, entries
+    not in ``items`` are removed (all at once with a single request when
+    nothing is kept); otherwise existing entries are kept. New tracks are
+    added with one request; only those not passed in as Plex objects are
+    fetched, in multi-ID batches. The playlist is then ordered by ``sort_field``
+    (descending, like :func:`sort_plex_playlist`) or, when ``sort_field`` is
+    ``None``, in the order of ``items``, moving only the entries outside a
+    longest increasing subsequence of the current order.
+    """
+    target_keys = []
+    seen = set()
+    # Plex objects passed in need not be fetched again when added
+    provided = {}
+    for item in items:
+        rating_key = _rating_key(item)
+        if not rating_key:
+            logger.warning("{} does not have plex_ratingkey or ratingKey attribute", item)
+            continue
+        rating_key = int(rating_key)
+        if isinstance(item, PlexObject):
+            provided.setdefault(rating_key, item)
+        if rating_key not in seen:
+            seen.add(rating_key)
+            target_keys.append(rating_key)
+
+    def resolve(keys):
+        missing = [key for key in keys if key not in provided]
+        fetched = {int(t.ratingKey): t for t in fetch_items_by_keys(plex, missing, logger)}
+        return [provided.get(key) or fetched[key] for key in keys
+                if key in provided or key in fetched]
+    if not target_keys:
         logger.warning("No items to add to playlist {}", playlist_name)
         return
 
     try:
-        plst = plex.playlist(playlist_name)
-        playlist_set = set(plst.items())
+        playlist = plex.playlist(playlist_name)
     except exceptions.NotFound:
-        plst = None
-        playlist_set = set()
-
-    plex_set = _resolve_plex_items(plex, items, logger)
-    to_add = plex_set - playlist_set
-    logger.info("Adding {} tracks to {} playlist", len(to_add), playlist_name)
-    if plst is None:
-        logger.info("{} playlist will be created", playlist_name)
-        plex.createPlaylist(playlist_name, items=list(to_add))
-    else:
+        tracks = resolve(target_keys)
+        if sort_field:
+            tracks.sort(key=lambda t: _sort_value(t, sort_field), reverse=True)
+        if tracks:
+            logger.info("{} playlist will be created with {} tracks", playlist_name, len(tracks))
+            plex.createPlaylist(playlist_name, items=tracks)
+        return
+
+    entries = _playlist_entries(plex, playlist)
+    kept, removed, kept_keys = [], [], set()
+    for entry in entries:
+        if entry.ratingKey in kept_keys or (replace and entry.ratingKey not in seen):
+            removed.append(entry)
+        else:
+            kept.append(entry)
+            kept_keys.add(entry.ratingKey)
+
+    if removed and not kept:
+        plex.query(f"{playlist.key}/items", method=plex._session.delete)
+    for entry in removed if kept else ():
+        plex.query(f"{playlist.key}/items/{entry.playlistItemID}", method=plex._session.delete)
+
+    added = resolve([key for key in target_keys if key not in kept_keys])
+    if added:
         try:
-            plst.addItems(items=list(to_add))
+            playlist.addItems(added)
         except exceptions.BadRequest as e:
-            logger.error("Error adding items {} to {} playlist. Error: {}", to_add, playlist_name, e)
+            logger.error("Error adding items {} to {} playlist. Error: {}", added, playlist_name, e)
+            added = []
 
-    # Sort by recency, matches original behavior
-    try:
-        sort_plex_playlist(plex, playlist_name, "lastViewedAt", logger)
-    except Exception:
-        # Non-fatal if sorting fails
-        pass
+    current = kept + added
+    if sort_field:
+        ordered = sorted(current, key=lambda t: _sort_value(t, sort_field), reverse=True)
+        desired_keys = [t.ratingKey for t in ordered]
+    else:
+        present = {t.ratingKey for t in current}
+        desired_keys = [key for key in target_keys if key in present] + [
+            entry.ratingKey for entry in kept if entry.ratingKey not in seen
+        ]
+    moves = plan_playlist_moves([t.ratingKey for t in current], desired_keys)
+    if moves:
+        if added:
+            # Newly added entries only get their playlistItemID from the server
+            entries = _playlist_entries(plex, playlist)
+        else:
+            entries = kept
+        # Entries are unique by rating key here; duplicates were removed above
+        item_ids = {entry.ratingKey: entry.playlistItemID for entry in entries}
+        _move_entries(plex, playlist, [
+            (item_ids[key], None if after is None else item_ids[after]) for key, after in moves
+        ])
+
+    logger.info(
+        "Synced {} playlist: {} removed, {} added, {} moved",
+        playlist_name, len(removed), len(added), len(moves),
+    )
+
+
+def sort_plex_playlist(plex, playlist_name: str, sort_field: str, logger) -> None:
+    """Sort a Plex playlist by a given datetime field (desc)."""
+    playlist = plex.playlist(playlist_name)
+    entries = _playlist_entries(plex, playlist)
+    ordered = sorted(entries, key=lambda x: _sort_value(x, sort_field), reverse=True)
+    # Plan by playlistItemID: a track may appear in the playlist more than once
+    moves = plan_playlist_moves(
+        [entry.playlistItemID for entry in entries], [entry.playlistItemID for entry in ordered]
+    )
+    _move_entries(plex, playlist, moves)
+
+
+def plex_add_playlist_item(plex, items: Iterable, playlist_name: str, logger) -> None:
+    """Add items to a Plex playlist (no duplicates), sorted by recency."""
+    if not items:
+        logger.warning("No items to add to playlist {}", playlist_name)
+        return
+    sync_plex_playlist(plex, playlist_name, items, logger, replace=False)
 
 
 def plex_playlist_to_collection(music, playlist_name: str, logger) -> None:
@@ -104,33 +257,36 @@ def plex_playlist_to_collection(music, playlist_name: str, logger) -> None:
 
 
 def plex_remove_playlist_item(plex, items: Iterable, playlist_name: str, logger) -> None:
-    """Remove items from a Plex playlist if present."""
+    """Remove items from a Plex playlist if present.
+
+    Items are matched to playlist entries by rating key, so nothing has to
+    be fetched from Plex besides the playlist itself.
+    """
     try:
         plst = plex.playlist(playlist_name)
-        playlist_set = set(plst.items())
     except exceptions.NotFound:
         logger.error("{} playlist not found", playlist_name)
         return
 
-    plex_set = set()
-    from requests.exceptions import ConnectionError, ContentDecodingError
-
+    keys = set()
     for item in items:
-        try:
-            plex_set.add(plex.fetchItem(item.plex_ratingkey))
-        except (exceptions.NotFound, AttributeError, ContentDecodingError, ConnectionError) as e:
-            logger.warning("{} not found in Plex library. Error: {}", item, e)
-            continue
+        rating_key = _rating_key(item)
+        if rating_key:
+            keys.add(int(rating_key))
+        else:
+            logger.warning("{} does not have plex_ratingkey or ratingKey attribute", item)
 
-    to_remove = plex_set.intersection(playlist_set)
+    entries = _playlist_entries(plex, plst)
+    to_remove = [entry for entry in entries if entry.ratingKey in keys]
     logger.info("Removing {} tracks from {} playlist", len(to_remove), playlist_name)
-    plst.removeItems(items=list(to_remove))
+    if to_remove and len(to_remove) == len(entries):
+        plex.query(f"{plst.key}/items", method=plex._session.delete)
+        return
+    for entry in to_remove:
+        plex.query(f"{plst.key}/items/{entry.playlistItemID}", method=plex._session.delete)
 
 
 def plex_clear_playlist(plex, playlist_name: str) -> None:
-    """Clear all items from a Plex playlist."""
+    """Clear all items from a Plex playlist with a single request."""
     plist = plex.playlist(playlist_name)
-    tracks = plist.items()
-    for track in tracks:
-        plist.removeItems(track)
-
+    plex.query(f"{plist.key}/items", method=plex._session.delete)
@@ -2,13 +2,26 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+
 from beets import ui
 
 from beetsplug.core.config import get_plexsync_config
+from beetsplug.providers import http_client
 from beetsplug.providers.gaana import import_gaana_playlist
 from beetsplug.providers.youtube import import_yt_playlist, import_yt_search
 from beetsplug.providers.tidal import import_tidal_playlist
 from beetsplug.plex import smartplaylists
+from beetsplug.plex.operations import fetch_items_by_keys
+
+# Outcome of fetching one imported playlist source; ``error`` is the
+# exception raised (or a ``TimeoutError``) when the fetch failed.
+SourceResult = namedtuple("SourceResult", ["source", "tracks", "elapsed", "error"])
 
 
 def import_playlist(plugin, playlist, playlist_url=None, listenbrainz=False):
@@ -122,12 +135,225 @@ def import_search(plugin, playlist, search, limit=10):
     plugin._plex_add_playlist_item(song_list, playlist)
 
 
+def _fetch_source(plugin, source):
+    """Return ``(description, tracks)`` for one imported playlist source."""
+    import os
+    from beetsplug.providers.m3u8 import import_m3u8_playlist
+    from beetsplug.providers.http_post import import_post_playlist
+
+    tracks = []
+    # String source (URL or file)
+    if isinstance(source, str):
+        src_desc = source
+        low = source.lower()
+        if low.endswith('.m3u8'):
+            # Resolve relative path under config dir
+            if not os.path.isabs(source):
+                source = os.path.join(plugin.config_dir, source)
+            plugin._log.info("Importing from M3U8: {}", source)
+            tracks = import_m3u8_playlist(source, plugin.cache)
+        elif 'spotify' in low:
+            from beetsplug.providers.spotify import get_playlist_id as _get_pl_id
+            plugin._log.info("Importing from Spotify URL")
+            tracks = plugin.import_spotify_playlist(_get_pl_id(source))
+        elif 'jiosaavn' in low:
+            plugin._log.info("Importing from JioSaavn URL")
+            tracks = plugin.import_jiosaavn_playlist(source)
+        elif 'apple' in low:
+            plugin._log.info("Importing from Apple Music URL")
+            tracks = plugin.import_apple_playlist(source)
+        elif 'gaana' in low:
+            plugin._log.info("Importing from Gaana URL")
+            tracks = import_gaana_playlist(source, plugin.cache)
+        elif 'youtube' in low:
+            plugin._log.info("Importing from YouTube URL")
+            tracks = import_yt_playlist(source, plugin.cache)
+        elif 'tidal' in low:
+            plugin._log.info("Importing from Tidal URL")
+            tracks = import_tidal_playlist(source, plugin.cache)
+        else:
+            plugin._log.warning("Unsupported string source: {}", source)
+    # Dict source (typed)
+    elif isinstance(source, dict):
+        source_type = source.get("type")
+        src_desc = source_type or "Unknown"
+        if source_type == "Apple Music":
+            plugin._log.info("Importing from Apple Music: {}", source.get("name", ""))
+            tracks = plugin.import_apple_playlist(source.get("url", ""))
+        elif source_type == "JioSaavn":
+            plugin._log.info("Importing from JioSaavn: {}", source.get("name", ""))
+            tracks = plugin.import_jiosaavn_playlist(source.get("url", ""))
+        elif source_type == "Gaana":
+            plugin._log.info("Importing from Gaana: {}", source.get("name", ""))
+            tracks = import_gaana_playlist(source.get("url", ""), plugin.cache)
+        elif source_type == "Spotify":
+            plugin._log.info("Importing from Spotify: {}", source.get("name", ""))
+            from beetsplug.providers.spotify import get_playlist_id as _get_pl_id
+            tracks = plugin.import_spotify_playlist(_get_pl_id(source.get("url", "")))
+        elif source_type == "YouTube":
+            plugin._log.info("Importing from YouTube: {}", source.get("name", ""))
+            tracks = import_yt_playlist(source.get("url", ""), plugin.cache)
+        elif source_type == "Tidal":
+            plugin._log.info("Importing from Tidal: {}", source.get("name", ""))
+            tracks = import_tidal_playlist(source.get("url", ""), plugin.cache)
+        elif source_type == "M3U8":
+            fp = source.get("filepath", "")
+            if fp and not os.path.isabs(fp):
+                fp = os.path.join(plugin.config_dir, fp)
+            plugin._log.info("Importing from M3U8: {}", fp)
+            tracks = import_m3u8_playlist(fp, plugin.cache)
+        elif source_type == "POST":
+            plugin._log.info("Importing from POST endpoint")
+            tracks = import_post_playlist(source, plugin.cache)
+        else:
+            plugin._log.warning("Unsupported source type: {}", source_type)
+    else:
+        src_desc = str(type(source))
+        plugin._log.warning("Invalid source format: {}", src_desc)
+    return src_desc, list(tracks or [])
+
+
+def _source_label(source):
+    if isinstance(source, dict):
+        return source.get("type") or "Unknown"
+    return source if isinstance(source, str) else str(type(source))
+
+
+def fetch_sources(plugin, sources, workers=4, timeout=None, on_done=None):
+    """Fetch all ``sources`` concurrently on at most ``workers`` threads.
+
+    A source still running ``timeout`` seconds after it started is merged
+    without its tracks. Requests it makes through the shared HTTP session
+    fail from then on, so such providers stop promptly; providers using
+    their own client library may keep running until their own timeouts.
+    Returns one ``SourceResult`` per source, in the order of ``sources``.
+    ``on_done`` is called (from this thread) as each source finishes.
+    """
+    results = [None] * len(sources)
+    started = {}
+
+    def run(index, source):
+        started[index] = time.monotonic()
+        with http_client.deadline(timeout):
+            desc, tracks = _fetch_source(plugin, source)
+        return desc, tracks, time.monotonic() - started[index]
+
+    def finish(index, result):
+        results[index] = result
+        if result.error:
+            plugin._log.error("Error importing from {}: {}", result.source, result.error)
+        elif result.tracks:
+            plugin._log.info("Imported {} tracks from {}", len(result.tracks), result.source)
+        if on_done is not None:
+            on_done(result)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {executor.submit(run, i, source): i for i, source in enumerate(sources)}
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=0.5 if timeout else None, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures[future]
+                try:
+                    desc, tracks, elapsed = future.result()
+                    finish(index, SourceResult(desc, tracks, elapsed, None))
+                except Exception as e:  # noqa: BLE001 - one failing source must not stop others
+                    elapsed = time.monotonic() - started.get(index, time.monotonic())
+                    finish(index, SourceResult(_source_label(sources[index]), [], elapsed, e))
+            if timeout:
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if index in started and now - started[index] > timeout:
+                        pending.discard(future)
+                        future.cancel()
+                        finish(index, SourceResult(
+                            _source_label(sources[index]), [], now - started[index],
+                            TimeoutError(f"timed out after {timeout}s"),
+                        ))
+    finally:
+        # Do not wait for sources that timed out; their results are dropped.
+        # Threads still running are joined when the interpreter exits.
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def song_key(song):
+    """Case-insensitive ``(title, artist, album)`` identity of a source song."""
+    # Some sources may set explicit None values; normalize to empty strings before lowercasing
+    return (
+        (song.get('title') or '').lower(),
+        (song.get('artist') or '').lower(),
+        (song.get('album') or '').lower(),
+    )
+
+
+def song_list_hash(songs):
+    """Hash of the ordered, canonical song list of an imported playlist."""
+    keys = [list(song_key(song)) for song in songs]
+    return hashlib.sha1(json.dumps(keys, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def match_songs(plugin, playlist_name, songs, manual_search=False, on_song=None):
+    """Return the Plex tracks of ``songs``, in order, reusing the last import.
+
+    The song-to-track mapping of each import is stored with a hash of its
+    song list. Songs whose stored track still exists (checked with batched
+    fetches) are not searched again. New songs and songs whose track
+    disappeared go through ``search_plex_song``. Songs that were not matched
+    last time are searched again too, unless the song list is unchanged and
+    was searched less than ``import_retry_hours`` ago (default 24, ``0``
+    always searches).
+    """
+    cache = getattr(plugin, "cache", None)
+    keys = [song_key(song) for song in songs]
+    digest = song_list_hash(songs)
+    state = cache.get_import_state(playlist_name) if cache is not None else None
+    previous = {tuple(key): rating_key for key, rating_key in state["mapping"]} if state else {}
+    unchanged = state is not None and state["song_hash"] == digest
+    retry_hours = get_plexsync_config("import_retry_hours", float, 24)
+    recent = False
+    if unchanged and retry_hours and state.get("created_at") is not None:
+        age = datetime.now(timezone.utc).replace(tzinfo=None) - state["created_at"]
+        recent = age <= timedelta(hours=retry_hours)
+
+    known = [previous[key] for key in keys if previous.get(key) is not None]
+    tracks = {}
+    if known:
+        tracks = {int(track.ratingKey): track for track in fetch_items_by_keys(plugin.plex, known)}
+
+    matched = []
+    mapping = []
+    searched = 0
+    for song, key in zip(songs, keys):
+        rating_key = previous.get(key)
+        track = tracks.get(int(rating_key)) if rating_key is not None else None
+        if track is None and not (recent and key in previous and rating_key is None):
+            track = plugin.search_plex_song(song, manual_search)
+            searched += 1
+        if track is not None:
+            matched.append(track)
+        mapping.append((key, int(track.ratingKey) if track is not None else None))
+        if on_song is not None:
+            on_song()
+
+    # Rewriting an unchanged mapping would restart the retry period
+    if cache is not None and (searched or not recent):
+        cache.set_import_state(playlist_name, digest, mapping)
+    if recent:
+        plugin._log.info(
+            "Song list of {} unchanged since last import; unmatched songs are retried after {} hours",
+            playlist_name, retry_hours,
+        )
+    plugin._log.info("Searched {} of {} songs for {}", searched, len(songs), playlist_name)
+    return matched
+
+
 def generate_imported_playlist(plugin, lib, playlist_config, plex_lookup=None):
     """Generate imported playlist from various sources based on config."""
     from datetime import datetime as _dt
     from beetsplug.core.config import get_config_value, get_plexsync_config
-    from beetsplug.providers.m3u8 import import_m3u8_playlist
-    from beetsplug.providers.http_post import import_post_playlist
 
     playlist_name = playlist_config.get("name", "Imported Playlist")
     sources = playlist_config.get("sources", [])
@@ -147,144 +373,77 @@ def generate_imported_playlist(plugin, lib, playlist_config, plex_lookup=None):
     clear_playlist = get_config_value(
         playlist_config, defaults_cfg, "clear_playlist", False
     )
+    source_workers = get_config_value(playlist_config, defaults_cfg, "source_workers", 4)
+    source_timeout = get_config_value(playlist_config, defaults_cfg, "source_timeout", 300)
     
     if not sources:
         plugin._log.warning("No sources defined for imported playlist {}", playlist_name)
         return
     
     plugin._log.info("Generating imported playlist {} from {} sources", playlist_name, len(sources))
-    all_tracks = []
     source_progress = plugin.create_progress_counter(
         total=len(sources),
         desc=f"{playlist_name[:18]} src",
         unit="source",
     )
-    
-    try:
-        for source in sources:
+
+    def source_done(result):
+        if source_progress is not None:
             try:
-                tracks = []
-                src_desc = None
-                # String source (URL or file)
-                if isinstance(source, str):
-                    src_desc = source
-                    low = source.lower()
-                    if low.endswith('.m3u8'):
-                        # Resolve relative path under config dir
-                        if not os.path.isabs(source):
-                            source = os.path.join(plugin.config_dir, source)
-                        plugin._log.info("Importing from M3U8: {}", source)
-                        tracks = import_m3u8_playlist(source, plugin.cache)
-                    elif 'spotify' in low:
-                        from beetsplug.providers.spotify import get_playlist_id as _get_pl_id
-                        plugin._log.info("Importing from Spotify URL")
-                        tracks = plugin.import_spotify_playlist(_get_pl_id(source))
-                    elif 'jiosaavn' in low:
-                        plugin._log.info("Importing from JioSaavn URL")
-                        tracks = plugin.import_jiosaavn_playlist(source)
-                    elif 'apple' in low:
-                        plugin._log.info("Importing from Apple Music URL")
-                        tracks = plugin.import_apple_playlist(source)
-                    elif 'gaana' in low:
-                        plugin._log.info("Importing from Gaana URL")
-                        tracks = import_gaana_playlist(source, plugin.cache)
-                    elif 'youtube' in low:
-                        plugin._log.info("Importing from YouTube URL")
-                        tracks = import_yt_playlist(source, plugin.cache)
-                    elif 'tidal' in low:
-                        plugin._log.info("Importing from Tidal URL")
-                        tracks = import_tidal_playlist(source, plugin.cache)
-                    else:
-                        plugin._log.warning("Unsupported string source: {}", source)
-                # Dict source (typed)
-                elif isinstance(source, dict):
-                    source_type = source.get("type")
-                    src_desc = source_type or "Unknown"
-                    if source_type == "Apple Music":
-                        plugin._log.info("Importing from Apple Music: {}", source.get("name", ""))
-                        tracks = plugin.import_apple_playlist(source.get("url", ""))
-                    elif source_type == "JioSaavn":
-                        plugin._log.info("Importing from JioSaavn: {}", source.get("name", ""))
-                        tracks = plugin.import_jiosaavn_playlist(source.get("url", ""))
-                    elif source_type == "Gaana":
-                        plugin._log.info("Importing from Gaana: {}", source.get("name", ""))
-                        tracks = import_gaana_playlist(source.get("url", ""), plugin.cache)
-                    elif source_type == "Spotify":
-                        plugin._log.info("Importing from Spotify: {}", source.get("name", ""))
-                        from beetsplug.providers.spotify import get_playlist_id as _get_pl_id
-                        tracks = plugin.import_spotify_playlist(_get_pl_id(source.get("url", "")))
-                    elif source_type == "YouTube":
-                        plugin._log.info("Importing from YouTube: {}", source.get("name", ""))
-                        tracks = import_yt_playlist(source.get("url", ""), plugin.cache)
-                    elif source_type == "Tidal":
-                        plugin._log.info("Importing from Tidal: {}", source.get("name", ""))
-                        tracks = import_tidal_playlist(source.get("url", ""), plugin.cache)
-                    elif source_type == "M3U8":
-                        fp = source.get("filepath", "")
-                        if fp and not os.path.isabs(fp):
-                            fp = os.path.join(plugin.config_dir, fp)
-                        plugin._log.info("Importing from M3U8: {}", fp)
-                        tracks = import_m3u8_playlist(fp, plugin.cache)
-                    elif source_type == "POST":
-                        plugin._log.info("Importing from POST endpoint")
-                        tracks = import_post_playlist(source, plugin.cache)
-                    else:
-                        plugin._log.warning("Unsupported source type: {}", source_type)
-                else:
-                    src_desc = str(type(source))
-                    plugin._log.warning("Invalid source format: {}", src_desc)
-
-                if tracks:
-                    plugin._log.info("Imported {} tracks from {}", len(tracks), src_desc)
-                    all_tracks.extend(tracks)
-            except Exception as e:
-                plugin._log.error("Error importing from {}: {}", src_desc or "Unknown", e)
-                continue
-            finally:
-                if source_progress is not None:
-                    try:
-                        source_progress.update()
-                    except Exception:
-                        plugin._log.debug("Failed to update source progress for {}", playlist_name)
+                source_progress.update()
+            except Exception:
+                plugin._log.debug("Failed to update source progress for {}", playlist_name)
+
+    try:
+        source_results = fetch_sources(
+            plugin,
+            sources,
+            workers=int(source_workers or 1),
+            timeout=float(source_timeout) if source_timeout else None,
+            on_done=source_done,
+        )
     finally:
         if source_progress is not None:
             try:
                 source_progress.close()
             except Exception:
                 plugin._log.debug("Failed to close source progress for {}", playlist_name)
+
+    # Merge in configured source order, whatever order they finished in
+    all_tracks = []
+    with open(log_file, 'a', encoding='utf-8') as f:
+        f.write("Sources:\n")
+        for result in source_results:
+            status = f"error: {result.error}" if result.error else f"{len(result.tracks)} tracks"
+            f.write(f"Source {result.source}: {status} in {result.elapsed:.2f}s\n")
+            all_tracks.extend(result.tracks)
+        f.write("\n")
     
     unique_tracks = []
     seen = set()
     for t in all_tracks:
-        # Some sources may set explicit None values; normalize to empty strings before lowercasing
-        key = (
-            (t.get('title') or '').lower(),
-            (t.get('artist') or '').lower(),
-            (t.get('album') or '').lower(),
-        )
+        key = song_key(t)
         if key not in seen:
             seen.add(key)
             unique_tracks.append(t)
     
     plugin._log.info("Found {} unique tracks across sources", len(unique_tracks))
     
-    matched_songs = []
     match_progress = plugin.create_progress_counter(
         total=len(unique_tracks),
         desc=f"{playlist_name[:18]} match",
         unit="track",
     )
-    
+
+    def song_done():
+        if match_progress is not None:
+            try:
+                match_progress.update()
+            except Exception:
+                plugin._log.debug("Failed to update match progress for {}", playlist_name)
+
     try:
-        for song in unique_tracks:
-            found = plugin.search_plex_song(song, manual_search)
-            if found is not None:
-                matched_songs.append(found)
-            if match_progress is not None:
-                try:
-                    match_progress.update()
-                except Exception:
-                    plugin._log.debug("Failed to update match progress for {}", playlist_name)
+        matched_songs = match_songs(plugin, playlist_name, unique_tracks, manual_search, on_song=song_done)
     finally:
         if match_progress is not None:
             try:
@@ -321,15 +480,16 @@ def generate_imported_playlist(plugin, lib, playlist_config, plex_lookup=None):
     
     plugin._log.info("Found {} unique tracks after filtering (see {} for details)", len(unique_matched), log_file)
     
-    if clear_playlist:
-        try:
-            plugin._plex_clear_playlist(playlist_name)
-            plugin._log.info("Cleared existing playlist {}", playlist_name)
-        except Exception:
-            plugin._log.debug("No existing playlist {} found", playlist_name)
-    
     if unique_matched:
-        plugin._plex_add_playlist_item(unique_matched, playlist_name)
+        if clear_playlist:
+            plugin._plex_sync_playlist(unique_matched, playlist_name)
+        else:
+            plugin._plex_add_playlist_item(unique_matched, playlist_name)
         plugin._log.info("Successfully created playlist {} with {} tracks", playlist_name, len(unique_matched))
     else:
+        if clear_playlist:
+            try:
+                plugin._plex_clear_playlist(playlist_name)
+            except Exception:
+                plugin._log.debug("No existing playlist {} found", playlist_name)
         plugin._log.warning("No tracks remaining after filtering for {}", playlist_name)
\ No newline at end of file
@@ -4,8 +4,9 @@ These functions use the plugin instance (`ps`) to access logging, config,
 and Plex/beets objects. Behavior preserved.
 """
 
-from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime, timedelta
+import contextlib
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
 from typing import Tuple
 import time
 import os
@@ -13,9 +14,16 @@ import copy
 import copy
 
 import json
+import zlib
 
 from beets import config
 from beetsplug.core.config import get_config_value, get_plexsync_config
+from beetsplug.core import projection
+from beetsplug.core.features import FeatureTable, extract_track_features
+from beetsplug.core.sampling import gumbel_top_k
+from beetsplug.plex import operations as plex_ops
+from beetsplug.plex import sonic
+from beetsplug.plex import streaming
 from beetsplug.core.vector_index import BeetsVectorIndex
 from beetsplug.providers.gaana import import_gaana_playlist
 from beetsplug.providers.tidal import import_tidal_playlist
@@ -27,8 +35,41 @@ from beetsplug.providers.http_post import import_post_playlist
 import numpy as np
 _module_rng = np.random.default_rng()
 
+# Stands in for the shared query-cache lock when a playlist runs on its own
+_NO_LOCK = contextlib.nullcontext()
 
 
+def playlist_rng(seed, playlist_name):
+    """Return a Generator derived from the run ``seed`` and a playlist name.
+
+    Each playlist gets its own stream, so results do not depend on the order
+    in which (possibly concurrent) playlists consume random numbers.
+    """
+    if seed is None:
+        return None
+    name_key = zlib.crc32(str(playlist_name).encode("utf-8"))
+    return np.random.default_rng([abs(int(seed)), name_key])
+
+
+def _rng(ps):
+    """Return the playlist's seeded Generator, or the module-level one."""
+    return getattr(ps, "rng", None) or _module_rng
+
+
+def _base_time(ps):
+    """Return the pinned scoring time of a seeded run, or now."""
+    return getattr(ps, "base_time", None) or datetime.now()
+
+
+def _plan(ps):
+    """Return the plan record of the current playlist, if one is kept."""
+    return getattr(ps, "plan", None)
+
+
+def _rating_keys(items):
+    return [getattr(item, "plex_ratingkey", None) or getattr(item, "ratingKey", None)
+            for item in items]
+
 
 def _resolve_min_year(ps, playlist_config, default_max_age_years, playlist_label):
     now_year = datetime.now().year
@@ -105,48 +146,111 @@ def _apply_recency_guard(ps, playlist_config, filters, playlist_label, default_m
     return min_year, adjusted_filters
 
 
-def _filter_tracks_by_min_year(ps, tracks, min_year, playlist_label):
-    if min_year is None or not tracks:
-        return tracks
+class _PrefixedLogger:
+    """Logger wrapper that tags every message with a playlist name."""
 
-    filtered = []
-    dropped = 0
-    for track in tracks:
-        year = getattr(track, "year", None)
-        try:
-            if year is None:
-                raise ValueError
-            year_int = int(year)
-        except (TypeError, ValueError):
-            dropped += 1
-            continue
+    def __init__(self, log, prefix):
+        self._inner = log
+        self._prefix = prefix
 
-        if year_int >= min_year:
-            filtered.append(track)
-        else:
-            dropped += 1
+    def _emit(self, level, msg, *args, **kwargs):
+        getattr(self._inner, level)("[{}] " + msg, self._prefix, *args, **kwargs)
 
-    if dropped and filtered:
-        ps._log.debug(
-            "Removed {} tracks older than {} for {} playlist",
-            dropped,
-            min_year,
-            playlist_label,
-        )
-        return filtered
+    def debug(self, msg, *args, **kwargs):
+        self._emit("debug", msg, *args, **kwargs)
 
-    if dropped and not filtered:
-        ps._log.debug(
-            "Min year {} removed all tracks for {} playlist; retaining original pool",
-            min_year,
-            playlist_label,
-        )
+    def info(self, msg, *args, **kwargs):
+        self._emit("info", msg, *args, **kwargs)
 
-    return tracks
+    def warning(self, msg, *args, **kwargs):
+        self._emit("warning", msg, *args, **kwargs)
 
+    def error(self, msg, *args, **kwargs):
+        self._emit("error", msg, *args, **kwargs)
 
+    def exception(self, msg, *args, **kwargs):
+        self._emit("exception", msg, *args, **kwargs)
 
-def get_preferred_attributes(ps) -> Tuple[list, list]:
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+class PlaylistContext:
+    """Per-playlist view of the plugin used when playlists run concurrently.
+
+    Everything is delegated to the plugin, so caches and the feature table
+    stay shared, but log lines carry the playlist name. In seeded runs it
+    also carries the playlist's own ``rng``, the pinned ``base_time`` and
+    the ``plan`` record selections are written to.
+    """
+
+    def __init__(self, plugin, playlist_name, rng=None, plan=None, base_time=None):
+        self._plugin = plugin
+        self._log = _PrefixedLogger(plugin._log, playlist_name)
+        self.rng = rng
+        self.plan = plan
+        self.base_time = base_time
+
+    def __getattr__(self, name):
+        return getattr(self._plugin, name)
+
+    def _plex_add_playlist_item(self, items, playlist):
+        plex_ops.plex_add_playlist_item(self._plugin.plex, items, playlist, self._log)
+
+    def _plex_sync_playlist(self, items, playlist):
+        plex_ops.sync_plex_playlist(self._plugin.plex, playlist, items, self._log)
+
+
+SonicMatch = namedtuple("SonicMatch", ["ratingKey", "distance"])
+
+
+def _keep_sonic_candidate(rating, item):
+    """Apply the discovery rating filter, preferring the current beets rating."""
+    if item is not None:
+        rating = getattr(item, "plex_userrating", None)
+    return rating is None or rating == -1 or rating >= 4
+
+
+def _walk_sonic_graph(ps, graph, history_tracks, history_genres, recently_played, plex_lookup):
+    """Rank discovery candidates by a random walk with restart from history."""
+    restart = get_plexsync_config("sonic_walk_restart", float, 0.15) or 0.15
+    restart = min(1.0, max(0.01, restart))
+    limit = get_plexsync_config("sonic_walk_candidates", int, 500)
+
+    _t0 = time.time()
+    seeds = {track.ratingKey: 1.0 for track in history_tracks}
+    ranked = graph.rank(seeds, exclude=recently_played, restart=restart)
+
+    matches = []
+    for key, _score in ranked:
+        row = graph.index[key]
+        if history_genres.isdisjoint(graph.genres[row]):
+            continue
+        item = plex_lookup.get(key) if plex_lookup else None
+        if not _keep_sonic_candidate(graph.rating[row], item):
+            continue
+        distance = graph.distance[row]
+        matches.append(SonicMatch(key, float(distance) if np.isfinite(distance) else None))
+        if limit and len(matches) >= limit:
+            break
+    ps._log.debug(
+        "Random walk over sonic graph ranked {} tracks in {:.3f}s",
+        len(ranked),
+        time.time() - _t0,
+    )
+    return matches
+
+
+def get_preferred_attributes(ps, plex_lookup=None) -> Tuple[list, list]:
+    """Return the top genres and sonic discovery candidates from recent plays.
+
+    Neighbor lists come from the persistent sonic cache. By default the
+    candidates are ranked by a random walk over the graph of all cached
+    neighbor lists (``sonic_discovery: walk``); ``sonic_discovery: neighbors``
+    keeps the one-hop neighbors of each recent play instead. When
+    ``plex_lookup`` is given, a candidate's current beets rating is preferred
+    over the cached one.
+    """
     # Defaults from config
     defaults_cfg = get_plexsync_config(["playlists", "defaults"], dict, {})
 
@@ -164,44 +268,44 @@ def get_preferred_attributes(ps) -> Tuple[list, list]:
     ]
 
     recently_played = {track.ratingKey for track in all_tracks}
+    neighbors_by_seed = sonic.get_sonic_neighbors(ps, history_tracks)
 
     genre_counts = {}
-    similar_tracks = set()
-
-    def get_sonic_matches(track):
+    seed_genres = {}
+    for track in history_tracks:
         track_genres = set()
         for genre in track.genres:
             if genre:
-                genre_str = str(genre.tag).lower()
-                track_genres.add(genre_str)
-
-        local_similar_tracks = set()
-        try:
-            sonic_matches = track.sonicallySimilar()
-            for match in sonic_matches:
-                rating = getattr(match, "userRating", -1)
-                if (
-                    match.ratingKey not in recently_played
-                    and any(g.tag.lower() in track_genres for g in match.genres)
-                    and (rating is None or rating == -1 or rating >= 4)
-                ):
-                    local_similar_tracks.add(match)
-        except Exception as e:
-            ps._log.debug("Error getting similar tracks for {}: {}", track.title, e)
-        return local_similar_tracks, track_genres
-
-    with ThreadPoolExecutor() as executor:
-        results = executor.map(get_sonic_matches, history_tracks)
-
-    for local_similar_tracks, track_genres in results:
-        similar_tracks.update(local_similar_tracks)
+                track_genres.add(str(genre.tag).lower())
         for genre in track_genres:
             genre_counts[genre] = genre_counts.get(genre, 0) + 1
+        seed_genres[track.ratingKey] = track_genres
+
+    mode = str(get_plexsync_config("sonic_discovery", str, "walk") or "walk").lower()
+    if mode == "walk":
+        graph = sonic.load_sonic_graph(ps, neighbors_by_seed)
+        history_genres = frozenset().union(*seed_genres.values())
+        matches = _walk_sonic_graph(
+            ps, graph, history_tracks, history_genres, recently_played, plex_lookup
+        )
+    else:
+        similar_tracks = {}
+        for track in history_tracks:
+            track_genres = seed_genres[track.ratingKey]
+            for key, distance, genres, rating in neighbors_by_seed.get(track.ratingKey, []):
+                if key in recently_played or not track_genres.intersection(genres):
+                    continue
+                item = plex_lookup.get(key) if plex_lookup else None
+                if _keep_sonic_candidate(rating, item):
+                    best = similar_tracks.get(key)
+                    if best is None or (distance or 0) < (best.distance or 0):
+                        similar_tracks[key] = SonicMatch(key, distance)
+        matches = list(similar_tracks.values())
 
     sorted_genres = sorted(genre_counts, key=genre_counts.get, reverse=True)[:5]
     ps._log.debug("Top genres: {}", sorted_genres)
-    ps._log.debug("Found {} similar tracks after filtering", len(similar_tracks))
-    return sorted_genres, list(similar_tracks)
+    ps._log.debug("Found {} similar tracks after filtering", len(matches))
+    return sorted_genres, matches
 
 
 # Define default scoring weights for each playlist type
@@ -347,59 +451,41 @@ def get_scoring_weights(playlist_type):
     return DEFAULT_SCORING_WEIGHTS.get(playlist_type, DEFAULT_SCORING_WEIGHTS["default"])
 
 
-def _compute_context_stats(tracks, base_time):
-    """Compute normalization stats once for a track pool."""
-    import numpy as _np
-    ratings = []
-    days_since = []
-    play_counts = []
-    popularities = []
-    ages = []
-
-    for t in tracks:
-        # Ratings
-        try:
-            ratings.append(float(getattr(t, 'plex_userrating', 0) or 0))
-        except (TypeError, ValueError):
-            ratings.append(0.0)
+# Order of the metric columns used by the vectorized scoring engine.
+SCORING_METRICS = ("z_rating", "z_recency", "z_play_count", "z_popularity", "z_age")
 
-        # Days since played
-        ts = getattr(t, 'plex_lastviewedat', None)
-        if ts is None:
-            # Assume not played in last year for normalization default
-            days_since.append(365)
-        else:
-            try:
-                dt = datetime.fromtimestamp(float(ts))
-                days = max((base_time - dt).days, 0)
-                days_since.append(min(days, 1095))
-            except (ValueError, TypeError, OSError, OverflowError):
-                days_since.append(365)
+# Range accepted by datetime.fromtimestamp(); other values count as invalid.
+_MIN_TIMESTAMP = -62135596800.0
+_MAX_TIMESTAMP = 253402300799.0
 
-        # Play count
-        try:
-            play_counts.append(int(getattr(t, 'plex_viewcount', 0) or 0))
-        except (TypeError, ValueError):
-            play_counts.append(0)
 
-        # Popularity
-        try:
-            popularities.append(float(getattr(t, 'spotify_track_popularity', 0) or 0))
-        except (TypeError, ValueError):
-            popularities.append(0.0)
+def _days_since(last_played, base_time):
+    """Whole days between each timestamp and ``base_time`` (NaN if invalid).
+
+    Works on epoch seconds, so around a DST change the result can differ by
+    one day from subtracting naive local datetimes for timestamps within an
+    hour of midnight.
+    """
+    valid = (
+        np.isfinite(last_played)
+        & (last_played > _MIN_TIMESTAMP)
+        & (last_played < _MAX_TIMESTAMP)
+    )
+    days = np.full(last_played.shape, np.nan)
+    days[valid] = np.floor((base_time.timestamp() - last_played[valid]) / 86400.0)
+    return days
 
-        # Age
-        y = getattr(t, 'year', None)
-        try:
-            y = int(y)
-            ages.append(max(base_time.year - y, 0))
-        except (TypeError, ValueError):
-            ages.append(0)
 
-    arr = lambda x: _np.array(x, dtype=float)
-    r, d, pc, pop, ag = arr(ratings), arr(days_since), arr(play_counts), arr(popularities), arr(ages)
+def _context_stats_from_features(features, base_time):
+    days = _days_since(features['last_played'], base_time)
+    d = np.where(np.isnan(days), 365.0, np.clip(days, 0, 1095))
+    year = features['year']
+    ag = np.where(np.isnan(year), 0.0, np.maximum(base_time.year - year, 0))
+    r = features['rating']
+    pc = features['play_count']
+    pop = features['popularity']
 
-    stats = {
+    return {
         'rating_mean': float(r.mean()) if r.size else 0.0,
         'rating_std': float(r.std()) or 1.0,
         'days_mean': float(d.mean()) if d.size else 365.0,
@@ -412,7 +498,68 @@ def _compute_context_stats(tracks, base_time):
         'age_mean': float(ag.mean()) if ag.size else 0.0,
         'age_std': float(ag.std()) or 1.0,
     }
-    return stats
+
+
+def _compute_context_stats(tracks, base_time):
+    """Compute normalization stats once for a track pool."""
+    return _context_stats_from_features(extract_track_features(tracks), base_time)
+
+
+def calculate_track_scores(tracks, base_time=None, playlist_type=None,
+                           tracks_context_stats=None, features=None, rng=None):
+    """Score a whole track pool at once.
+
+    Vectorized equivalent of calling :func:`calculate_track_score` for each
+    track with the same context stats: same z-scores, clipping, per-type
+    rated/unrated weights, CDF transform, noise and unrated floor. Returns a
+    float array aligned with ``tracks`` (or with ``features`` when given).
+    """
+    from scipy.special import ndtr
+
+    if base_time is None:
+        base_time = datetime.now()
+    if features is None:
+        features = extract_track_features(tracks)
+    if tracks_context_stats is None:
+        tracks_context_stats = _context_stats_from_features(features, base_time)
+    if rng is None:
+        rng = _module_rng
+
+    stats_ = tracks_context_stats
+    rating = features['rating']
+    n = rating.shape[0]
+    if n == 0:
+        return np.zeros(0)
+
+    days = _days_since(features['last_played'], base_time)
+    never_played = np.isnan(features['last_played'])
+    days = np.where(
+        never_played,
+        stats_.get('days_90th_percentile', 365),
+        np.where(np.isnan(days), 365.0, np.minimum(days, 1095)),
+    )
+    year = features['year']
+    age = np.where(np.isnan(year) | (year == 0), 0.0, base_time.year - year)
+
+    is_rated = rating > 0
+    z = np.empty((n, len(SCORING_METRICS)))
+    z[:, 0] = np.where(
+        is_rated, (rating - stats_['rating_mean']) / (stats_['rating_std'] or 1), -2.0
+    )
+    z[:, 1] = (days - stats_['days_mean']) / (stats_['days_std'] or 1)
+    z[:, 2] = (features['play_count'] - stats_['play_count_mean']) / (stats_['play_count_std'] or 1)
+    z[:, 3] = (features['popularity'] - stats_['popularity_mean']) / (stats_['popularity_std'] or 1)
+    z[:, 4] = -(age - stats_['age_mean']) / (stats_['age_std'] or 1)
+    np.clip(z, -3, 3, out=z)
+
+    weights = get_scoring_weights(playlist_type)
+    w_rated = np.array([weights["rated_weights"].get(m, 0.0) for m in SCORING_METRICS])
+    w_unrated = np.array([weights["unrated_weights"].get(m, 0.0) for m in SCORING_METRICS])
+    weighted = np.where(is_rated, z @ w_rated, z @ w_unrated)
+
+    scores = ndtr(weighted * 1.5) * 100 + rng.normal(0, 0.5, size=n)
+    scores = np.where(~is_rated & (scores < 50), 50 + scores / 2, scores)
+    return np.clip(scores, 0, 100)
 
 
 def calculate_track_score(ps, track, base_time=None, tracks_context=None, playlist_type=None, tracks_context_stats=None):
@@ -526,7 +673,7 @@ def calculate_track_score(ps, track, base_time=None, tracks_context=None, playli
         weighted_score += metric_value * weight
 
     final_score = stats.norm.cdf(weighted_score * 1.5) * 100
-    noise = _np.random.normal(0, 0.5)
+    noise = _rng(ps).normal(0, 0.5)
     final_score = final_score + noise
     if not is_rated and final_score < 50:
         final_score = 50 + (final_score / 2)
@@ -534,45 +681,59 @@ def calculate_track_score(ps, track, base_time=None, tracks_context=None, playli
     return max(0, min(100, final_score))
 
 
-def select_tracks_weighted(ps, tracks, num_tracks, playlist_type=None):
-    import numpy as np
-    global _module_rng
+def select_tracks_weighted(ps, tracks, num_tracks, playlist_type=None, features=None):
+    """Pick up to ``num_tracks`` of ``tracks``, favouring higher scores.
+
+    ``features`` may carry precomputed feature arrays aligned with ``tracks``
+    (see :class:`FeatureTable`) to skip reading them from the items.
+    """
     if not tracks:
         return []
+    selected_indices = _weighted_choice(ps, tracks, num_tracks, playlist_type, features)
+    return [tracks[i] for i in selected_indices]
 
-    # Standard weighted selection for all playlist types
-    base_time = datetime.now()
 
-    # Precompute stats once to avoid O(n^2) behavior on large pools
-    context_stats = _compute_context_stats(tracks, base_time)
+def _weighted_choice(ps, tracks, num_tracks, playlist_type=None, features=None, exclude=None):
+    """Return the indices into ``tracks`` chosen by weighted selection.
 
-    # Compute scores using precomputed stats
-    track_scores = [
-        (track, calculate_track_score(ps, track, base_time, tracks_context_stats=context_stats, playlist_type=playlist_type))
-        for track in tracks
-    ]
-    scores = np.array([score for _, score in track_scores])
+    ``exclude`` is an optional boolean mask of tracks that must not be chosen.
+    """
+    if not len(tracks) or num_tracks <= 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # Standard weighted selection for all playlist types
+    base_time = _base_time(ps)
+    rng = _rng(ps)
+
+    # Score the whole pool in one vectorized pass
+    scores = calculate_track_scores(
+        tracks, base_time, playlist_type=playlist_type, features=features, rng=rng
+    )
 
     # Add a small amount of random noise to scores to prevent deterministic outcomes
     # This ensures even tracks with similar scores have variation in selection
-    noise = _module_rng.normal(0, 1.0, size=len(scores))
+    noise = rng.normal(0, 1.0, size=len(scores))
     scores_with_noise = scores + noise
 
-    # Stable softmax
-    x = scores_with_noise / 10.0
-    x = x - x.max()
-    exp_x = np.exp(x)
-    probabilities = exp_x / exp_x.sum()
-
-    selected_indices = _module_rng.choice(
-        len(tracks), size=min(num_tracks, len(tracks)), replace=False, p=probabilities
+    # Draw without replacement proportionally to softmax(scores / 10)
+    selected_indices = gumbel_top_k(
+        scores_with_noise / 10.0, num_tracks, exclude=exclude, rng=rng
     )
     selected_tracks = [tracks[i] for i in selected_indices]
 
+    plan = _plan(ps)
+    if plan is not None:
+        plan.setdefault("selections", []).append({
+            "pool_size": len(tracks),
+            "excluded": int(np.count_nonzero(exclude)) if exclude is not None else 0,
+            "rating_keys": _rating_keys(selected_tracks),
+            "scores": [round(float(score), 4) for score in scores[selected_indices]],
+        })
+
     # Avoid verbose per-track logging; summarize and sample a few examples
     try:
-        sel_scores = [track_scores[i][1] for i in selected_indices]
-        mean_score = float(np.mean(sel_scores)) if sel_scores else 0.0
+        sel_scores = scores[selected_indices]
+        mean_score = float(np.mean(sel_scores)) if len(sel_scores) else 0.0
         rating_values = []
         play_values = []
         age_values = []
@@ -651,10 +812,16 @@ def select_tracks_weighted(ps, tracks, num_tracks, playlist_type=None):
         # Never fail selection due to logging issues
         pass
 
-    return selected_tracks
+    return selected_indices
 
 
-def build_advanced_filters(filter_config, exclusion_days, preferred_genres=None):
+def build_advanced_filters(filter_config, exclusion_days, preferred_genres=None, volatile=True):
+    """Translate playlist filters into a Plex advanced filter, or ``None``.
+
+    With ``volatile=False`` the rating and recent-play clauses are left out:
+    they change whenever a track is rated or played, which does not bump the
+    section's ``updatedAt``, so they must not be part of a cached query.
+    """
     adv = {'and': []}
     if filter_config:
         include = filter_config.get('include', {}) or {}
@@ -688,11 +855,11 @@ def build_advanced_filters(filter_config, exclusion_days, preferred_genres=None)
             # Exclude anything strictly after Y => require year <= Y
             adv['and'].append({'year<<': exc_years['after']})
         # Rating filter at top-level of filter_config
-        if 'min_rating' in filter_config:
+        if volatile and 'min_rating' in filter_config:
             mr = filter_config['min_rating']
             adv['and'].append({'or': [{'userRating': 0}, {'userRating>>': mr}]})
     # Exclude recent plays
-    if exclusion_days and exclusion_days > 0:
+    if volatile and exclusion_days and exclusion_days > 0:
         adv['and'].append({'lastViewedAt<<': f'-{exclusion_days}d'})
     # Clean up if empty
     if not adv['and']:
@@ -702,25 +869,176 @@ def build_advanced_filters(filter_config, exclusion_days, preferred_genres=None)
 
 def _get_with_cache(ps, cache_key, func):
     """Helper to cache results of a function call."""
-    if cache_key in ps._server_query_cache:
-        ps._log.debug("Using cached results for key: {}", cache_key)
-        return ps._server_query_cache[cache_key]
+    lock = getattr(ps, "_server_query_lock", None) or _NO_LOCK
+    with lock:
+        if cache_key in ps._server_query_cache:
+            ps._log.debug("Using cached results for key: {}", cache_key)
+            return ps._server_query_cache[cache_key]
 
     results = func()
-    ps._server_query_cache[cache_key] = results
-    return results
+    with lock:
+        # Another playlist may have finished the same query meanwhile
+        return ps._server_query_cache.setdefault(cache_key, results)
+
+
+def _section_updated_at(section):
+    updated_at = getattr(section, "updatedAt", None)
+    if isinstance(updated_at, datetime):
+        return updated_at.timestamp()
+    try:
+        return float(updated_at) if updated_at is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _search_tracks_persistent(ps, adv_filters, cache_key):
+    """Run a filtered track search through the persistent query cache.
+
+    Results are stored as ordered rating keys for ``query_cache_hours``
+    (default 12, ``0`` disables). An entry is dropped early when the music
+    section's ``updatedAt`` has advanced since it was stored. Cache hits
+    return :class:`~beetsplug.plex.streaming.TrackRecord` stand-ins that
+    carry only the rating key; playlists resolve them via ``plex_lookup``.
+    """
+    cache = getattr(ps, "cache", None)
+    ttl_hours = get_plexsync_config("query_cache_hours", float, 12)
+    section_id = getattr(ps.music, "key", None)
+    section_updated_at = _section_updated_at(ps.music)
+
+    if cache is not None and ttl_hours and section_id is not None:
+        entry = cache.get_server_query(cache_key, section_id)
+        if entry is not None:
+            age = datetime.now(timezone.utc).replace(tzinfo=None) - entry["created_at"]
+            stale_section = (
+                section_updated_at is not None
+                and (entry["section_updated_at"] or 0) < section_updated_at
+            )
+            if age <= timedelta(hours=ttl_hours) and not stale_section:
+                ps._log.debug(
+                    "Persistent query cache hit ({} tracks)", len(entry["rating_keys"])
+                )
+                return [streaming.TrackRecord(key) for key in entry["rating_keys"]]
+
+    tracks = ps.music.searchTracks(filters=adv_filters)
+    if cache is not None and ttl_hours and section_id is not None:
+        cache.set_server_query(
+            cache_key, section_id, [track.ratingKey for track in tracks], section_updated_at
+        )
+    return tracks
+
+
+def _max_candidate_pool():
+    """Return the configured ``max_candidate_pool`` or ``None``."""
+    defaults_cfg = get_plexsync_config(["playlists", "defaults"], dict, {})
+    max_pool = get_config_value(defaults_cfg, defaults_cfg, "max_candidate_pool", None)
+    try:
+        max_pool = int(max_pool) if max_pool else None
+    except (TypeError, ValueError):
+        return None
+    return max_pool if max_pool and max_pool > 0 else None
+
 
+def _stream_all_tracks(ps, max_pool):
+    """List every section track as lightweight records, sampling if capped."""
+    _t0 = time.time()
+    records = streaming.iter_section_tracks(ps.plex, ps.music)
+    if max_pool:
+        tracks = streaming.reservoir_sample(records, max_pool, _rng(ps))
+    else:
+        tracks = list(records)
+    ps._log.debug(
+        "Streamed {} track records (pool cap {}) in {:.2f}s",
+        len(tracks), max_pool, time.time() - _t0,
+    )
+    return tracks
 
-def _get_library_tracks(ps, preferred_genres, filters, exclusion_days):
 
-    adv_filters = build_advanced_filters(filters, exclusion_days, preferred_genres)
+def _volatile_exclusion_filters(filter_config, exclusion_days):
+    """Plex filter matching the tracks the rating and recent-play filters drop."""
+    clauses = []
+    if exclusion_days and exclusion_days > 0:
+        clauses.append({'lastViewedAt>>': f'{exclusion_days}d'})
+    min_rating = (filter_config or {}).get('min_rating')
+    if min_rating:
+        clauses.append({'and': [{'userRating>>': 0}, {'userRating<<': min_rating}]})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {'or': clauses}
+
+
+def _volatile_exclusions(ps, filters, exclusion_days, table=None):
+    """Rating keys of tracks dropped by the rating and recent-play filters.
+
+    Queried from Plex on every run (once per run for the same filters). If
+    the query fails, the beets ``plex_userrating`` and ``plex_lastviewedat``
+    fields of ``table`` are used instead.
+    """
+    adv_filters = _volatile_exclusion_filters(filters, exclusion_days)
+    if adv_filters is None:
+        return set()
+    cache_key = "exclude:" + json.dumps(adv_filters, sort_keys=True)
+    try:
+        tracks = _get_with_cache(
+            ps, cache_key, lambda: ps.music.searchTracks(filters=adv_filters)
+        )
+        return {track.ratingKey for track in tracks}
+    except Exception as e:
+        ps._log.debug("Exclusion query failed (using beets fields): {}", e)
+    if table is None:
+        return set()
+    dropped = np.ones(len(table), dtype=bool)
+    dropped[_volatile_filter_rows(ps, table, table.rows, filters, exclusion_days)] = False
+    keys = list(table.source)
+    return {keys[row] for row in table.rows[dropped]}
+
+
+def _volatile_filter_rows(ps, table, rows, filters, exclusion_days):
+    """Apply the rating and recent-play filters to ``rows`` locally.
+
+    Uses the beets ``plex_userrating`` and ``plex_lastviewedat`` fields of
+    the feature table, which are only as fresh as the last library sync.
+    """
+    keep = np.ones(len(rows), dtype=bool)
+    min_rating = (filters or {}).get('min_rating')
+    if min_rating is not None:
+        ratings = table.rating[rows]
+        keep &= (ratings == 0) | (ratings >= float(min_rating))
+    if exclusion_days and exclusion_days > 0:
+        cutoff = (_base_time(ps) - timedelta(days=exclusion_days)).timestamp()
+        # Never played tracks (NaN) are kept
+        keep &= ~(table.features['last_played'][rows] >= cutoff)
+    return rows[keep]
+
+
+def _get_library_tracks(ps, preferred_genres, filters, exclusion_days, table=None):
+    """Return candidate tracks matching the playlist filters.
+
+    The time-invariant filters run through the persistent query cache and
+    the tracks of :func:`_volatile_exclusions` are dropped from the result.
+    Without time-invariant filters the full filter goes to the server and
+    is only cached for the current run.
+    """
+    max_pool = _max_candidate_pool()
+
+    invariant = build_advanced_filters(filters, exclusion_days, preferred_genres, volatile=False)
+    adv_filters = invariant or build_advanced_filters(filters, exclusion_days, preferred_genres)
     if adv_filters:
         cache_key = json.dumps(adv_filters, sort_keys=True)
         try:
             ps._log.debug("Using server-side filters: {}", adv_filters)
             _t0 = time.time()
 
-            tracks = _get_with_cache(ps, cache_key, lambda: ps.music.searchTracks(filters=adv_filters))
+            if invariant:
+                tracks = _get_with_cache(
+                    ps, cache_key, lambda: _search_tracks_persistent(ps, adv_filters, cache_key)
+                )
+                excluded = _volatile_exclusions(ps, filters, exclusion_days, table)
+                if excluded:
+                    tracks = [track for track in tracks if track.ratingKey not in excluded]
+            else:
+                tracks = _get_with_cache(
+                    ps, cache_key, lambda: ps.music.searchTracks(filters=adv_filters)
+                )
 
             ps._log.debug(
                 "Server-side filter fetched {} tracks in {:.2f}s",
@@ -728,36 +1046,167 @@ def _get_library_tracks(ps, preferred_genres, filters, exclusion_days):
             )
         except Exception as e:
             ps._log.debug("Server-side filter failed (falling back to client filter): {}", e)
-            _t0 = time.time()
-            tracks = ps.music.search(libtype="track")
-            ps._log.debug(
-                "Client-side fetch (no server filters) returned {} tracks in {:.2f}s",
-                len(tracks), time.time() - _t0,
-            )
+            return _stream_all_tracks(ps, max_pool)
     else:
-        # No filters specified; fetch all tracks (may be large)
-        _t0 = time.time()
-        tracks = ps.music.search(libtype="track")
-        ps._log.debug(
-            "Fetched all tracks (no filters) -> {} in {:.2f}s",
-            len(tracks), time.time() - _t0,
-        )
+        # No filters specified; stream the whole section (may be large)
+        return _stream_all_tracks(ps, max_pool)
 
     # Optional candidate pool cap to avoid huge post-filtering work
-    try:
-        defaults_cfg = get_plexsync_config(["playlists", "defaults"], dict, {})
-        max_pool = get_config_value(defaults_cfg, defaults_cfg, "max_candidate_pool", None)
-        if max_pool:
-            import random
-            if len(tracks) > int(max_pool):
-                tracks = random.sample(tracks, int(max_pool))
-                ps._log.debug("Capped candidate pool to {} tracks", max_pool)
-    except Exception:
-        pass
+    if max_pool and len(tracks) > max_pool:
+        tracks = [tracks[i] for i in _rng(ps).choice(len(tracks), max_pool, replace=False)]
+        ps._log.debug("Capped candidate pool to {} tracks", max_pool)
 
     return tracks
 
 
+def _get_feature_table(ps, plex_lookup):
+    """Return the run's shared feature table, building one if needed."""
+    table = getattr(ps, "_feature_table", None)
+    if table is None or table.source is not plex_lookup:
+        table = FeatureTable(plex_lookup)
+    return table
+
+
+def _genre_filter_mask(table, rows, filters):
+    """Mask of ``rows`` passing the include/exclude genre filters."""
+    mask = np.ones(len(rows), dtype=bool)
+    include = filters.get('include') or {}
+    exclude = filters.get('exclude') or {}
+    if include.get('genres'):
+        mask &= table.genre_mask(rows, include['genres'])
+    if exclude.get('genres'):
+        mask &= ~table.genre_mask(rows, exclude['genres'])
+    return mask
+
+
+def _special_rows(ps, lib, table, filters, playlist_type):
+    """Rows of linked beets items passing a beets-based playlist's filters.
+
+    Year and rating filters run as an indexed SQL query against the beets
+    database; only genre filters are applied to the returned rows. Falls
+    back to filtering the whole feature table if the query fails.
+    """
+    try:
+        item_ids = projection.query_linked_item_ids(lib, filters, playlist_type, ps._log)
+    except Exception as e:  # noqa: BLE001 - e.g. a library without the schema
+        ps._log.debug("SQL playlist filter failed, filtering in memory: {}", e)
+        rows = table.rows[table.linked]
+        rows = rows[_special_filter_mask(table, rows, filters, playlist_type)]
+        if playlist_type == "highly_rated":
+            rows = rows[table.rating[rows] >= 7.0]
+        return rows
+
+    rows = np.sort(table.rows_for_ids(item_ids))
+    rows = rows[table.linked[rows]]
+    return rows[_genre_filter_mask(table, rows, filters)]
+
+
+def _special_filter_mask(table, rows, filters, playlist_type):
+    """Mask of ``rows`` passing the config filters of beets-based playlists.
+
+    Years of 0 (unknown) pass the year filters, except for the 70s/80s
+    playlist which requires a known year between 1970 and 1990.
+    """
+    mask = np.ones(len(rows), dtype=bool)
+    year = table.year[rows]
+    has_year = ~np.isnan(year) & (year != 0)
+    year = np.nan_to_num(year)
+    include = filters.get('include') or {}
+    exclude = filters.get('exclude') or {}
+
+    years_config = include.get('years')
+    if years_config:
+        if 'after' in years_config:
+            mask &= ~(has_year & (year <= years_config['after']))
+        if 'before' in years_config:
+            mask &= ~(has_year & (year >= years_config['before']))
+        if 'between' in years_config:
+            start_year, end_year = years_config['between']
+            mask &= ~(has_year & ~((start_year <= year) & (year <= end_year)))
+
+    mask &= _genre_filter_mask(table, rows, filters)
+
+    years_config = exclude.get('years')
+    if years_config:
+        if 'before' in years_config:
+            mask &= ~(has_year & (year < years_config['before']))
+        if 'after' in years_config:
+            mask &= ~(has_year & (year > years_config['after']))
+
+    # min_rating only applies to rated tracks
+    if 'min_rating' in filters:
+        rating = table.filter_rating[rows]
+        mask &= ~((rating > 0) & (rating < filters['min_rating']))
+
+    if playlist_type == "70s80s_flashback":
+        mask &= has_year & (year >= 1970) & (year <= 1990)
+
+    return mask
+
+
+def _filter_rows_by_min_year(ps, table, rows, min_year, playlist_label):
+    """Keep rows released in or after ``min_year``.
+
+    Tracks without a usable year are dropped. If nothing would remain, the
+    original rows are kept instead.
+    """
+    if min_year is None or not len(rows):
+        return rows
+
+    year = table.year[rows]
+    keep = ~np.isnan(year) & (year >= min_year)
+    dropped = int(len(rows) - keep.sum())
+    filtered = rows[keep]
+
+    if dropped and len(filtered):
+        ps._log.debug(
+            "Removed {} tracks older than {} for {} playlist",
+            dropped,
+            min_year,
+            playlist_label,
+        )
+        return filtered
+
+    if dropped and not len(filtered):
+        ps._log.debug(
+            "Min year {} removed all tracks for {} playlist; retaining original pool",
+            min_year,
+            playlist_label,
+        )
+
+    return rows
+
+
+def _select_rows(ps, table, rows, count, playlist_type, exclude=None):
+    """Weighted selection of up to ``count`` of ``rows`` not in ``exclude``."""
+    if not len(rows) or count <= 0:
+        return rows[:0]
+    chosen = _weighted_choice(
+        ps, table.items_at(rows), count, playlist_type,
+        features=table.subset(rows), exclude=exclude,
+    )
+    return rows[chosen]
+
+
+def _select_rated_unrated(ps, table, rated_rows, unrated_rows, rated_count, unrated_count,
+                          max_tracks, playlist_type):
+    """Select rated and unrated rows, topping up with rated ones if short."""
+    selected_rated = _select_rows(ps, table, rated_rows, rated_count, playlist_type)
+    selected_unrated = _select_rows(ps, table, unrated_rows, unrated_count, playlist_type)
+
+    # Fill remaining slots if needed
+    if len(selected_unrated) < unrated_count:
+        additional_count = min(unrated_count - len(selected_unrated),
+                               max_tracks - len(selected_rated) - len(selected_unrated))
+        additional_rated = _select_rows(
+            ps, table, rated_rows, additional_count, playlist_type,
+            exclude=np.isin(rated_rows, selected_rated),
+        )
+        selected_rated = np.concatenate([selected_rated, additional_rated])
+
+    return np.concatenate([selected_rated, selected_unrated])
+
+
 def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_genres, similar_tracks, playlist_type):
     """
     Unified function to generate different types of smart playlists.
@@ -783,161 +1232,48 @@ def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_g
     # Special handling for certain playlist types
     special_handling = playlist_type in ["70s80s_flashback", "highly_rated", "most_played"]
 
-    if special_handling:
-        # For special playlist types that work with beets items instead of Plex tracks
-        all_beets_items = []
-        for item in lib.items():
-            if hasattr(item, "plex_ratingkey") and item.plex_ratingkey:
-                all_beets_items.append(item)
-
-        ps._log.debug("Found {} tracks with Plex sync data", len(all_beets_items))
-
-        # Apply filters to beets items
-        filtered_items = []
-        for item in all_beets_items:
-            include_item = True
-
-            # Apply year filters if they exist in config
-            if filters.get('include', {}).get('years'):
-                years_config = filters['include']['years']
-                item_year = getattr(item, 'year', None)
-                if 'after' in years_config and item_year and item_year <= years_config['after']:
-                    include_item = False
-                if 'before' in years_config and item_year and item_year >= years_config['before']:
-                    include_item = False
-                if 'between' in years_config and item_year:
-                    start_year, end_year = years_config['between']
-                    if not (start_year <= item_year <= end_year):
-                        include_item = False
-
-            # Apply genre filters if they exist
-            if include_item and filters.get('include', {}).get('genres'):
-                item_genres = set()
-                if item.genre:
-                    if isinstance(item.genre, str):
-                        item_genres = set(g.lower().strip() for g in item.genre.split(','))
-                    else:
-                        item_genres = set(str(g).lower().strip() for g in item.genre)
-                include_genres = set(g.lower().strip() for g in filters['include']['genres'])
-                if not (item_genres & include_genres):
-                    include_item = False
-
-            # Apply exclude filters
-            if include_item and filters.get('exclude', {}).get('genres'):
-                item_genres = set()
-                if item.genre:
-                    if isinstance(item.genre, str):
-                        item_genres = set(g.lower().strip() for g in item.genre.split(','))
-                    else:
-                        item_genres = set(str(g).lower().strip() for g in item.genre)
-                exclude_genres = set(g.lower().strip() for g in filters['exclude']['genres'])
-                if item_genres & exclude_genres:
-                    include_item = False
-
-            # Apply exclude years
-            if include_item and filters.get('exclude', {}).get('years'):
-                years_config = filters['exclude']['years']
-                item_year = getattr(item, 'year', None)
-                if 'before' in years_config and item_year and item_year < years_config['before']:
-                    include_item = False
-                if 'after' in years_config and item_year and item_year > years_config['after']:
-                    include_item = False
-
-            # Apply min rating filter
-            if include_item and 'min_rating' in filters:
-                rating = getattr(item, 'rating', 0) or getattr(item, 'plex_userrating', 0) or 0
-                # Ensure both values are numeric for comparison
-                try:
-                    rating = float(rating) if rating is not None else 0
-                except (ValueError, TypeError):
-                    rating = 0
-
-                if rating > 0: # Only apply min_rating to rated tracks
-                    min_rating = filters['min_rating']
-                    if rating < min_rating:
-                        include_item = False
-
-            # Special handling for 70s80s_flashback - only include tracks from 1970-1989
-            if playlist_type == "70s80s_flashback":
-                item_year = getattr(item, 'year', None)
-                if not (item_year and 1970 <= item_year <= 1990):
-                    include_item = False
+    # Filter and score with masks over the run's shared feature table
+    table = _get_feature_table(ps, plex_lookup)
 
-            if include_item:
-                filtered_items.append(item)
-
-        # For highly_rated playlist, further filter for ratings >= 7
-        if playlist_type == "highly_rated":
-            highly_rated_items = []
-            for item in filtered_items:
-                rating = getattr(item, 'plex_userrating', 0) or 0
-                # Ensure rating is numeric for comparison
-                try:
-                    rating = float(rating) if rating is not None else 0
-                except (ValueError, TypeError):
-                    rating = 0
-                if rating >= 7.0:  # High rating threshold
-                    highly_rated_items.append(item)
-            filtered_items = highly_rated_items
-            ps._log.debug("Filtered to {} highly rated tracks (rating >= 7.0)", len(filtered_items))
+    if special_handling:
+        # Special playlist types work with every beets item synced to Plex;
+        # highly_rated additionally requires a rating >= 7
+        rows = _special_rows(ps, lib, table, filters, playlist_type)
+        ps._log.debug("Found {} tracks with Plex sync data matching filters", len(rows))
 
         # For most_played playlist, sort by play count
         if playlist_type == "most_played":
-            def get_play_count(item):
-                return getattr(item, 'plex_viewcount', 0) or 0
-
-            sorted_items = sorted(filtered_items, key=get_play_count, reverse=True)
-            filtered_items = sorted_items
-            ps._log.debug("Sorted {} tracks by play count for Most Played playlist", len(filtered_items))
+            rows = rows[np.argsort(-table.play_count[rows], kind="stable")]
+            ps._log.debug("Sorted {} tracks by play count for Most Played playlist", len(rows))
 
         # Separate rated and unrated tracks
-        rated_items = []
-        unrated_items = []
-        for item in filtered_items:
-            rating = getattr(item, 'plex_userrating', 0) or 0
-            if rating > 0:
-                rated_items.append(item)
-            else:
-                unrated_items.append(item)
-
-        ps._log.debug("Split into {} rated and {} unrated tracks", len(rated_items), len(unrated_items))
+        rated_rows = rows[table.rating[rows] > 0]
+        unrated_rows = rows[table.rating[rows] <= 0]
+        ps._log.debug("Split into {} rated and {} unrated tracks", len(rated_rows), len(unrated_rows))
 
         # Select tracks using weighted scoring
         if playlist_type == "most_played":
             # For most played, use the sorted list directly but apply weighted selection for variety
-            selected_items = select_tracks_weighted(ps, filtered_items, max_tracks, playlist_type=playlist_type)
+            selected_rows = _select_rows(ps, table, rows, max_tracks, playlist_type)
         else:
             rated_tracks_count = int(max_tracks * (1 - discovery_ratio / 100))
             unrated_tracks_count = int(max_tracks * (discovery_ratio / 100))
-
-            selected_rated = select_tracks_weighted(ps, rated_items, rated_tracks_count, playlist_type=playlist_type)
-            selected_unrated = select_tracks_weighted(ps, unrated_items, unrated_tracks_count, playlist_type=playlist_type)
-
-            # Fill remaining slots if needed
-            if len(selected_unrated) < unrated_tracks_count:
-                additional_count = min(unrated_tracks_count - len(selected_unrated),
-                                      max_tracks - len(selected_rated) - len(selected_unrated))
-                remaining_rated = [t for t in rated_items if t not in selected_rated]
-                additional_rated = select_tracks_weighted(ps, remaining_rated, additional_count, playlist_type=playlist_type)
-                selected_rated.extend(additional_rated)
-
-            selected_items = selected_rated + selected_unrated
+            selected_rows = _select_rated_unrated(
+                ps, table, rated_rows, unrated_rows,
+                rated_tracks_count, unrated_tracks_count, max_tracks, playlist_type,
+            )
     else:
         # Regular handling for playlists that use Plex tracks directly
         if playlist_type == "daily_discovery":
             # Daily Discovery uses both sonic analysis and library tracks
-            matched_sonic_tracks = []
-            for plex_track in similar_tracks:
-                try:
-                    beets_item = plex_lookup.get(plex_track.ratingKey)
-                    if beets_item:
-                        matched_sonic_tracks.append(plex_track)
-                except Exception as e:
-                    ps._log.debug("Error processing sonic track {}: {}", plex_track.title, e)
-                    continue
+            sonic_rows = table.rows_for_keys(
+                getattr(plex_track, "ratingKey", None) for plex_track in similar_tracks
+            )
 
             ps._log.debug("Collecting additional tracks from library for discovery...")
-            all_library_tracks = _get_library_tracks(ps, preferred_genres, filters, exclusion_days)
+            all_library_tracks = _get_library_tracks(
+                ps, preferred_genres, filters, exclusion_days, table
+            )
 
             # Filter library tracks
             if filters:
@@ -948,33 +1284,21 @@ def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_g
                 if not adv:
                     all_library_tracks = apply_playlist_filters(ps, all_library_tracks, filters)
 
-            # Convert library tracks to beets items
-            library_final_tracks = []
-            for track in all_library_tracks:
-                try:
-                    beets_item = plex_lookup.get(track.ratingKey)
-                    if beets_item:
-                        library_final_tracks.append(beets_item)
-                except Exception as e:
-                    ps._log.debug("Error converting library track {}: {}", track.title, e)
-
-            # Combine both sources of potential discovery tracks
-            all_potential_tracks = matched_sonic_tracks + library_final_tracks
+            library_rows = table.rows_for_keys(
+                getattr(track, "ratingKey", None) for track in all_library_tracks
+            )
             ps._log.debug("Found {} sonic analysis tracks and {} library tracks for discovery",
-                          len(matched_sonic_tracks), len(library_final_tracks))
-
-            # Final track selection after removing duplicates
-            unique_tracks = []
-            seen_keys = set()
-            for track in all_potential_tracks:
-                key = getattr(track, 'ratingKey', None)
-                if key and key not in seen_keys:
-                    seen_keys.add(key)
-                    unique_tracks.append(track if hasattr(track, 'plex_userrating') else
-                                        plex_lookup.get(key) if key and key in plex_lookup else track)
+                          len(sonic_rows), len(library_rows))
+
+            # Combine both sources, dropping duplicates but keeping order
+            combined = np.concatenate([sonic_rows, library_rows])
+            _, first_seen = np.unique(combined, return_index=True)
+            unique_rows = combined[np.sort(first_seen)]
         else:
             # For other playlist types, use standard library tracks
-            all_library_tracks = _get_library_tracks(ps, preferred_genres, filters, exclusion_days)
+            all_library_tracks = _get_library_tracks(
+                ps, preferred_genres, filters, exclusion_days, table
+            )
 
             # Skip redundant client-side filtering when server-side filters fully covered them
             if filters:
@@ -985,71 +1309,48 @@ def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_g
                 if not adv:
                     all_library_tracks = apply_playlist_filters(ps, all_library_tracks, filters)
 
-            unique_tracks = []
-            for track in all_library_tracks:
-                try:
-                    beets_item = plex_lookup.get(track.ratingKey)
-                    if beets_item:
-                        unique_tracks.append(beets_item)
-                except Exception as e:
-                    ps._log.debug("Error converting track {}: {}", track.title, e)
+            unique_rows = table.rows_for_keys(
+                getattr(track, "ratingKey", None) for track in all_library_tracks
+            )
 
             # Apply year-based filtering for certain playlist types
             if playlist_type == "recent_hits":
                 min_year, _ = _apply_recency_guard(ps, playlist_config, filters, playlist_name, default_max_age_years=3)
-                unique_tracks = _filter_tracks_by_min_year(ps, unique_tracks, min_year, playlist_name)
+                unique_rows = _filter_rows_by_min_year(ps, table, unique_rows, min_year, playlist_name)
             elif playlist_type == "fresh_favorites":
                 min_year, _ = _apply_recency_guard(ps, playlist_config, filters, playlist_name, default_max_age_years=7)
-                unique_tracks = _filter_tracks_by_min_year(ps, unique_tracks, min_year, playlist_name)
+                unique_rows = _filter_rows_by_min_year(ps, table, unique_rows, min_year, playlist_name)
                 # Apply min rating filter for fresh favorites - keep tracks with rating >= min_rating AND unrated tracks
-                def _safe_float_rating(track):
-                    rating = getattr(track, 'plex_userrating', 0) or 0
-                    try:
-                        return float(rating) if rating is not None else 0
-                    except (ValueError, TypeError):
-                        return 0
-
                 min_rating = get_config_value(playlist_config, defaults_cfg, "min_rating", 6)
-                unique_tracks = [t for t in unique_tracks if
-                                _safe_float_rating(t) == 0 or  # Keep unrated tracks
-                                _safe_float_rating(t) >= min_rating]  # Keep rated tracks that meet min rating
+                ratings = table.rating[unique_rows]
+                unique_rows = unique_rows[(ratings == 0) | (ratings >= min_rating)]
 
         # Separate rated and unrated tracks
-        rated_tracks = []
-        unrated_tracks = []
-        for track in unique_tracks:
-            if track:  # Make sure track exists
-                rating = float(getattr(track, 'plex_userrating', 0))
-                if rating > 0:
-                    rated_tracks.append(track)
-                else:
-                    unrated_tracks.append(track)
-
-        ps._log.debug("Split into {} rated and {} unrated tracks", len(rated_tracks), len(unrated_tracks))
+        rated_rows = unique_rows[table.rating[unique_rows] > 0]
+        unrated_rows = unique_rows[table.rating[unique_rows] <= 0]
+        ps._log.debug("Split into {} rated and {} unrated tracks", len(rated_rows), len(unrated_rows))
 
         # Calculate track proportions based on discovery_ratio
         unrated_tracks_count, rated_tracks_count = calculate_playlist_proportions(ps, max_tracks, discovery_ratio)
 
         # Select tracks using weighted scoring
-        selected_rated = select_tracks_weighted(ps, rated_tracks, rated_tracks_count, playlist_type=playlist_type)
-        selected_unrated = select_tracks_weighted(ps, unrated_tracks, unrated_tracks_count, playlist_type=playlist_type)
-
-        # Fill remaining slots if needed
-        if len(selected_unrated) < unrated_tracks_count:
-            additional_count = min(unrated_tracks_count - len(selected_unrated),
-                                  max_tracks - len(selected_rated) - len(selected_unrated))
-            remaining_rated = [t for t in rated_tracks if t not in selected_rated]
-            additional_rated = select_tracks_weighted(ps, remaining_rated, additional_count, playlist_type=playlist_type)
-            selected_rated.extend(additional_rated)
+        selected_rows = _select_rated_unrated(
+            ps, table, rated_rows, unrated_rows,
+            rated_tracks_count, unrated_tracks_count, max_tracks, playlist_type,
+        )
 
-        selected_items = selected_rated + selected_unrated
+    selected_items = table.items_at(selected_rows)
 
     # Ensure we don't exceed max_tracks
     if len(selected_items) > max_tracks:
         selected_items = selected_items[:max_tracks]
 
-    import random
-    random.shuffle(selected_items)
+    selected_items = [selected_items[i] for i in _rng(ps).permutation(len(selected_items))]
+
+    plan = _plan(ps)
+    if plan is not None:
+        plan["candidate_pool"] = {"rated": len(rated_rows), "unrated": len(unrated_rows)}
+        plan["tracks"] = _rating_keys(selected_items)
 
     if not selected_items:
         ps._log.warning("No tracks matched criteria for {} playlist", playlist_name)
@@ -1057,23 +1358,30 @@ def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_g
 
     # Convert beets items to Plex tracks for special playlists
     if special_handling:
+        linked = [item for item in selected_items if getattr(item, "plex_ratingkey", None)]
+        try:
+            fetched = plex_ops.fetch_items_by_keys(ps.plex, [item.plex_ratingkey for item in linked])
+        except Exception as e:
+            ps._log.debug("Batch fetch of Plex tracks failed: {}", e)
+            fetched = []
+        by_key = {int(track.ratingKey): track for track in fetched}
+
         plex_tracks = []
-        for item in selected_items:
-            if hasattr(item, "plex_ratingkey") and item.plex_ratingkey:
+        for item in linked:
+            plex_track = by_key.get(int(item.plex_ratingkey))
+            if plex_track is not None:
+                plex_tracks.append(plex_track)
+            else:
+                ps._log.debug("Could not fetch Plex track for item: {}", item)
+                # Fallback: try to find by metadata
                 try:
-                    plex_track = ps.plex.fetchItem(item.plex_ratingkey)
-                    plex_tracks.append(plex_track)
-                except Exception as e:
-                    ps._log.debug("Could not fetch Plex track for item: {} - Error: {}", item, e)
-                    # Fallback: try to find by metadata
-                    try:
-                        tracks = ps.music.searchTracks(title=getattr(item, 'title', ''),
-                                                      artist=getattr(item, 'artist', ''),
-                                                      album=getattr(item, 'album', ''))
-                        if tracks:
-                            plex_tracks.append(tracks[0])
-                    except Exception:
-                        continue
+                    tracks = ps.music.searchTracks(title=getattr(item, 'title', ''),
+                                                  artist=getattr(item, 'artist', ''),
+                                                  album=getattr(item, 'album', ''))
+                    if tracks:
+                        plex_tracks.append(tracks[0])
+                except Exception:
+                    continue
 
         if not plex_tracks:
             ps._log.warning("Could not find any Plex tracks for {} playlist", playlist_name)
@@ -1083,13 +1391,7 @@ def generate_unified_playlist(ps, lib, playlist_config, plex_lookup, preferred_g
     else:
         selected_tracks = selected_items
 
-    try:
-        ps._plex_clear_playlist(playlist_name)
-        ps._log.info("Cleared existing {} playlist", playlist_name)
-    except Exception:
-        ps._log.debug("No existing {} playlist found", playlist_name)
-
-    ps._plex_add_playlist_item(selected_tracks, playlist_name)
+    ps._plex_sync_playlist(selected_tracks, playlist_name)
     ps._log.info("Successfully updated {} playlist with {} tracks", playlist_name, len(selected_tracks))
 
 
@@ -0,0 +1,154 @@
+"""Cached access to Plex's sonically similar tracks.
+
+Neighbor lists of a track barely change between runs, so they are kept in
+the cache DB and only refreshed when they expire or when Plex re-analyses
+the track (its ``updatedAt`` or ``musicAnalysisVersion`` changes).
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from beetsplug.core.config import get_plexsync_config
+from beetsplug.core.sonic_graph import SonicGraph
+
+
+def _timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _analysis_version(track):
+    # Never-analysed tracks have no version; reading the attribute of a
+    # partial plexapi object would then reload it from the server.
+    data = getattr(track, "_data", None)
+    if data is not None:
+        version = data.attrib.get("musicAnalysisVersion")
+    else:
+        version = getattr(track, "musicAnalysisVersion", None)
+    return None if version is None else str(version)
+
+
+def fetch_neighbors(track):
+    """Query Plex for a track's neighbors as ``[key, distance, genres, rating]``."""
+    neighbors = []
+    for match in track.sonicallySimilar():
+        distance = getattr(match, "distance", None)
+        neighbors.append(
+            [
+                match.ratingKey,
+                float(distance) if distance is not None else None,
+                [str(g.tag).lower() for g in (match.genres or []) if g],
+                getattr(match, "userRating", None),
+            ]
+        )
+    return neighbors
+
+
+def _is_fresh(entry, track, max_age):
+    if entry is None:
+        return False
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if now - entry["created_at"] > max_age:
+        return False
+    if entry["analysis_version"] != _analysis_version(track):
+        return False
+    updated_at = _timestamp(getattr(track, "updatedAt", None))
+    return updated_at is None or entry["track_updated_at"] == updated_at
+
+
+def get_sonic_neighbors(ps, seeds):
+    """Return ``{ratingKey: neighbors}`` for the ``seeds`` Plex tracks.
+
+    Fresh cache entries are used as-is. At most ``sonic_refresh_budget``
+    misses are fetched from Plex per run, most recently played seeds first;
+    remaining misses fall back to a stale entry when one exists.
+    """
+    max_age = timedelta(days=get_plexsync_config("sonic_cache_days", int, 14) or 14)
+    budget = get_plexsync_config("sonic_refresh_budget", int, 200)
+    cache = getattr(ps, "cache", None)
+
+    seeds = list({track.ratingKey: track for track in seeds}.values())
+    cached = cache.get_sonic_neighbors([t.ratingKey for t in seeds]) if cache else {}
+
+    result = {}
+    misses = []
+    for track in seeds:
+        entry = cached.get(track.ratingKey)
+        if _is_fresh(entry, track, max_age):
+            result[track.ratingKey] = entry["neighbors"]
+        else:
+            misses.append(track)
+
+    misses.sort(
+        key=lambda t: _timestamp(getattr(t, "lastViewedAt", None)) or 0, reverse=True
+    )
+    if budget is not None and budget >= 0:
+        to_refresh, deferred = misses[:budget], misses[budget:]
+    else:
+        to_refresh, deferred = misses, []
+
+    def refresh(track):
+        try:
+            return track, fetch_neighbors(track)
+        except Exception as e:  # noqa: BLE001 - a failed lookup only loses one seed
+            ps._log.debug("Error getting similar tracks for {}: {}", track.title, e)
+            return track, None
+
+    if to_refresh:
+        with ThreadPoolExecutor() as executor:
+            for track, neighbors in executor.map(refresh, to_refresh):
+                if neighbors is None:
+                    entry = cached.get(track.ratingKey)
+                    if entry is not None:
+                        result[track.ratingKey] = entry["neighbors"]
+                    continue
+                result[track.ratingKey] = neighbors
+                if cache:
+                    cache.set_sonic_neighbors(
+                        track.ratingKey,
+                        neighbors,
+                        _timestamp(getattr(track, "updatedAt", None)),
+                        _analysis_version(track),
+                    )
+
+    for track in deferred:
+        entry = cached.get(track.ratingKey)
+        if entry is not None:
+            result[track.ratingKey] = entry["neighbors"]
+
+    ps._log.debug(
+        "Sonic neighbors: {} cached, {} refreshed from Plex, {} deferred by budget",
+        len(seeds) - len(misses),
+        len(to_refresh),
+        len(deferred),
+    )
+    return result
+
+
+def load_sonic_graph(ps, neighbors_by_seed=None):
+    """Build the local sonic graph from every cached neighbor list.
+
+    ``neighbors_by_seed`` (this run's lookups) is merged in so the graph is
+    complete even when the cache DB is unavailable.
+    """
+    _t0 = time.time()
+    cache = getattr(ps, "cache", None)
+    adjacency = cache.get_all_sonic_neighbors() if cache else {}
+    adjacency.update(neighbors_by_seed or {})
+    graph = SonicGraph(adjacency)
+    ps._log.debug(
+        "Loaded sonic graph with {} tracks and {} edges in {:.2f}s",
+        len(graph),
+        graph.edge_count,
+        time.time() - _t0,
+    )
+    return graph
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from beetsplug.core.config import get_plexsync_config
 from beetsplug.plex import smartplaylists as sp_mod
+from beetsplug.providers import spotify as spotify_provider
 
 """Utilities for transferring Plex playlists to Spotify."""
 
+# Maximum number of ids accepted by the Spotify "several tracks" endpoint
+TRACKS_BATCH_SIZE = 50
+
+
 def plex_to_spotify(plugin, lib, playlist, query_args=None):
     """Transfer a Plex playlist to Spotify using the plugin context."""
     plugin.authenticate_spotify()
@@ -12,7 +21,6 @@ def plex_to_spotify(plugin, lib, playlist, query_args=None):
     plugin._log.debug("Total items in Plex playlist: {}", len(plex_playlist_items))
 
     plex_lookup = plugin._build_plex_lookup_and_vector_index(lib)
-    spotify_tracks = []
 
     query_rating_keys = None
     if query_args:
@@ -25,44 +33,39 @@ def plex_to_spotify(plugin, lib, playlist, query_args=None):
             len(query_rating_keys),
         )
 
+    candidates = []
+    for item in plex_playlist_items:
+        plugin._log.debug("Processing {}", item.ratingKey)
+        beets_item = plex_lookup.get(item.ratingKey)
+        if not beets_item:
+            plugin._log.debug(
+                "Library not synced. Item not found in Beets: {} - {}",
+                item.parentTitle,
+                item.title,
+            )
+            continue
+
+        if query_rating_keys is not None and item.ratingKey not in query_rating_keys:
+            plugin._log.debug(
+                "Item filtered out by query: {} - {} - {}",
+                beets_item.artist,
+                beets_item.album,
+                beets_item.title,
+            )
+            continue
+
+        plugin._log.debug("Beets item: {}", beets_item)
+        candidates.append(beets_item)
+
     progress = plugin.create_progress_counter(
-        len(plex_playlist_items),
+        len(candidates),
         f"Resolving Spotify matches for {playlist}",
         unit="track",
     )
     try:
-        for item in plex_playlist_items:
-            plugin._log.debug("Processing {}", item.ratingKey)
-            beets_item = plex_lookup.get(item.ratingKey)
-            if not beets_item:
-                plugin._log.debug(
-                    "Library not synced. Item not found in Beets: {} - {}",
-                    item.parentTitle,
-                    item.title,
-                )
-                if progress is not None:
-                    progress.update()
-                continue
-
-            if query_rating_keys is not None and item.ratingKey not in query_rating_keys:
-                plugin._log.debug(
-                    "Item filtered out by query: {} - {} - {}",
-                    beets_item.artist,
-                    beets_item.album,
-                    beets_item.title,
-                )
-                if progress is not None:
-                    progress.update()
-                continue
-
-            plugin._log.debug("Beets item: {}", beets_item)
-            spotify_track_id = _resolve_spotify_track(plugin, beets_item)
-            if spotify_track_id:
-                spotify_tracks.append(spotify_track_id)
-            else:
-                plugin._log.info("No playable Spotify match found for {}", beets_item)
-            if progress is not None:
-                progress.update()
+        spotify_tracks = [
+            track_id for track_id in _resolve_spotify_tracks(plugin, candidates, progress) if track_id
+        ]
     finally:
         if progress is not None:
             try:
@@ -97,37 +100,137 @@ def plex_to_spotify(plugin, lib, playlist, query_args=None):
 
     plugin.add_tracks_to_spotify_playlist(playlist, deduplicated_tracks)
 
-def _resolve_spotify_track(plugin, beets_item):
-    spotify_track_id = None
-    try:
-        spotify_track_id = getattr(beets_item, 'spotify_track_id', None)
-        plugin._log.debug("Spotify track id in beets: {}", spotify_track_id)
+def _spotify_id(track_id):
+    """Bare Spotify track id of an id or ``spotify:track:`` URI."""
+    return str(track_id).rsplit(":", 1)[-1].rsplit("/", 1)[-1].split("?", 1)[0]
 
-        if spotify_track_id:
-            try:
-                track_info = plugin.sp.track(spotify_track_id)
-                if (
-                    not track_info
-                    or not track_info.get('is_playable', True)
-                    or track_info.get('restrictions', {}).get('reason') == 'unavailable'
-                    or not track_info.get('available_markets')
-                ):
-                    plugin._log.debug(
-                        "Track {} is not playable or not available, searching for alternatives",
-                        spotify_track_id,
-                    )
-                    spotify_track_id = None
-            except Exception as exc:  # noqa: BLE001 - log but continue
+
+def _is_available(track_info):
+    return bool(
+        track_info
+        and track_info.get('is_playable', True)
+        and track_info.get('restrictions', {}).get('reason') != 'unavailable'
+        and track_info.get('available_markets')
+    )
+
+
+def _available_track_ids(plugin, track_ids):
+    """Return the bare ids among ``track_ids`` that are playable on Spotify.
+
+    Availability is checked with one ``tracks`` request per 50 ids.
+    """
+    ids = list(dict.fromkeys(_spotify_id(track_id) for track_id in track_ids))
+    available = set()
+    for start in range(0, len(ids), TRACKS_BATCH_SIZE):
+        chunk = ids[start:start + TRACKS_BATCH_SIZE]
+        try:
+            response = spotify_provider.spotify_call(plugin.sp.tracks, chunk)
+        except Exception as exc:  # noqa: BLE001 - treat the batch as unknown
+            plugin._log.debug("Error checking availability of {} tracks: {}", len(chunk), exc)
+            continue
+        for track_info in (response or {}).get('tracks') or []:
+            if _is_available(track_info):
+                available.add(track_info['id'])
+    return available
+
+
+def _fingerprint(beets_item):
+    """Hash of the metadata a Spotify search for ``beets_item`` depends on."""
+    fields = [str(getattr(beets_item, field, '') or '').lower() for field in ('title', 'artist', 'album')]
+    return hashlib.sha1("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+def _cached_resolutions(plugin, beets_items, fingerprints):
+    """Return the cached search result per item as ``(hit, spotify_id)``.
+
+    Entries stored for different metadata are ignored so that retagged
+    items are searched again.
+    """
+    misses = [(False, None)] * len(beets_items)
+    cache = getattr(plugin, 'cache', None)
+    if cache is None:
+        return misses
+    ids = [getattr(beets_item, 'id', None) for beets_item in beets_items]
+    ttl = get_plexsync_config("spotify_negative_ttl_days", float, 7)
+    cached = cache.get_spotify_resolutions([item_id for item_id in ids if item_id is not None], ttl)
+    results = []
+    for item_id, fingerprint in zip(ids, fingerprints):
+        entry = cached.get(item_id)
+        if entry is not None and entry[0] == fingerprint:
+            results.append((True, entry[1]))
+        else:
+            results.append((False, None))
+    return results
+
+
+def _resolve_spotify_tracks(plugin, beets_items, progress=None):
+    """Return a Spotify track id (or ``None``) per beets item, in order.
+
+    Stored ``spotify_track_id``s and ids found by earlier transfers are
+    checked in batches. Only items without a playable id, and not known to
+    have no match, are searched, concurrently on ``spotify_workers`` threads
+    and subject to the shared Spotify rate limit. Search results, including
+    misses, are cached per beets item.
+    """
+    stored = [getattr(beets_item, 'spotify_track_id', None) or None for beets_item in beets_items]
+    fingerprints = [_fingerprint(beets_item) for beets_item in beets_items]
+    cached = _cached_resolutions(plugin, beets_items, fingerprints)
+    available = _available_track_ids(
+        plugin,
+        [track_id for track_id in stored if track_id] + [track_id for _, track_id in cached if track_id],
+    )
+
+    results = [None] * len(beets_items)
+    misses = []
+    reused = 0
+    for index, track_id in enumerate(stored):
+        hit, cached_id = cached[index]
+        if track_id and _spotify_id(track_id) in available:
+            results[index] = track_id
+        elif cached_id and _spotify_id(cached_id) in available:
+            results[index] = cached_id
+            reused += 1
+        elif hit and cached_id is None:
+            plugin._log.debug("No Spotify match found for {} in an earlier transfer", beets_items[index])
+            reused += 1
+        else:
+            if track_id:
                 plugin._log.debug(
-                    "Error checking track availability {}: {}",
-                    spotify_track_id,
-                    exc,
+                    "Track {} is not playable or not available, searching for alternatives",
+                    track_id,
                 )
-                spotify_track_id = None
-    except Exception:
-        spotify_track_id = None
-        plugin._log.debug("Spotify track_id not found in beets")
-
-    if not spotify_track_id:
-        spotify_track_id = plugin._search_spotify_track(beets_item)
-    return spotify_track_id
+            misses.append(index)
+            continue
+        if progress is not None:
+            progress.update()
+
+    def search(index):
+        try:
+            return index, plugin._search_spotify_track(beets_items[index]), None
+        except Exception as exc:  # noqa: BLE001 - retried on the next transfer
+            return index, None, exc
+
+    resolved = []
+    if misses:
+        workers = min(spotify_provider.spotify_workers(), len(misses))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for index, track_id, error in executor.map(search, misses):
+                results[index] = track_id
+                if error is not None:
+                    # Not cached: a failed search is not a definitive miss
+                    plugin._log.warning("Spotify search failed for {}: {}", beets_items[index], error)
+                else:
+                    item_id = getattr(beets_items[index], 'id', None)
+                    if item_id is not None:
+                        resolved.append((item_id, fingerprints[index], track_id or None))
+                    if not track_id:
+                        plugin._log.info("No playable Spotify match found for {}", beets_items[index])
+                if progress is not None:
+                    progress.update()
+    if resolved and getattr(plugin, 'cache', None) is not None:
+        plugin.cache.set_spotify_resolutions(resolved)
+    plugin._log.debug(
+        "Resolved {} tracks: {} from earlier transfers, {} searched",
+        len(beets_items), reused, len(misses),
+    )
+    return results
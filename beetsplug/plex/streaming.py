@@ -0,0 +1,121 @@
+"""Paged, low-memory listing of a Plex music section.
+
+``section.search(libtype="track")`` builds a full plexapi ``Track`` for every
+track in the library before anything can be filtered or sampled. Smart
+playlists only need a few attributes, so this module pages through the raw
+section XML and keeps a slotted :class:`TrackRecord` per track. When a
+candidate pool cap is configured, tracks are reservoir-sampled while the pages
+stream in, so memory is bounded by the cap rather than the library size.
+"""
+
+from __future__ import annotations
+
+from collections import namedtuple
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from beetsplug.core.config import get_plexsync_config
+
+# Plex libtype number of tracks in /library/sections/<id>/all
+_TRACK_TYPE = 10
+
+GenreTag = namedtuple("GenreTag", ["tag"])
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _datetime_or_none(value) -> Optional[datetime]:
+    stamp = _int_or_none(value)
+    return datetime.fromtimestamp(stamp) if stamp is not None else None
+
+
+def _float_or_none(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class TrackRecord:
+    """Attributes of a Plex track used by smart playlist selection.
+
+    Mirrors the plexapi ``Track`` attribute names so it can be passed to the
+    same filters, e.g. ``genres`` holds objects with a ``tag``.
+    """
+
+    __slots__ = ("ratingKey", "title", "year", "userRating", "viewCount",
+                 "lastViewedAt", "genres")
+
+    def __init__(self, ratingKey, title=None, year=None, userRating=None,
+                 viewCount=None, lastViewedAt=None, genres=()):
+        self.ratingKey = ratingKey
+        self.title = title
+        self.year = year
+        self.userRating = userRating
+        self.viewCount = viewCount
+        self.lastViewedAt = lastViewedAt
+        self.genres = list(genres)
+
+    @classmethod
+    def from_element(cls, elem) -> "TrackRecord":
+        return cls(
+            ratingKey=_int_or_none(elem.attrib.get("ratingKey")),
+            title=elem.attrib.get("title"),
+            year=_int_or_none(elem.attrib.get("year") or elem.attrib.get("parentYear")),
+            userRating=_float_or_none(elem.attrib.get("userRating")),
+            viewCount=_int_or_none(elem.attrib.get("viewCount")) or 0,
+            lastViewedAt=_datetime_or_none(elem.attrib.get("lastViewedAt")),
+            genres=[GenreTag(g.attrib.get("tag")) for g in elem.findall("Genre")],
+        )
+
+    def __repr__(self) -> str:
+        return f"TrackRecord(ratingKey={self.ratingKey}, title={self.title!r})"
+
+
+def iter_section_tracks(server, section, page_size=None) -> Iterator[TrackRecord]:
+    """Yield a :class:`TrackRecord` per track of ``section``, one page at a time."""
+    if page_size is None:
+        page_size = get_plexsync_config("stream_page_size", int, 1000) or 1000
+    key = f"/library/sections/{section.key}/all?type={_TRACK_TYPE}"
+    start = 0
+    while True:
+        container = server.query(
+            key,
+            headers={
+                "X-Plex-Container-Start": str(start),
+                "X-Plex-Container-Size": str(page_size),
+            },
+        )
+        if container is None:
+            return
+        page = container.findall("Track")
+        for elem in page:
+            yield TrackRecord.from_element(elem)
+        start += len(page)
+        total = _int_or_none(container.attrib.get("totalSize"))
+        if len(page) < page_size or (total is not None and start >= total):
+            return
+
+
+def reservoir_sample(records: Iterable, k: int, rng=None) -> List:
+    """Uniformly sample ``k`` items from ``records`` in a single pass.
+
+    ``rng`` is a NumPy ``Generator``; a fresh unseeded one is used if omitted.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    reservoir: List = []
+    for n, record in enumerate(records):
+        if n < k:
+            reservoir.append(record)
+        else:
+            slot = rng.integers(n + 1)
+            if slot < k:
+                reservoir[slot] = record
+    return reservoir
@@ -28,6 +28,7 @@ import spotipy
 import numpy as np
 import confuse
 import enlighten
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
@@ -57,6 +58,8 @@ from beetsplug.core.cache import Cache
 from beetsplug.ai.llm import search_track_info, Song, SongRecommendations
 from beetsplug.core.matching import clean_string, plex_track_distance, get_fuzzy_score
 from beetsplug.core.vector_index import BeetsVectorIndex
+from beetsplug.core import projection
+from beetsplug.core.features import FeatureTable
 from beetsplug.providers.apple import import_apple_playlist
 from beetsplug.providers.jiosaavn import import_jiosaavn_playlist
 from beetsplug.utils.helpers import (
@@ -75,6 +78,8 @@ from beetsplug.plex import manual_search
 from beetsplug.plex import spotify_transfer
 from beetsplug.plex import collage as collage_mod
 from beetsplug.plex import smartplaylists as sp_mod
+from beetsplug.plex import identity as plex_identity
+from beetsplug.plex import library_sync
 
 _QUERY_TITLE_BY_FROM_RE = re.compile(
     r'^(?P<title>.+?)\s+by\s+(?P<artist>.+?)\s+from\s+(?P<album>.+)$',
@@ -161,6 +166,9 @@ class PlexSync(BeetsPlugin):
         self._vector_index: Optional[BeetsVectorIndex] = None
         self._vector_index_info: Dict[str, Optional[float]] = {}
         self._server_query_cache: Dict[str, list] = {}
+        self._server_query_lock = threading.Lock()
+        # Columnar features of plex_lookup shared by smart playlists in a run
+        self._feature_table = None
 
         # Adding defaults.
         config["plex"].add(
@@ -183,6 +191,10 @@ class PlexSync(BeetsPlugin):
                 "history_days": 15,  # Days to look back for base tracks
                 "discovery_ratio": 30,  # Percentage of discovery tracks (0-100)
                 "use_llm_search": False,  # Enable/disable LLM search cleaning
+                "identity_match": True,  # Join on MBID/file path before search
+                "sync_batch_size": 100,  # Items stored per DB transaction
+                "sync_write_workers": 2,  # Threads writing file tags (0 = inline)
+                "playlist_concurrency": 1,  # Smart playlists generated in parallel
             }
         )
         self.plexsync_token = config["plexsync"]["tokenfile"].get(
@@ -644,7 +656,7 @@ class PlexSync(BeetsPlugin):
 
         def func_sync(lib, opts, args):
             items = lib.items(args)
-            self._fetch_plex_info(items, ui.should_write(), opts.force_refetch)
+            self._fetch_plex_info(lib, items, ui.should_write(), opts.force_refetch)
 
         sync_cmd.func = func_sync
 
@@ -685,9 +697,19 @@ class PlexSync(BeetsPlugin):
         syncrecent_cmd.parser.add_option(
             "--days", default=7, help="Number of days to be synced"
         )
+        syncrecent_cmd.parser.add_option(
+            "-i",
+            "--incremental",
+            action="store_true",
+            default=False,
+            help="only sync tracks changed since the last incremental sync",
+        )
 
         def func_sync_recent(lib, opts, args):
-            self._update_recently_played(lib, opts.days)
+            if opts.incremental:
+                self._sync_incremental(lib, opts.days)
+            else:
+                self._update_recently_played(lib, opts.days)
 
         syncrecent_cmd.func = func_sync_recent
 
@@ -870,6 +892,25 @@ class PlexSync(BeetsPlugin):
             default=None,
             help="comma-separated list of playlist IDs to update (e.g. daily_discovery,forgotten_gems)",
         )
+        plex_smartplaylists_cmd.parser.add_option(
+            "--seed",
+            dest="seed",
+            type="int",
+            default=None,
+            help="seed all random choices so a run can be replayed exactly",
+        )
+        plex_smartplaylists_cmd.parser.add_option(
+            "--plan",
+            dest="plan",
+            default=None,
+            help="write a JSON plan of candidate pools, scores and chosen tracks to this file",
+        )
+        plex_smartplaylists_cmd.parser.add_option(
+            "--as-of",
+            dest="as_of",
+            default=None,
+            help="score tracks as if run at this ISO date/time (e.g. 2024-05-01T08:00)",
+        )
 
         def func_plex_smartplaylists(lib, opts, args):
             if opts.import_failed:
@@ -894,8 +935,17 @@ class PlexSync(BeetsPlugin):
                 playlists_config = [p for p in playlists_config if p.get("id") in only_ids]
                 self._log.info("Filtered playlists to process: {}", only_ids)
 
+            base_time = None
+            if opts.as_of:
+                try:
+                    base_time = datetime.fromisoformat(opts.as_of)
+                except ValueError:
+                    raise ui.UserError(f"Invalid --as-of value: {opts.as_of}")
+
             # Process all playlists at once
-            self._plex_smartplaylists(lib, playlists_config)
+            self._plex_smartplaylists(
+                lib, playlists_config, seed=opts.seed, plan_path=opts.plan, base_time=base_time
+            )
 
         plex_smartplaylists_cmd.func = func_plex_smartplaylists
 
@@ -947,9 +997,26 @@ class PlexSync(BeetsPlugin):
         except exceptions.PlexApiException:
             self._log.warning("{} Update failed", self.config["plex"]["library_name"])
 
-    def _fetch_plex_info(self, items, write, force):
+    def _fetch_plex_info(self, lib, items, write, force):
         """Obtain track information from Plex."""
+        if not force:
+            total = len(items)
+            items = [item for item in items if "plex_userrating" not in item]
+            if total > len(items):
+                self._log.debug(
+                    "Skipping {} tracks that already have Plex information", total - len(items)
+                )
         items_len = len(items)
+        if not items_len:
+            self._log.info("No tracks need Plex information")
+            return
+        identity_index = None
+        if plex_identity.identity_match_enabled():
+            try:
+                identity_index = plex_identity.build_identity_index(self.music, self._log)
+            except Exception as exc:  # noqa: BLE001 - fall back to fuzzy search
+                self._log.warning("Identity matching failed, using search: {}", exc)
+
         progress = self.create_progress_counter(
             items_len,
             "Syncing Plex library",
@@ -957,11 +1024,15 @@ class PlexSync(BeetsPlugin):
             threadsafe=True,
         )
         try:
-            with ThreadPoolExecutor() as executor:
-                for index, item in enumerate(items, start=1):
-                    executor.submit(
-                        self._process_item, index, item, write, force, items_len, progress
-                    )
+            counts = library_sync.sync_items(
+                self, lib, items, write, force, identity_index, progress
+            )
+            self._log.info(
+                "Updated {} tracks ({} matched by MusicBrainz ID or path), {} not found",
+                counts["updated"],
+                counts["identity"],
+                counts["missing"],
+            )
         finally:
             if progress is not None:
                 try:
@@ -969,34 +1040,6 @@ class PlexSync(BeetsPlugin):
                 except Exception as exc:  # noqa: BLE001 - closing progress is best-effort
                     self._log.debug("Failed to close progress counter: {}", exc)
 
-    def _process_item(self, index, item, write, force, items_len, progress=None):
-        try:
-            self._log.info("Processing {}/{} tracks - {} ", index, items_len, item)
-            if not force and "plex_userrating" in item:
-                self._log.debug("Plex rating already present for: {}", item)
-                return
-            plex_track = self.search_plex_track(item)
-            if plex_track is None:
-                self._log.info("No track found for: {}", item)
-                return
-            item.plex_guid = plex_track.guid
-            item.plex_ratingkey = plex_track.ratingKey
-            item.plex_userrating = plex_track.userRating
-            item.plex_skipcount = plex_track.skipCount
-            item.plex_viewcount = plex_track.viewCount
-            item.plex_lastviewedat = plex_track.lastViewedAt
-            item.plex_lastratedat = plex_track.lastRatedAt
-            item.plex_updated = time.time()
-            item.store()
-            if write:
-                item.try_write()
-        finally:
-            if progress is not None:
-                try:
-                    progress.update()
-                except Exception as exc:  # noqa: BLE001 - keep sync resilient
-                    self._log.debug("Progress counter update failed: {}", exc)
-
     def search_plex_track(self, item):
         """Fetch the Plex track key."""
         tracks = self.music.searchTracks(
@@ -1020,6 +1063,10 @@ class PlexSync(BeetsPlugin):
         """Add items to Plex playlist."""
         plex_ops.plex_add_playlist_item(self.plex, items, playlist, self._log)
 
+    def _plex_sync_playlist(self, items, playlist):
+        """Replace the contents of a Plex playlist with items."""
+        plex_ops.sync_plex_playlist(self.plex, playlist, items, self._log)
+
     def _plex_playlist_to_collection(self, playlist):
         """Convert a Plex playlist to a Plex collection."""
         plex_ops.plex_playlist_to_collection(self.music, playlist, self._log)
@@ -1033,10 +1080,60 @@ class PlexSync(BeetsPlugin):
         tracks = self.music.search(
             filters={"track.lastViewedAt>>": f"{days}d"}, libtype="track"
         )
+        self._apply_plex_tracks(lib, tracks)
+
+    def _sync_incremental(self, lib, days=7):
+        """Update tracks changed in Plex since the stored sync watermark.
+
+        The first run has no watermark and falls back to the recently played
+        window of ``days``.
+        """
+        section_id = self.music.key
+        started = time.time()
+        watermark = self.cache.get_sync_watermark(section_id)
+        complete = True
+        if watermark is None:
+            self._log.info("No sync watermark yet, syncing the last {} days", days)
+            tracks = self.music.search(
+                filters={"track.lastViewedAt>>": f"{days}d"}, libtype="track"
+            )
+        else:
+            self._log.info(
+                "Syncing tracks changed since {}",
+                datetime.fromtimestamp(watermark).strftime("%Y-%m-%d %H:%M:%S"),
+            )
+            tracks, complete = library_sync.fetch_changed_tracks(
+                self.music, watermark, self._log
+            )
+
+        self._apply_plex_tracks(lib, tracks)
+
+        if not complete:
+            self._log.warning("Keeping the sync watermark; the next run rescans these changes")
+            return
+        stamps = [library_sync.track_watermark(track) for track in tracks]
+        stamps = [stamp for stamp in stamps if stamp is not None]
+        if stamps:
+            self.cache.set_sync_watermark(section_id, max(stamps))
+        elif watermark is None:
+            self.cache.set_sync_watermark(section_id, started)
+
+    def _apply_plex_tracks(self, lib, tracks):
+        """Copy play statistics of Plex ``tracks`` onto matching beets items."""
         self._log.info("Updating information for {} tracks", len(tracks))
+        if not tracks:
+            return
 
-        # Build lookup once for all tracks
-        plex_lookup = self._build_plex_lookup_and_vector_index(lib)
+        # Build lookup once for all tracks; items that were never linked to
+        # Plex can still be joined by MBID or path against the recent tracks.
+        identity_index = None
+        if plex_identity.identity_match_enabled():
+            identity_index = plex_identity.build_identity_index(
+                self.music, self._log, tracks=tracks
+            )
+        plex_lookup = self._build_plex_lookup_and_vector_index(
+            lib, identity_index=identity_index
+        )
 
         with lib.transaction():
             for track in tracks:
@@ -1047,6 +1144,8 @@ class PlexSync(BeetsPlugin):
 
                 self._log.info("Updating information for {}", beets_item)
                 try:
+                    beets_item.plex_guid = track.guid
+                    beets_item.plex_ratingkey = track.ratingKey
                     beets_item.plex_userrating = track.userRating
                     beets_item.plex_skipcount = track.skipCount
                     beets_item.plex_viewcount = track.viewCount
@@ -1064,6 +1163,7 @@ class PlexSync(BeetsPlugin):
                 except exceptions.NotFound:
                     self._log.debug("Track not found in Plex: {}", beets_item)
                     continue
+
     def _cache_result(self, cache_key, result, cleaned_metadata=None):
         """Helper method to safely cache search results."""
         if not cache_key:
@@ -1146,135 +1246,10 @@ class PlexSync(BeetsPlugin):
     def create_collage(self, list_image_urls, dimension):
         return collage_mod.create_collage(list_image_urls, dimension, self._log)
 
-    def _plex_most_played_albums(self, tracks, interval):
-        from datetime import datetime, timedelta
-
-        now = datetime.now()
-        frm_dt = now - timedelta(days=interval)
-
-        # Build a map of album ratingKey -> album object from the provided tracks
-        album_map = {}
-        for t in tracks:
-            try:
-                alb = t.album()
-                alb_key = getattr(t, "parentRatingKey", None) or getattr(alb, "ratingKey", None)
-                if alb_key and alb_key not in album_map:
-                    album_map[str(alb_key)] = alb
-            except Exception:
-                continue
-
-        # Preferred method: use server-level history filtered by date & section
-        album_data = {}
-        used_server_history = False
-        try:
-            section_id = int(getattr(self.music, "key", 0)) or None
-            history_entries = self.plex.history(
-                mindate=frm_dt,
-                librarySectionID=section_id,
-                maxresults=None,
-            )
-            used_server_history = True
-            self._log.debug("Using server history for section {} since {} ({} entries)", section_id, frm_dt.strftime('%Y-%m-%d'), len(history_entries))
-
-            skipped_entries = 0
-            for h in history_entries:
-                try:
-                    viewed_at = getattr(h, "viewedAt", None)
-
-                    album_key = getattr(h, "parentRatingKey", None)
-                    if album_key:
-                        album_key = str(album_key)
-                    else:
-                        album_key = None
-
-                    album_obj = album_map.get(album_key) if album_key else None
-
-                    if album_obj is None:
-                        # First try to fetch album directly via parentRatingKey
-                        if album_key is not None:
-                            try:
-                                album_obj = self.plex.fetchItem(int(album_key))
-                                album_map[album_key] = album_obj
-                            except Exception:
-                                album_obj = None
-
-                    if album_obj is None:
-                        # Fallback: fetch the track from history and then resolve its album
-                        try:
-                            track_key = getattr(h, "ratingKey", None)
-                            if track_key is not None:
-                                trk = self.plex.fetchItem(int(track_key))
-                                album_obj = trk.album()
-                                # Derive a stable album key from the album object
-                                derived_key = str(getattr(album_obj, "ratingKey", album_obj.title))
-                                album_key = derived_key
-                                if album_key not in album_map:
-                                    album_map[album_key] = album_obj
-                        except Exception:
-                            album_obj = None
-
-                    if album_obj is None or album_key is None:
-                        skipped_entries += 1
-                        continue
-
-                    data = album_data.setdefault(album_key, {"album": album_obj, "count": 0, "last_played": None})
-                    data["count"] += 1
-                    if viewed_at and (data["last_played"] is None or viewed_at > data["last_played"]):
-                        data["last_played"] = viewed_at
-                except Exception:
-                    skipped_entries += 1
-                    continue
-            if skipped_entries:
-                self._log.debug("Skipped {} history entries that could not resolve to an album", skipped_entries)
-        except Exception as e:
-            # Fallback: per-track history (older approach). Some Plex setups or plexapi versions
-            # may not support the server.history call with these filters.
-            self._log.debug("Falling back to per-track history due to error: {}", e)
-            for track in tracks:
-                try:
-                    history = track.history(mindate=frm_dt)
-                    count = len(history)
-
-                    track_last_played = track.lastViewedAt
-                    history_last_played = max((h.viewedAt for h in history if getattr(h, "viewedAt", None) is not None), default=None)
-                    last_played = max(filter(None, [track_last_played, history_last_played]), default=None)
-
-                    album_obj = track.album()
-                    album_key = getattr(track, "parentRatingKey", None) or getattr(album_obj, "ratingKey", None) or album_obj.title
-                    key = str(album_key)
-
-                    if key not in album_data:
-                        album_data[key] = {"album": album_obj, "count": count, "last_played": last_played}
-                    else:
-                        album_data[key]["count"] += count
-                        if last_played and (album_data[key]["last_played"] is None or last_played > album_data[key]["last_played"]):
-                            album_data[key]["last_played"] = last_played
-                except Exception as ex:
-                    self._log.debug("Error processing track history for {}: {}", getattr(track, 'title', 'unknown'), ex)
-                    continue
-
-        # Sort and build result
-        albums_list = [(data["album"], data["count"], data["last_played"]) for data in album_data.values()]
-        sorted_albums = sorted(albums_list, key=lambda x: (-x[1], -(x[2].timestamp() if x[2] else 0)))
-
-        result = []
-        for album, count, last_played in sorted_albums:
-            if count > 0:
-                try:
-                    album.count = count
-                    album.last_played_date = last_played
-                    result.append(album)
-                    self._log.debug(
-                        "{} played {} times, last played on {}",
-                        getattr(album, 'title', 'Unknown Album'),
-                        count,
-                        (last_played.strftime("%Y-%m-%d %H:%M:%S") if last_played else "Never"),
-                    )
-                except Exception:
-                    # In case album is a lightweight object missing attributes
-                    continue
-
-        return result
+    def _plex_most_played_albums(self, tracks, interval, limit=None):
+        return collage_mod.most_played_albums(
+            self.plex, self.music, tracks, interval, self._log, limit=limit
+        )
 
     def _plex_sonicsage(self, number, prompt, playlist, clear):
         """Generate song recommendations using LLM based on a given prompt."""
@@ -1308,13 +1283,11 @@ class PlexSync(BeetsPlugin):
             if found is not None:
                 matched_songs.append(found)
         self._log.debug("Songs matched in Plex library: {}", matched_songs)
-        if clear:
-            try:
-                self._plex_clear_playlist(playlist)
-            except exceptions.NotFound:
-                self._log.debug(f"Unable to clear playlist {playlist}")
         try:
-            self._plex_add_playlist_item(matched_songs, playlist)
+            if clear:
+                self._plex_sync_playlist(matched_songs, playlist)
+            else:
+                self._plex_add_playlist_item(matched_songs, playlist)
         except Exception as e:
             self._log.error("Unable to add songs to playlist. Error: {}", e)
 
@@ -1577,14 +1550,25 @@ class PlexSync(BeetsPlugin):
 
         return total_imported, total_failed
 
-    def _build_plex_lookup_and_vector_index(self, lib):
+    def _build_plex_lookup_and_vector_index(self, lib, identity_index=None, projected=False):
+        """Map Plex rating keys to beets items and refresh the vector index.
+
+        With ``projected``, the lookup holds lightweight records read by a
+        single column-projected query instead of full beets Items; use it
+        when the items are only read, not stored.
+        """
         self._log.debug("Building lookup dictionary for Plex rating keys and vector index")
         plex_lookup = {}
         vector_index = BeetsVectorIndex()
 
-        for item in lib.items():
+        items = projection.iter_projected_items(lib, self._log) if projected else lib.items()
+        for item in items:
             if hasattr(item, "plex_ratingkey"):
                 plex_lookup[item.plex_ratingkey] = item
+            elif identity_index is not None:
+                track = identity_index.match(item)
+                if track is not None:
+                    plex_lookup.setdefault(track.ratingKey, item)
 
             metadata = self._extract_vector_metadata(item)
             item_id = metadata.get("id")
@@ -1601,18 +1585,39 @@ class PlexSync(BeetsPlugin):
 
         return plex_lookup
 
-    def _plex_smartplaylists(self, lib, playlists_config):
-        """Process all playlists at once with a single lookup dictionary."""
+    def _plex_smartplaylists(self, lib, playlists_config, seed=None, plan_path=None,
+                             base_time=None):
+        """Process all playlists at once with a single lookup dictionary.
+
+        With a ``seed`` (or ``playlist_seed`` config) every playlist draws from
+        its own seeded generator and scores against one pinned ``base_time``,
+        so a run can be replayed. ``plan_path`` (or ``playlist_plan``) names a
+        JSON file recording each playlist's pool sizes, scores and choices.
+        """
+        if seed is None:
+            seed = get_plexsync_config("playlist_seed", int, None)
+        plan_path = plan_path or get_plexsync_config("playlist_plan", str, None)
+        if base_time is None and seed is not None:
+            base_time = datetime.now()
+        plan = None
+        if plan_path:
+            plan = {
+                "seed": seed,
+                "base_time": base_time.isoformat() if base_time else None,
+                "playlists": [],
+            }
+
         # Build lookup once for all playlists
         self._log.info("Building Plex lookup dictionary...")
-        plex_lookup = self._build_plex_lookup_and_vector_index(lib)
+        plex_lookup = self._build_plex_lookup_and_vector_index(lib, projected=True)
         self._log.debug("Found {} tracks in lookup dictionary", len(plex_lookup))
+        self._feature_table = FeatureTable(plex_lookup)
 
         # Get preferred attributes once if needed for smart playlists
         preferred_genres = None
         similar_tracks = None
         if any(p.get("id") in ["daily_discovery", "forgotten_gems"] for p in playlists_config):
-            preferred_genres, similar_tracks = sp_mod.get_preferred_attributes(self)
+            preferred_genres, similar_tracks = sp_mod.get_preferred_attributes(self, plex_lookup)
             self._log.debug("Using preferred genres: {}", preferred_genres)
             self._log.debug("Processing {} pre-filtered similar tracks", len(similar_tracks))
 
@@ -1621,39 +1626,57 @@ class PlexSync(BeetsPlugin):
             total=len(playlists_config),
             desc="Playlists",
             unit="list",
+            threadsafe=True,
         )
+        workers = get_plexsync_config("playlist_concurrency", int, 1) or 1
+
+        def context_for(p):
+            if workers <= 1 and seed is None and plan is None:
+                return self
+            name = p.get("name", p.get("id", "playlist"))
+            record = None
+            if plan is not None:
+                record = {"id": p.get("id"), "name": name}
+                plan["playlists"].append(record)
+            return sp_mod.PlaylistContext(
+                self, name, rng=sp_mod.playlist_rng(seed, name), plan=record,
+                base_time=base_time,
+            )
+
+        def run(p, ps=self):
+            playlist_name = p.get("name", "Unnamed playlist")
+            _t0 = time.perf_counter()
+            try:
+                self._generate_playlist(
+                    ps, lib, p, plex_lookup, preferred_genres, similar_tracks
+                )
+            except Exception as exc:  # noqa: BLE001 - keep other playlists going
+                self._log.error("Failed to generate playlist {}: {}", playlist_name, exc)
+            record = getattr(ps, "plan", None)
+            if record is not None:
+                record["seconds"] = round(time.perf_counter() - _t0, 3)
+            if progress is not None:
+                progress.update()
+
+        contexts = [(p, context_for(p)) for p in playlists_config]
         try:
-            for p in playlists_config:
-                playlist_type = p.get("type", "smart")
-                playlist_id = p.get("id")
-                playlist_name = p.get("name", "Unnamed playlist")
-
-                if (playlist_type == "imported"):
-                    playlist_import.generate_imported_playlist(self, lib, p, plex_lookup)
-                elif playlist_id in ["daily_discovery", "forgotten_gems", "recent_hits", "fresh_favorites", "70s80s_flashback", "highly_rated", "most_played"]:
-                    if playlist_id == "daily_discovery":
-                        sp_mod.generate_daily_discovery(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "forgotten_gems":
-                        sp_mod.generate_forgotten_gems(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "recent_hits":
-                        sp_mod.generate_recent_hits(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "fresh_favorites":
-                        sp_mod.generate_fresh_favorites(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "70s80s_flashback":
-                        sp_mod.generate_70s80s_flashback(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "highly_rated":
-                        sp_mod.generate_highly_rated_tracks(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                    elif playlist_id == "most_played":
-                        sp_mod.generate_most_played_tracks(self, lib, p, plex_lookup, preferred_genres, similar_tracks)
-                else:
-                    self._log.warning(
-                        "Unrecognized playlist configuration '{}' - type: '{}', id: '{}'. "
-                        "Valid types are 'imported' or 'smart'. "
-                        "Valid smart playlist IDs are 'daily_discovery', 'forgotten_gems', 'recent_hits', 'fresh_favorites', '70s80s_flashback', 'highly_rated', and 'most_played'.",
-                        playlist_name, playlist_type, playlist_id
-                    )
-                if progress is not None:
-                    progress.update()
+            if workers <= 1:
+                for p, context in contexts:
+                    run(p, context)
+            else:
+                # Imported playlists may prompt for manual matches, so they
+                # stay on this thread while smart playlists use the pool.
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for p, context in contexts:
+                        if p.get("type", "smart") != "imported":
+                            executor.submit(run, p, context)
+                    for p, context in contexts:
+                        if p.get("type", "smart") == "imported":
+                            run(p, context)
+            if plan is not None:
+                with open(plan_path, "w", encoding="utf-8") as plan_file:
+                    json.dump(plan, plan_file, indent=2, default=str)
+                self._log.info("Wrote smart playlist plan to {}", plan_path)
         finally:
             if progress is not None:
                 try:
@@ -1661,6 +1684,37 @@ class PlexSync(BeetsPlugin):
                 except Exception as exc:  # noqa: BLE001 - best effort cleanup
                     self._log.debug("Progress counter close failed: {}", exc)
 
+    def _generate_playlist(self, ps, lib, p, plex_lookup, preferred_genres, similar_tracks):
+        """Generate a single configured playlist, logging through ``ps``."""
+        playlist_type = p.get("type", "smart")
+        playlist_id = p.get("id")
+        playlist_name = p.get("name", "Unnamed playlist")
+
+        if (playlist_type == "imported"):
+            playlist_import.generate_imported_playlist(self, lib, p, plex_lookup)
+        elif playlist_id in ["daily_discovery", "forgotten_gems", "recent_hits", "fresh_favorites", "70s80s_flashback", "highly_rated", "most_played"]:
+            if playlist_id == "daily_discovery":
+                sp_mod.generate_daily_discovery(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "forgotten_gems":
+                sp_mod.generate_forgotten_gems(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "recent_hits":
+                sp_mod.generate_recent_hits(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "fresh_favorites":
+                sp_mod.generate_fresh_favorites(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "70s80s_flashback":
+                sp_mod.generate_70s80s_flashback(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "highly_rated":
+                sp_mod.generate_highly_rated_tracks(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+            elif playlist_id == "most_played":
+                sp_mod.generate_most_played_tracks(ps, lib, p, plex_lookup, preferred_genres, similar_tracks)
+        else:
+            self._log.warning(
+                "Unrecognized playlist configuration '{}' - type: '{}', id: '{}'. "
+                "Valid types are 'imported' or 'smart'. "
+                "Valid smart playlist IDs are 'daily_discovery', 'forgotten_gems', 'recent_hits', 'fresh_favorites', '70s80s_flashback', 'highly_rated', and 'most_played'.",
+                playlist_name, playlist_type, playlist_id
+            )
+
     def shutdown(self, lib):
         """Clean up when plugin is disabled."""
         if self.loop and not self.loop.is_closed():
@@ -1,8 +1,9 @@
 import json
 import logging
-import requests
 from bs4 import BeautifulSoup
 
+from beetsplug.providers import http_client
+
 _log = logging.getLogger('beets.plexsync.apple')
 
 def import_apple_playlist(url, cache=None, headers=None):
@@ -38,11 +39,23 @@ def import_apple_playlist(url, cache=None, headers=None):
         }
 
     song_list = []
+    validators = cache.get_playlist_validators(playlist_id, 'apple') if cache else None
 
     try:
-        # Send a GET request to the URL and get the HTML content
-        response = requests.get(url, headers=headers)
+        # Send a GET request to the URL and get the HTML content, revalidating
+        # the previous import so an unchanged playlist is not parsed again
+        response = http_client.get(url, headers={**headers, **http_client.conditional_headers(validators)})
         content = response.text
+        digest = http_client.content_hash(content) if response.status_code != 304 else None
+        unchanged = http_client.unchanged_data(validators, response, digest)
+        if unchanged is not None:
+            _log.info("Apple Music playlist unchanged since last import")
+            cache.set_playlist_cache(playlist_id, 'apple', unchanged)
+            cache.set_playlist_validators(
+                playlist_id, 'apple', unchanged, validators["etag"], validators["last_modified"],
+                validators["content_hash"],
+            )
+            return unchanged
 
         # Create a BeautifulSoup object with the HTML content
         soup = BeautifulSoup(content, "html.parser")
@@ -84,6 +97,8 @@ def import_apple_playlist(url, cache=None, headers=None):
 
         if song_list and cache:
             cache.set_playlist_cache(playlist_id, 'apple', song_list)
+            etag, last_modified = http_client.response_validators(response)
+            cache.set_playlist_validators(playlist_id, 'apple', song_list, etag, last_modified, digest)
             _log.info(f"Cached {len(song_list)} tracks from Apple Music playlist")
 
     except Exception as e:
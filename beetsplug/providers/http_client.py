@@ -0,0 +1,215 @@
+"""Shared HTTP session for playlist providers.
+
+Every provider request goes through one pooled ``requests.Session`` so that
+imports hitting the same host reuse TCP/TLS connections. Requests get a
+default timeout, and idempotent requests are retried with exponential
+backoff and jitter on connection errors and 429/5xx responses, waiting for
+``Retry-After`` when the server sends one. :func:`deadline` caps the time a
+thread may spend in requests, so a caller can give up on a slow import.
+"""
+
+import contextlib
+import hashlib
+import logging
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+from beetsplug.core.config import get_plexsync_config
+
+_log = logging.getLogger('beets.plexsync.http')
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+CONNECT_TIMEOUT = 5
+
+_session = None
+_session_lock = threading.Lock()
+_local = threading.local()
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """Fail requests of the current thread once ``seconds`` have passed.
+
+    Request timeouts are shortened to the time left, and requests started
+    after the deadline raise :class:`requests.exceptions.Timeout`.
+    """
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = time.monotonic() + float(seconds) if seconds else None
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def _clamp_timeout(timeout, remaining):
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+    return min(timeout, remaining)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request."""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        until = getattr(_local, "deadline", None)
+        if until is not None:
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"Deadline passed before requesting {request.url}")
+            kwargs["timeout"] = _clamp_timeout(kwargs["timeout"], remaining)
+        return super().send(request, **kwargs)
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` requests per second.
+
+    Up to ``capacity`` tokens accumulate while idle, so short bursts are not
+    delayed. :meth:`pause` empties the bucket and blocks every caller, e.g.
+    for the ``Retry-After`` of a 429 response.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                else:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        """Hold back all requests for ``seconds``."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + float(seconds))
+            self._tokens = 0.0
+            self._updated = self._blocked_until
+
+
+def build_retry(retries=3, backoff=0.5):
+    """Retry policy for idempotent requests (POST is never retried)."""
+    options = dict(
+        total=retries,
+        connect=retries,
+        read=retries,
+        status=retries,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        backoff_factor=backoff,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=backoff, **options)
+    except TypeError:
+        # urllib3 < 2 has no jitter support
+        return Retry(**options)
+
+
+def build_session(pool_size=10, retries=3, timeout=30):
+    """Return a new session with per-host pooling, retries and timeouts.
+
+    ``pool_size`` caps the open connections per host; further concurrent
+    requests to that host wait for a free connection.
+    """
+    session = requests.Session()
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=build_retry(retries),
+        timeout=(CONNECT_TIMEOUT, timeout),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session():
+    """Return the process-wide provider session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session(
+                    pool_size=get_plexsync_config("http_pool_size", int, 10) or 10,
+                    retries=get_plexsync_config("http_retries", int, 3),
+                    timeout=get_plexsync_config("http_timeout", float, 30) or 30,
+                )
+                _log.debug("Created shared HTTP session")
+    return _session
+
+
+def get(url, **kwargs):
+    """``GET`` through the shared session."""
+    return get_session().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """``POST`` through the shared session."""
+    return get_session().post(url, **kwargs)
+
+
+def conditional_headers(validators):
+    """Request headers revalidating a response stored with ``validators``."""
+    headers = {}
+    if validators:
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response):
+    """Return the ``(etag, last_modified)`` headers of ``response``."""
+    return response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+
+def content_hash(content):
+    """Hash of a response body, to detect unchanged pages without validators."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha1(content).hexdigest()
+
+
+def unchanged_data(validators, response=None, digest=None):
+    """Return the songs stored with ``validators`` if the source is unchanged.
+
+    The source is unchanged when ``response`` is a ``304 Not Modified`` or
+    when ``digest`` matches the stored content hash. Returns ``None`` when
+    the source has to be parsed again.
+    """
+    if not validators or not validators.get("data"):
+        return None
+    if response is not None and response.status_code == 304:
+        return validators["data"]
+    if digest is not None and digest == validators.get("content_hash"):
+        return validators["data"]
+    return None
@@ -1,6 +1,8 @@
 import logging
 import requests
 
+from beetsplug.providers import http_client
+
 _log = logging.getLogger('beets.plexsync.post')
 
 def import_post_playlist(source_config, cache=None):
@@ -36,10 +38,23 @@ def import_post_playlist(source_config, cache=None):
     headers = source_config.get("headers", {})
     payload = source_config.get("payload", {})
 
+    validators = cache.get_playlist_validators(playlist_id, 'post') if cache else None
+
     try:
-        response = requests.post(server_url, headers=headers, json=payload)
+        # No conditional headers: servers answer a conditional POST with
+        # 412 rather than 304, so unchanged playlists are found by body hash.
+        response = http_client.post(server_url, headers=headers, json=payload)
         response.raise_for_status()  # Raise exception for non-200 status codes
 
+        # Skip parsing when the endpoint returns the same playlist
+        digest = http_client.content_hash(response.content)
+        unchanged = http_client.unchanged_data(validators, digest=digest)
+        if unchanged is not None:
+            _log.info("POST request playlist unchanged since last import")
+            cache.set_playlist_cache(playlist_id, 'post', unchanged)
+            cache.set_playlist_validators(playlist_id, 'post', unchanged, content_hash=digest)
+            return unchanged
+
         data = response.json()
         if not isinstance(data, dict) or "song_list" not in data:
             _log.error("Invalid response format. Expected 'song_list' in JSON response")
@@ -67,6 +82,7 @@ def import_post_playlist(source_config, cache=None):
         # Cache successful results
         if song_list and cache:
             cache.set_playlist_cache(playlist_id, 'post', song_list)
+            cache.set_playlist_validators(playlist_id, 'post', song_list, content_hash=digest)
             _log.info("Cached {} tracks from POST request playlist", len(song_list))
 
         return song_list
@@ -1,3 +1,4 @@
+import json
 import logging
 import re
 import asyncio
@@ -12,6 +13,7 @@ try:
 except ImportError:
     pass
 from jiosaavn import JioSaavn
+from beetsplug.providers import http_client
 from beetsplug.utils.helpers import parse_title, clean_album_name
 
 _log = logging.getLogger('beets.plexsync.jiosaavn')
@@ -78,6 +80,17 @@ def import_jiosaavn_playlist(url, cache=None):
             _log.error("Invalid response from JioSaavn API")
             return song_list
 
+        # The JioSaavn client exposes no HTTP validators; hash the song list
+        # instead so an unchanged playlist is not parsed again
+        validators = cache.get_playlist_validators(playlist_id, 'jiosaavn') if cache else None
+        digest = http_client.content_hash(json.dumps(data["data"]["list"], sort_keys=True, default=str))
+        unchanged = http_client.unchanged_data(validators, digest=digest)
+        if unchanged is not None:
+            _log.info("JioSaavn playlist unchanged since last import")
+            cache.set_playlist_cache(playlist_id, 'jiosaavn', unchanged)
+            cache.set_playlist_validators(playlist_id, 'jiosaavn', unchanged, content_hash=digest)
+            return unchanged
+
         songs = data["data"]["list"]
 
         for song in songs:
@@ -122,6 +135,7 @@ def import_jiosaavn_playlist(url, cache=None):
         # Cache successful results
         if song_list and cache:
             cache.set_playlist_cache(playlist_id, 'jiosaavn', song_list)
+            cache.set_playlist_validators(playlist_id, 'jiosaavn', song_list, content_hash=digest)
             _log.info(f"Cached {len(song_list)} tracks from JioSaavn playlist")
 
     except Exception as e:
@@ -7,17 +7,20 @@ They do not change cache key formats or returned structures.
 import os
 import re
 import json
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from collections import Counter
 
 import dateutil.parser
-import requests
 from bs4 import BeautifulSoup
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from spotipy.exceptions import SpotifyOauthError
 
 from beets import config
+from beetsplug.core.config import get_plexsync_config
+from beetsplug.providers import http_client
 from beetsplug.utils.helpers import parse_title, clean_album_name
 
 
@@ -138,17 +141,79 @@ def get_playlist_id(url: str) -> str:
     return parts[index + 1]
 
 
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_limiter() -> http_client.TokenBucket:
+    """Return the token bucket shared by all Spotify API calls."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = http_client.TokenBucket(get_plexsync_config("spotify_rate", float, 10.0) or 10.0)
+    return _limiter
+
+
+def spotify_workers() -> int:
+    return max(1, get_plexsync_config("spotify_workers", int, 4) or 1)
+
+
+def spotify_call(func: Callable, *args, retries: int = 3, **kwargs):
+    """Call a spotipy method through the shared rate limiter.
+
+    A 429 response pauses every Spotify call for its ``Retry-After`` and the
+    call is retried up to ``retries`` times.
+    """
+    limiter = get_limiter()
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            return func(*args, **kwargs)
+        except spotipy.exceptions.SpotifyException as e:
+            if e.http_status != 429 or attempt == retries:
+                raise
+            headers = getattr(e, "headers", None) or {}
+            try:
+                retry_after = float(headers.get("Retry-After", 1))
+            except (TypeError, ValueError):
+                retry_after = 1.0
+            limiter.pause(retry_after)
+
+
+def fetch_all_pages(fetch_page: Callable[..., Dict[str, Any]], limit: int) -> List[Any]:
+    """Return the items of every page of a Spotify paging object.
+
+    ``fetch_page(offset=..., limit=...)`` returns one page. The first page
+    gives the total; the other pages are then requested concurrently by
+    offset on ``spotify_workers`` threads and reassembled in order.
+    """
+    first = spotify_call(fetch_page, offset=0, limit=limit)
+    items = list(first.get("items") or [])
+    total = first.get("total") or 0
+    page_size = first.get("limit") or limit
+    offsets = list(range(page_size, total, page_size))
+    if not offsets:
+        return items
+
+    def page(offset):
+        return spotify_call(fetch_page, offset=offset, limit=page_size).get("items") or []
+
+    with ThreadPoolExecutor(max_workers=min(spotify_workers(), len(offsets))) as executor:
+        for page_items in executor.map(page, offsets):
+            items.extend(page_items)
+    return items
+
+
 def get_playlist_tracks(plugin, playlist_id: str) -> List[Dict[str, Any]]:
     """Return list of track items for a Spotify playlist (all pages)."""
     try:
-        tracks_response = plugin.sp.playlist_items(
-            playlist_id, additional_types=["track"]
+        return fetch_all_pages(
+            lambda offset, limit: plugin.sp.playlist_items(
+                playlist_id, additional_types=["track"], offset=offset, limit=limit
+            ),
+            limit=100,
         )
-        tracks = tracks_response["items"]
-        while tracks_response["next"]:
-            tracks_response = plugin.sp.next(tracks_response)
-            tracks.extend(tracks_response["items"])
-        return tracks
     except spotipy.exceptions.SpotifyException as e:
         plugin._log.error("Failed to fetch playlist: {} - {}", playlist_id, str(e))
         return []
@@ -193,7 +258,7 @@ def import_spotify_playlist(plugin, playlist_id: str) -> List[Dict[str, Any]]:
 
     try:
         playlist_url = f"https://open.spotify.com/playlist/{playlist_id}"
-        response = requests.get(playlist_url, headers=plugin.headers)
+        response = http_client.get(playlist_url, headers=plugin.headers)
         if response.status_code != 200:
             plugin._log.error("Failed to fetch playlist page: {}", response.status_code)
             return song_list
@@ -238,7 +303,7 @@ def import_spotify_playlist(plugin, playlist_id: str) -> List[Dict[str, Any]]:
                             track_id = href.split('/track/')[-1].split('?')[0]
                             track_url = f"https://open.spotify.com/track/{track_id}"
                             try:
-                                track_page = requests.get(track_url, headers=plugin.headers)
+                                track_page = http_client.get(track_url, headers=plugin.headers)
                                 if track_page.status_code == 200:
                                     track_soup = BeautifulSoup(track_page.text, 'html.parser')
                                     title = track_soup.find('meta', {'property': 'og:title'})
@@ -272,8 +337,19 @@ def _fuzzy_score(a: str, b: str) -> float:
     return SequenceMatcher(None, a.lower(), b.lower()).ratio()
 
 
+class SpotifySearchError(Exception):
+    """A Spotify search found no match but could not run all strategies."""
+
+
 def search_spotify_track(plugin, beets_item) -> Optional[str]:
-    """Search for a track on Spotify with fallback strategies."""
+    """Search for a track on Spotify with fallback strategies.
+
+    Returns ``None`` when every strategy ran without a match. If no match
+    was found and a strategy failed (e.g. rate limiting or a network
+    error), :class:`SpotifySearchError` is raised instead, so callers do not
+    mistake the failure for a definitive miss.
+    """
+    last_error = None
     search_strategies = [
         lambda: f"track:{beets_item.title} album:{beets_item.album} artist:{beets_item.artist}",
         lambda: f"track:{beets_item.title} album:{beets_item.album}",
@@ -287,7 +363,8 @@ def search_spotify_track(plugin, beets_item) -> Optional[str]:
             query = strategy()
             plugin._log.debug("Spotify search strategy {}: {}", i, query)
 
-            spotify_search_results = plugin.sp.search(
+            spotify_search_results = spotify_call(
+                plugin.sp.search,
                 q=query,
                 limit=10,
                 type="track",
@@ -325,8 +402,11 @@ def search_spotify_track(plugin, beets_item) -> Optional[str]:
 
         except Exception as e:
             plugin._log.debug("Error in search strategy {}: {}", i, e)
+            last_error = e
             continue
 
+    if last_error is not None:
+        raise SpotifySearchError(f"Spotify search for {beets_item} failed: {last_error}") from last_error
     return None
 
 
@@ -339,9 +419,12 @@ def add_tracks_to_spotify_playlist(plugin, playlist_name: str, track_uris: List[
     - Uses non-overlapping 100-size chunks to avoid duplication.
     """
     user_id = plugin.sp.current_user()["id"]
-    playlists = plugin.sp.user_playlists(user_id)
+    playlists = fetch_all_pages(
+        lambda offset, limit: plugin.sp.user_playlists(user_id, limit=limit, offset=offset),
+        limit=50,
+    )
     playlist_id = None
-    for playlist in playlists["items"]:
+    for playlist in playlists:
         if playlist["name"].lower() == playlist_name.lower():
             playlist_id = playlist["id"]
             break
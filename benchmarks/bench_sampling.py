@@ -0,0 +1,45 @@
+"""Benchmark weighted selection without replacement.
+
+Compares ``Generator.choice(replace=False, p=...)`` with Gumbel-top-k
+sampling on random score vectors. Run from the repository root:
+
+    python benchmarks/bench_sampling.py [--sizes 10000 100000 1000000] [-k 50]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beetsplug.core.sampling import gumbel_top_k  # noqa: E402
+
+
+def bench(n, k):
+    rng = np.random.default_rng(0)
+    logits = rng.normal(0, 1, n) / 10.0
+
+    t0 = time.perf_counter()
+    p = np.exp(logits - logits.max())
+    p /= p.sum()
+    rng.choice(n, size=min(k, n), replace=False, p=p)
+    t1 = time.perf_counter()
+    gumbel_top_k(logits, k, rng=rng)
+    t2 = time.perf_counter()
+    print(f"{n:>9} tracks  k={k:<4} choice {t1 - t0:7.4f}s  gumbel-top-k {t2 - t1:7.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("-k", type=int, default=50)
+    args = parser.parse_args()
+    for n in args.sizes:
+        bench(n, args.k)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark smart playlist track scoring.
+
+Compares the per-track ``calculate_track_score`` loop with the vectorized
+``calculate_track_scores`` on synthetic pools. Run from the repository root:
+
+    python benchmarks/bench_scoring.py [--sizes 10000 100000 1000000]
+
+The scalar loop is only timed up to ``--scalar-limit`` tracks.
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beetsplug.core.features import extract_track_features  # noqa: E402
+from beetsplug.plex import smartplaylists as sp  # noqa: E402
+
+
+def make_tracks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    now = datetime.now().timestamp()
+    rated = rng.random(n) < 0.4
+    played = rng.random(n) < 0.7
+    ratings = np.where(rated, rng.integers(1, 11, n), 0)
+    last = now - rng.integers(0, 4 * 365, n) * 86400.0
+    views = rng.poisson(4, n)
+    pops = rng.integers(0, 100, n)
+    years = rng.integers(1950, 2025, n)
+    tracks = []
+    for i in range(n):
+        fields = {
+            "plex_userrating": float(ratings[i]),
+            "plex_viewcount": int(views[i]),
+            "spotify_track_popularity": int(pops[i]),
+            "year": int(years[i]),
+        }
+        if played[i]:
+            fields["plex_lastviewedat"] = float(last[i])
+        tracks.append(types.SimpleNamespace(**fields))
+    return tracks
+
+
+def bench(n, scalar_limit):
+    tracks = make_tracks(n)
+    base = datetime.now()
+
+    t0 = time.perf_counter()
+    features = extract_track_features(tracks)
+    t1 = time.perf_counter()
+    stats = sp._context_stats_from_features(features, base)
+    sp.calculate_track_scores(
+        tracks, base, "daily_discovery", tracks_context_stats=stats, features=features
+    )
+    t2 = time.perf_counter()
+    line = f"{n:>9} tracks  extract {t1 - t0:7.3f}s  score {t2 - t1:7.3f}s"
+
+    if n <= scalar_limit:
+        t3 = time.perf_counter()
+        stats = sp._compute_context_stats(tracks, base)
+        for track in tracks:
+            sp.calculate_track_score(
+                None, track, base, tracks_context_stats=stats, playlist_type="daily_discovery"
+            )
+        line += f"  scalar {time.perf_counter() - t3:7.3f}s"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--scalar-limit", type=int, default=100_000)
+    args = parser.parse_args()
+    for n in args.sizes:
+        bench(n, args.scalar_limit)
+
+
+if __name__ == "__main__":
+    main()
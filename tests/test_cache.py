@@ -45,6 +45,49 @@ class CacheTests(unittest.TestCase):
         self.cache.clear()
         self.assertIsNone(self.cache.get(key))
 
+    def test_sync_watermark_never_moves_backwards(self):
+        self.assertIsNone(self.cache.get_sync_watermark(7))
+        self.cache.set_sync_watermark(7, 200.0)
+        self.cache.set_sync_watermark(7, 100.0)
+        self.assertEqual(self.cache.get_sync_watermark(7), 200.0)
+        self.cache.set_sync_watermark(7, 300.0)
+        self.assertEqual(self.cache.get_sync_watermark('7'), 300.0)
+
+    def test_server_query_round_trip_is_per_section(self):
+        self.assertIsNone(self.cache.get_server_query('{"a": 1}', 3))
+        self.cache.set_server_query('{"a": 1}', 3, [5, 2, 9], 1000.0)
+        entry = self.cache.get_server_query('{"a": 1}', '3')
+        self.assertEqual(entry['rating_keys'], [5, 2, 9])
+        self.assertEqual(entry['section_updated_at'], 1000.0)
+        self.assertIsNone(self.cache.get_server_query('{"a": 1}', 4))
+
+    def test_playlist_validators_outlive_playlist_cache(self):
+        self.assertIsNone(self.cache.get_playlist_validators('pl', 'apple'))
+        songs = [{'title': 'A', 'artist': 'B'}]
+        self.cache.set_playlist_validators('pl', 'apple', songs, etag='"v1"', content_hash='abc')
+        self.cache.clear_expired_playlist_cache(max_age_hours=0)
+        entry = self.cache.get_playlist_validators('pl', 'apple')
+        self.assertEqual(entry['etag'], '"v1"')
+        self.assertIsNone(entry['last_modified'])
+        self.assertEqual(entry['content_hash'], 'abc')
+        self.assertEqual(entry['data'], songs)
+        self.assertIsNone(self.cache.get_playlist_validators('pl', 'post'))
+
+    def test_import_state_round_trip(self):
+        self.assertIsNone(self.cache.get_import_state('Mix'))
+        self.cache.set_import_state('Mix', 'h1', [(('a', 'b', ''), 7), (('c', 'd', 'e'), None)])
+        state = self.cache.get_import_state('Mix')
+        self.assertEqual(state['song_hash'], 'h1')
+        self.assertEqual(state['mapping'], [[['a', 'b', ''], 7], [['c', 'd', 'e'], None]])
+        self.assertIsNotNone(state['created_at'])
+
+    def test_spotify_resolutions_expire_negative_entries(self):
+        self.cache.set_spotify_resolutions([(1, 'fp1', 'abc'), (2, 'fp2', None)])
+        self.assertEqual(self.cache.get_spotify_resolutions([1, 2, 3]), {1: ('fp1', 'abc'), 2: ('fp2', None)})
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE spotify_item_resolution SET created_at = datetime('now', '-10 days')")
+        self.assertEqual(self.cache.get_spotify_resolutions([1, 2], negative_ttl_days=7), {1: ('fp1', 'abc')})
+
 
 if __name__ == '__main__':
     unittest.main()
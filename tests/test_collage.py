@@ -0,0 +1,164 @@
+import logging
+import os
+import threading
+import types
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from PIL import Image
+
+from beetsplug.plex import collage
+
+
+def _png(color):
+    buffer = BytesIO()
+    Image.new("RGB", (600, 400), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, content):
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, images):
+        self.images = images
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None):
+        with self.lock:
+            self.calls.append(url)
+        if url not in self.images:
+            raise IOError("not found")
+        return FakeResponse(self.images[url])
+
+
+def test_thumb_cache_path_changes_with_artwork_version(tmp_path):
+    first = collage.thumb_cache_path(str(tmp_path), 42, "/library/metadata/42/thumb/100")
+    second = collage.thumb_cache_path(str(tmp_path), 42, "/library/metadata/42/thumb/200")
+    assert first != second
+    assert first == collage.thumb_cache_path(str(tmp_path), 42, "/library/metadata/42/thumb/100")
+
+
+def test_fetch_thumbnails_uses_disk_cache(tmp_path):
+    log = logging.getLogger("test")
+    session = FakeSession({"a": _png("red"), "b": _png("blue")})
+    jobs = [
+        collage.ThumbJob("a", collage.thumb_cache_path(str(tmp_path), 1, "t1")),
+        collage.ThumbJob("b", collage.thumb_cache_path(str(tmp_path), 2, "t2")),
+        collage.ThumbJob("missing", None),
+    ]
+
+    blobs = collage.fetch_thumbnails(jobs, log, session=session, workers=4)
+    assert blobs[0] == session.images["a"] and blobs[2] is None
+    assert sorted(session.calls) == ["a", "b", "missing"]
+
+    session.calls.clear()
+    assert collage.fetch_thumbnails(jobs[:2], log, session=session, workers=4) == blobs[:2]
+    assert session.calls == []
+
+
+def test_new_artwork_version_replaces_cached_file(tmp_path):
+    log = logging.getLogger("test")
+    session = FakeSession({"a": _png("red")})
+    old = collage.thumb_cache_path(str(tmp_path), 1, "v1")
+    new = collage.thumb_cache_path(str(tmp_path), 1, "v2")
+
+    other = collage.thumb_cache_path(str(tmp_path), 11, "v1")
+
+    collage.fetch_thumbnails([collage.ThumbJob("a", old), collage.ThumbJob("a", other)],
+                             log, session=session, workers=1)
+    collage.fetch_thumbnails([collage.ThumbJob("a", new)], log, session=session, workers=1)
+    assert not os.path.exists(old)
+    assert os.path.exists(new)
+    assert os.path.exists(other)
+
+
+def test_decode_thumbnail_fits_tile():
+    width, height, pixels = collage._decode_thumbnail(_png("green"), 300)
+    assert (width, height) == (300, 200)
+    assert len(pixels) == width * height * 3
+    assert collage._decode_thumbnail(b"not an image", 300) is None
+
+
+class FakeHistoryPlex:
+    def __init__(self, history, metadata, fail_history=False):
+        self.history_entries = history
+        self.metadata = metadata
+        self.fail_history = fail_history
+        self.fetches = []
+
+    def history(self, mindate=None, librarySectionID=None, maxresults=None):
+        if self.fail_history:
+            raise RuntimeError("history unsupported")
+        return self.history_entries
+
+    def fetchItems(self, key):
+        keys = [int(k) for k in key.rsplit("/", 1)[-1].split(",")]
+        self.fetches.append(keys)
+        return [self.metadata[k] for k in keys if k in self.metadata]
+
+
+def _item(rating_key, **attrs):
+    return types.SimpleNamespace(ratingKey=rating_key, **attrs)
+
+
+def test_most_played_albums_resolves_albums_in_batches():
+    t0 = datetime(2024, 1, 1)
+    history = [
+        _item(11, parentRatingKey=1, viewedAt=t0),
+        _item(12, parentRatingKey=1, viewedAt=t0 + timedelta(days=1)),
+        _item(21, parentRatingKey=None, viewedAt=t0),  # album known from tracks
+        _item(31, parentRatingKey=None, viewedAt=t0),  # needs a track fetch
+        _item(31, parentRatingKey=None, viewedAt=t0),
+        _item(41, parentRatingKey=4, viewedAt=t0),  # album gone from library
+    ]
+    metadata = {
+        1: _item(1, title="One"),
+        2: _item(2, title="Two"),
+        3: _item(3, title="Three"),
+        31: _item(31, parentRatingKey=3),
+    }
+    plex = FakeHistoryPlex(history, metadata)
+    tracks = [_item(21, parentRatingKey=2)]
+
+    albums = collage.most_played_albums(plex, _item(5, key=5), tracks, 30, logging.getLogger("test"))
+
+    assert [(a.title, a.count) for a in albums] == [("One", 2), ("Three", 2), ("Two", 1)]
+    assert albums[0].last_played_date == t0 + timedelta(days=1)
+    assert plex.fetches == [[31], [1, 3, 2, 4]]
+
+    # Only the top albums are fetched; album 3 is gone from the library, so
+    # the next slice fills its place
+    plex.fetches.clear()
+    del metadata[3]
+    albums = collage.most_played_albums(
+        plex, _item(5, key=5), tracks, 30, logging.getLogger("test"), limit=2
+    )
+    assert [a.title for a in albums] == ["One", "Two"]
+    assert plex.fetches == [[31], [1, 3], [2, 4]]
+
+
+def test_most_played_albums_falls_back_to_track_history():
+    t0 = datetime(2024, 1, 1)
+
+    def track(key, album_key, plays):
+        return _item(
+            key,
+            parentRatingKey=album_key,
+            lastViewedAt=t0,
+            history=lambda mindate=None: [_item(key, viewedAt=t0)] * plays,
+        )
+
+    plex = FakeHistoryPlex([], {1: _item(1, title="One"), 2: _item(2, title="Two")}, fail_history=True)
+    tracks = [track(11, 1, 1), track(12, 2, 2), track(13, 2, 2)]
+
+    albums = collage.most_played_albums(plex, _item(5, key=5), tracks, 30, logging.getLogger("test"))
+
+    assert [(a.title, a.count) for a in albums] == [("Two", 4), ("One", 1)]
+    assert plex.fetches == [[2, 1]]
@@ -0,0 +1,113 @@
+import types
+
+import numpy as np
+
+from beetsplug.core.features import FeatureTable
+from beetsplug.plex import smartplaylists as sp
+
+
+def _item(**fields):
+    return types.SimpleNamespace(**fields)
+
+
+def _lookup():
+    return {
+        1: _item(plex_ratingkey=1, year=1975, genre="Rock, Pop", plex_userrating=8.0),
+        2: _item(plex_ratingkey=2, year=1995, genre="Jazz", plex_userrating=0),
+        3: _item(plex_ratingkey=3, year=0, genre="rock", plex_userrating=4.0),
+        4: _item(plex_ratingkey=4, year=1988, genre="", rating=9, plex_userrating=2.0),
+    }
+
+
+def test_rows_for_keys_keeps_order_and_skips_unknown():
+    table = FeatureTable(_lookup())
+    rows = table.rows_for_keys([3, 99, 1])
+    assert [item.plex_ratingkey for item in table.items_at(rows)] == [3, 1]
+
+
+def test_special_filter_mask_matches_item_filters():
+    table = FeatureTable(_lookup())
+    rows = table.rows
+
+    mask = sp._special_filter_mask(table, rows, {}, "70s80s_flashback")
+    assert list(rows[mask]) == [0, 3]
+
+    filters = {"include": {"genres": ["ROCK"], "years": {"after": 1980}}}
+    mask = sp._special_filter_mask(table, rows, filters, "highly_rated")
+    # 1975 fails "after 1980"; year 0 is unknown and passes
+    assert list(rows[mask]) == [2]
+
+    mask = sp._special_filter_mask(table, rows, {"min_rating": 5}, "highly_rated")
+    # item 3 is rated 4; item 4 uses its beets rating (9) over Plex's 2
+    assert list(rows[mask]) == [0, 1, 3]
+
+
+def test_select_rated_unrated_tops_up_from_rated():
+    table = FeatureTable(_lookup())
+    ps = types.SimpleNamespace(_log=types.SimpleNamespace(debug=lambda *a, **k: None))
+    rated = table.rows[table.rating > 0]
+    unrated = table.rows[table.rating <= 0]
+
+    selected = sp._select_rated_unrated(ps, table, rated, unrated, 1, 3, 4, None)
+
+    assert len(selected) == 4
+    assert len(set(selected.tolist())) == 4
+
+
+def test_playlist_context_prefixes_logs_and_shares_state():
+    messages = []
+    log = types.SimpleNamespace(info=lambda msg, *args: messages.append(msg.format(*args)))
+    plugin = types.SimpleNamespace(_log=log, _server_query_cache={}, music="section")
+
+    context = sp.PlaylistContext(plugin, "Daily Mix")
+    context._log.info("Selected {} tracks", 3)
+
+    assert messages == ["[Daily Mix] Selected 3 tracks"]
+    assert context.music == "section"
+    assert context._server_query_cache is plugin._server_query_cache
+
+
+def test_seeded_selection_replays_and_records_plan():
+    from datetime import datetime
+
+    table = FeatureTable(_lookup())
+    plugin = types.SimpleNamespace(_log=types.SimpleNamespace(debug=lambda *a, **k: None))
+
+    def select(seed):
+        context = sp.PlaylistContext(
+            plugin, "Mix", rng=sp.playlist_rng(seed, "Mix"), plan={},
+            base_time=datetime(2024, 1, 1),
+        )
+        rows = sp._select_rows(context, table, table.rows, 2, "forgotten_gems")
+        return rows.tolist(), context.plan
+
+    first, plan = select(7)
+    assert select(7)[0] == first
+    assert plan["selections"][0]["pool_size"] == 4
+    assert plan["selections"][0]["rating_keys"] == [
+        table.items[row].plex_ratingkey for row in first
+    ]
+    assert sp.playlist_rng(None, "Mix") is None
+    assert sp.playlist_rng(7, "Mix").random() != sp.playlist_rng(7, "Other").random()
+
+
+def test_volatile_filters_are_applied_locally():
+    from datetime import datetime
+
+    lookup = _lookup()
+    lookup[1].plex_lastviewedat = datetime(2023, 12, 30).timestamp()
+    lookup[2].plex_lastviewedat = datetime(2023, 6, 1).timestamp()
+    table = FeatureTable(lookup)
+    ps = types.SimpleNamespace(base_time=datetime(2024, 1, 1))
+    filters = {"min_rating": 5}
+
+    # Rating and recent plays change without bumping the section, so they
+    # must stay out of the persisted server query
+    assert sp.build_advanced_filters(filters, 30, volatile=False) is None
+    assert len(sp.build_advanced_filters(filters, 30)["and"]) == 2
+
+    rows = sp._volatile_filter_rows(ps, table, table.rows, filters, 30)
+    # row 0 was played 2 days ago, row 2 is rated 4, row 3 (Plex 2) is
+    # below the minimum; the unrated row 1 is kept
+    assert rows.tolist() == [1]
+    assert sp._volatile_filter_rows(ps, table, table.rows, {}, 0).tolist() == [0, 1, 2, 3]
@@ -0,0 +1,152 @@
+from requests.adapters import HTTPAdapter
+
+from beetsplug.providers import http_client
+
+
+def test_retry_policy_only_retries_idempotent_requests():
+    retry = http_client.build_retry(retries=4, backoff=0.25)
+
+    assert retry.total == 4
+    assert 429 in retry.status_forcelist and 503 in retry.status_forcelist
+    assert "GET" in retry.allowed_methods
+    assert "POST" not in retry.allowed_methods
+    assert retry.respect_retry_after_header
+    assert retry.backoff_factor == 0.25
+
+
+def test_session_pools_connections_per_host():
+    session = http_client.build_session(pool_size=3, retries=2, timeout=12)
+    adapter = session.get_adapter("https://music.apple.com/")
+
+    assert adapter is session.get_adapter("http://example.com/")
+    assert adapter._pool_maxsize == 3
+    assert adapter._pool_block is True
+    assert adapter.max_retries.total == 2
+    assert adapter.timeout == (http_client.CONNECT_TIMEOUT, 12)
+
+
+def test_adapter_applies_default_timeout(monkeypatch):
+    seen = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, **kwargs: seen.append(kwargs["timeout"]))
+    adapter = http_client.TimeoutHTTPAdapter(timeout=(1, 2))
+
+    adapter.send(object())
+    adapter.send(object(), timeout=7)
+
+    assert seen == [(1, 2), 7]
+
+
+def test_deadline_shortens_and_stops_requests(monkeypatch):
+    import time
+    import types
+
+    import pytest
+    import requests
+
+    seen = []
+    monkeypatch.setattr(HTTPAdapter, "send", lambda self, request, **kwargs: seen.append(kwargs["timeout"]))
+    adapter = http_client.TimeoutHTTPAdapter(timeout=(5, 30))
+    request = types.SimpleNamespace(url="https://example.com/")
+
+    with http_client.deadline(2):
+        adapter.send(request)
+    adapter.send(request)
+    assert seen[0][0] <= 2 and seen[0][1] <= 2
+    assert seen[1] == (5, 30)
+
+    with http_client.deadline(0.01):
+        time.sleep(0.02)
+        with pytest.raises(requests.exceptions.Timeout):
+            adapter.send(request)
+
+
+def test_get_session_is_shared(monkeypatch):
+    monkeypatch.setattr(http_client, "_session", None)
+    assert http_client.get_session() is http_client.get_session()
+
+
+class FakeResponse:
+    def __init__(self, status_code, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakePlaylistCache:
+    def __init__(self, validators=None):
+        self.validators = validators
+        self.stored = {}
+
+    def get_playlist_cache(self, playlist_id, source):
+        return None
+
+    def set_playlist_cache(self, playlist_id, source, data):
+        self.stored[(playlist_id, source)] = data
+
+    def get_playlist_validators(self, playlist_id, source):
+        return self.validators
+
+    def set_playlist_validators(self, playlist_id, source, data, etag=None,
+                                last_modified=None, content_hash=None):
+        self.validators = {"etag": etag, "last_modified": last_modified,
+                           "content_hash": content_hash, "data": data}
+
+
+def test_conditional_headers_from_validators():
+    assert http_client.conditional_headers(None) == {}
+    headers = http_client.conditional_headers({"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT"})
+    assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+
+def test_unchanged_data_on_not_modified_or_same_hash():
+    songs = [{"title": "A"}]
+    validators = {"etag": '"v1"', "content_hash": "abc", "data": songs}
+
+    assert http_client.unchanged_data(validators, FakeResponse(304)) == songs
+    assert http_client.unchanged_data(validators, FakeResponse(200), digest="abc") == songs
+    assert http_client.unchanged_data(validators, FakeResponse(200), digest="def") is None
+    assert http_client.unchanged_data(None, FakeResponse(304)) is None
+
+
+def test_apple_import_reuses_songs_when_not_modified(monkeypatch):
+    from beetsplug.providers import apple
+
+    songs = [{"title": "A", "album": "B", "artist": "C"}]
+    cache = FakePlaylistCache({"etag": '"v1"', "last_modified": None, "content_hash": "abc", "data": songs})
+    sent = []
+
+    def fake_get(url, headers=None):
+        sent.append(headers)
+        return FakeResponse(304)
+
+    monkeypatch.setattr(http_client, "get", fake_get)
+
+    assert apple.import_apple_playlist("https://music.apple.com/pl/123", cache) == songs
+    assert sent[0]["If-None-Match"] == '"v1"'
+    assert cache.stored[("123", "apple")] == songs
+
+
+def test_post_import_matches_by_hash_without_conditional_headers(monkeypatch):
+    from beetsplug.providers import http_post
+
+    songs = [{"title": "A", "artist": "C", "album": None}]
+    body = b'{"song_list": [{"title": "A", "artist": "C"}]}'
+    cache = FakePlaylistCache({"etag": '"v1"', "last_modified": None,
+                               "content_hash": http_client.content_hash(body), "data": songs})
+    sent = []
+
+    def fake_post(url, headers=None, json=None):
+        sent.append(headers)
+        response = FakeResponse(200)
+        response.content = body
+        return response
+
+    monkeypatch.setattr(http_client, "post", fake_post)
+
+    config = {"server_url": "https://example.com/api", "payload": {"playlist_url": "https://x/pl/9"}}
+    assert http_post.import_post_playlist(config, cache) == songs
+    assert "If-None-Match" not in sent[0]
+    assert cache.stored[("9", "post")] == songs
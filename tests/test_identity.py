@@ -0,0 +1,95 @@
+import importlib
+import types
+import unittest
+
+from xml.etree import ElementTree
+
+from plexapi.audio import Track
+
+from tests.test_playlist_import import DummyLogger, ensure_stubs
+
+
+def make_track(rating_key, mbid=None, path=None):
+    guids = [types.SimpleNamespace(id=f"mbid://{mbid}")] if mbid else []
+    parts = [types.SimpleNamespace(file=path)] if path else []
+    return types.SimpleNamespace(
+        ratingKey=rating_key,
+        guids=guids,
+        media=[types.SimpleNamespace(parts=parts)],
+    )
+
+
+class IdentityIndexTests(unittest.TestCase):
+    def setUp(self):
+        ensure_stubs(
+            {
+                'plexsync': {
+                    'path_rewrites': {'/home/me/Music': '/data/music'},
+                }
+            }
+        )
+        import beetsplug.core.config as config_module
+        importlib.reload(config_module)
+        import beetsplug.plex.identity as identity
+        self.identity = importlib.reload(identity)
+
+    def test_matches_by_mbid_case_insensitively(self):
+        index = self.identity.build_identity_index(
+            None, DummyLogger(), tracks=[make_track(1, mbid='ABC-123')]
+        )
+        item = types.SimpleNamespace(mb_trackid='abc-123', path=b'/elsewhere.mp3')
+        self.assertEqual(index.match(item).ratingKey, 1)
+
+    def test_indexing_search_results_does_not_reload_tracks(self):
+        reloads = []
+
+        def reload(*args, **kwargs):
+            reloads.append(args)
+
+        xml = (
+            '<Track ratingKey="{key}" key="/library/metadata/{key}" type="track" title="t">'
+            '{guid}<Media><Part file="/data/music/{key}.mp3"/></Media></Track>'
+        )
+        tracks = [
+            Track(None, ElementTree.fromstring(xml.format(key=1, guid='')), '/library/sections/1/all'),
+            Track(None, ElementTree.fromstring(xml.format(key=2, guid='<Guid id="mbid://XYZ"/>')),
+                  '/library/sections/1/all'),
+        ]
+        for track in tracks:
+            track._reload = reload
+
+        index = self.identity.build_identity_index(None, DummyLogger(), tracks=tracks)
+
+        self.assertEqual(reloads, [])
+
+        self.assertEqual(index.match(types.SimpleNamespace(mb_trackid='xyz')).ratingKey, 2)
+        item = types.SimpleNamespace(mb_trackid=None, path=b'/home/me/Music/1.mp3')
+        self.assertEqual(index.match(item).ratingKey, 1)
+
+    def test_matches_by_rewritten_path(self):
+        index = self.identity.build_identity_index(
+            None, DummyLogger(), tracks=[make_track(2, path='/data/music/A/song.flac')]
+        )
+        item = types.SimpleNamespace(mb_trackid='', path=b'/home/me/Music/A/song.flac')
+        self.assertEqual(index.match(item).ratingKey, 2)
+
+    def test_join_items_splits_unmatched(self):
+        index = self.identity.build_identity_index(
+            None, DummyLogger(), tracks=[make_track(3, mbid='x')]
+        )
+        hit = types.SimpleNamespace(mb_trackid='x', path=None)
+        miss = types.SimpleNamespace(mb_trackid='', path=b'/nowhere.mp3')
+        matched, unmatched = self.identity.join_items([hit, miss], index)
+        self.assertEqual([(i, t.ratingKey) for i, t in matched], [(hit, 3)])
+        self.assertEqual(unmatched, [miss])
+
+    def test_prefix_does_not_match_sibling_directory(self):
+        rewrites = self.identity.load_path_rewrites({'/music': '/plex'})
+        self.assertEqual(
+            self.identity.rewrite_path('/music2/a.mp3', rewrites), '/music2/a.mp3'
+        )
+        self.assertEqual(self.identity.rewrite_path('/music/a.mp3', rewrites), '/plex/a.mp3')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import contextlib
+import importlib
+import threading
+import types
+import unittest
+
+from tests.test_playlist_import import DummyLogger, ensure_stubs
+
+
+class FakeLib:
+    def __init__(self):
+        self.transactions = 0
+        self.active = threading.local()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.transactions += 1
+        self.active.value = True
+        try:
+            yield self
+        finally:
+            self.active.value = False
+
+
+class FakeItem(dict):
+    def __init__(self, lib, title, stored_threads):
+        super().__init__()
+        self.title = title
+        self._lib = lib
+        self._stored_threads = stored_threads
+        self.written = False
+
+    def store(self):
+        assert getattr(self._lib.active, 'value', False)
+        self._stored_threads.add(threading.current_thread().name)
+
+    def try_write(self):
+        self.written = True
+
+
+class LibrarySyncTests(unittest.TestCase):
+    def setUp(self):
+        ensure_stubs(
+            {
+                'plexsync': {
+                    'sync_workers': 3,
+                    'sync_batch_size': 2,
+                    'sync_write_workers': 1,
+                }
+            }
+        )
+        import beetsplug.core.config as config_module
+        importlib.reload(config_module)
+        import beetsplug.plex.library_sync as library_sync
+        self.library_sync = importlib.reload(library_sync)
+
+    def _plugin(self):
+        def search_plex_track(item):
+            if item.title == 'missing':
+                return None
+            return types.SimpleNamespace(
+                guid='g', ratingKey=hash(item.title) % 1000, userRating=8.0,
+                skipCount=0, viewCount=1, lastViewedAt=None, lastRatedAt=None,
+            )
+
+        return types.SimpleNamespace(_log=DummyLogger(), search_plex_track=search_plex_track)
+
+    def test_stores_in_batches_from_single_writer(self):
+        lib = FakeLib()
+        threads = set()
+        items = [FakeItem(lib, f't{n}', threads) for n in range(5)]
+        items.append(FakeItem(lib, 'missing', threads))
+
+        counts = self.library_sync.sync_items(self._plugin(), lib, items, True, False)
+
+        self.assertEqual(counts['updated'], 5)
+        self.assertEqual(counts['missing'], 1)
+        self.assertEqual(threads, {'plexsync-writer'})
+        self.assertGreaterEqual(lib.transactions, 3)
+        self.assertTrue(all(item.written for item in items[:5]))
+        self.assertEqual(items[0].plex_userrating, 8.0)
+
+    def test_failed_tag_writes_do_not_stop_the_writer(self):
+        class BrokenItem(FakeItem):
+            def try_write(self):
+                raise RuntimeError('disk full')
+
+        lib = FakeLib()
+        threads = set()
+        items = [BrokenItem(lib, f't{n}', threads) for n in range(10)]
+
+        for write_workers in (1, 0):
+            with self.subTest(write_workers=write_workers):
+                self.library_sync.get_sync_settings = lambda: (3, 2, write_workers)
+                counts = self.library_sync.sync_items(self._plugin(), lib, items, True, True)
+                self.assertEqual(counts['updated'], 10)
+
+    def test_skips_items_with_rating_unless_forced(self):
+        lib = FakeLib()
+        item = FakeItem(lib, 'rated', set())
+        item['plex_userrating'] = 5.0
+
+        counts = self.library_sync.sync_items(self._plugin(), lib, [item], False, False)
+        self.assertEqual(counts['updated'], 0)
+
+        counts = self.library_sync.sync_items(self._plugin(), lib, [item], False, True)
+        self.assertEqual(counts['updated'], 1)
+
+    def test_fetch_changed_tracks_merges_fields(self):
+        calls = []
+        old = types.SimpleNamespace(ratingKey=1)
+        new = types.SimpleNamespace(ratingKey=2)
+
+        class Music:
+            def search(self, **kwargs):
+                calls.append(kwargs)
+                if 'track.updatedAt>>' in kwargs['filters']:
+                    return [old, new]
+                if 'track.lastRatedAt>>' in kwargs['filters']:
+                    raise ValueError('unknown filter field')
+                return [new]
+
+        logger = DummyLogger()
+        tracks, complete = self.library_sync.fetch_changed_tracks(Music(), 1000.0, logger)
+
+        self.assertEqual([t.ratingKey for t in tracks], [1, 2])
+        # A failed field query must keep the watermark where it is
+        self.assertFalse(complete)
+        self.assertIn('warning', [level for level, _ in logger.messages])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0]['sort'], 'track.updatedAt:asc')
+
+    def test_track_watermark_uses_newest_timestamp(self):
+        from datetime import datetime
+
+        track = types.SimpleNamespace(
+            updatedAt=datetime.fromtimestamp(100),
+            lastViewedAt=datetime.fromtimestamp(300),
+            lastRatedAt=None,
+        )
+        self.assertEqual(self.library_sync.track_watermark(track), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import types
+from datetime import datetime
+
+from plexapi import exceptions
+
+from beetsplug.plex import operations as ops
+
+
+def _log():
+    return types.SimpleNamespace(info=lambda *a, **k: None, warning=lambda *a, **k: None,
+                                 error=lambda *a, **k: None, debug=lambda *a, **k: None)
+
+
+def _track(key, viewed=None):
+    return types.SimpleNamespace(
+        ratingKey=key, title=f"t{key}",
+        lastViewedAt=datetime.fromtimestamp(viewed) if viewed else None,
+    )
+
+
+class FakePlex:
+    """Plex server holding one playlist; records every request."""
+
+    def __init__(self, keys, views=None):
+        self.views = views or {}
+        self.entries = [self._entry(key, n) for n, key in enumerate(keys)]
+        self.next_id = len(keys)
+        self.missing = set()
+        self.requests = []
+        self._session = types.SimpleNamespace(put="PUT", delete="DELETE")
+        self.playlist_obj = types.SimpleNamespace(key="/playlists/9", addItems=self._add)
+
+    def _entry(self, key, item_id):
+        entry = _track(key, self.views.get(key))
+        entry.playlistItemID = item_id
+        return entry
+
+    def keys(self):
+        return [entry.ratingKey for entry in self.entries]
+
+    def playlist(self, name):
+        self.requests.append("GET playlist")
+        if self.playlist_obj is None:
+            raise exceptions.NotFound("missing")
+        return self.playlist_obj
+
+    def fetchItems(self, key):
+        if key.startswith("/library/metadata/"):
+            self.requests.append("GET metadata")
+            keys = [int(k) for k in key.rsplit("/", 1)[1].split(",")]
+            return [_track(k, self.views.get(k)) for k in keys if k not in self.missing]
+        self.requests.append("GET items")
+        return list(self.entries)
+
+    def _add(self, tracks):
+        self.requests.append("PUT add")
+        for track in tracks:
+            self.entries.append(self._entry(track.ratingKey, self.next_id))
+            self.next_id += 1
+
+    def query(self, key, method=None):
+        self.requests.append(f"{method} {key}")
+        parts = key.split("/")
+        if method == "DELETE" and key.endswith("/items"):
+            self.entries = []
+        elif method == "DELETE":
+            self.entries = [e for e in self.entries if e.playlistItemID != int(parts[-1])]
+        else:
+            item_id = int(parts[4])
+            entry = next(e for e in self.entries if e.playlistItemID == item_id)
+            self.entries.remove(entry)
+            index = 0
+            if "?after=" in key:
+                after = int(key.split("?after=")[1])
+                index = next(n for n, e in enumerate(self.entries) if e.playlistItemID == after) + 1
+            self.entries.insert(index, entry)
+
+
+def test_plan_moves_only_items_outside_increasing_run():
+    moves = ops.plan_playlist_moves([1, 2, 3, 4, 5], [5, 1, 2, 3, 4])
+    assert moves == [(5, None)]
+    assert ops.plan_playlist_moves([3, 1, 2], [1, 2, 3]) == [(3, 2)]
+    assert ops.plan_playlist_moves([1, 2], [1, 2]) == []
+
+
+def test_sync_applies_target_order_with_minimal_requests():
+    plex = FakePlex([1, 2, 3, 4, 5])
+    target = [_track(k) for k in (2, 3, 4, 5, 6, 1)]
+
+    ops.sync_plex_playlist(plex, "Mix", target, _log(), sort_field=None)
+
+    assert plex.keys() == [2, 3, 4, 5, 6, 1]
+    # playlist, items, 1 fetch + 1 add, items again for new ids, 1 move
+    assert len(plex.requests) == 6
+
+
+def test_sync_replaces_everything_with_one_delete_and_sorts_by_recency():
+    plex = FakePlex([1, 2], views={3: 100, 4: 300, 5: 200})
+
+    ops.sync_plex_playlist(plex, "Mix", [_track(k) for k in (3, 4, 5)], _log())
+
+    assert plex.keys() == [4, 5, 3]
+    assert sum(r.startswith("DELETE") for r in plex.requests) == 1
+
+
+def test_add_keeps_existing_entries_and_skips_duplicates():
+    plex = FakePlex([1, 2], views={1: 10, 2: 20, 3: 30})
+
+    ops.plex_add_playlist_item(plex, [_track(2), _track(3)], "Mix", _log())
+
+    assert plex.keys() == [3, 2, 1]
+    assert plex.requests.count("GET metadata") == 1
+
+
+def test_sort_places_every_copy_of_a_duplicate_track():
+    plex = FakePlex([1, 2, 1, 3], views={1: 100, 2: 300, 3: 200})
+    plex.entries[2].lastViewedAt = datetime.fromtimestamp(400)
+
+    ops.sort_plex_playlist(plex, "Mix", "lastViewedAt", _log())
+
+    assert [entry.playlistItemID for entry in plex.entries] == [2, 1, 3, 0]
+    moved = [r.split("/")[4] for r in plex.requests if r.startswith("PUT /playlists")]
+    assert len(moved) == len(set(moved))
+
+
+def test_sync_creates_missing_playlist():
+    plex = FakePlex([])
+    plex.playlist_obj = None
+    created = {}
+    plex.createPlaylist = lambda name, items: created.update(name=name, items=items)
+
+    ops.sync_plex_playlist(plex, "New", [_track(1), _track(2)], _log(), sort_field=None)
+
+    assert created["name"] == "New"
+    assert [t.ratingKey for t in created["items"]] == [1, 2]
+
+
+def test_fetch_items_by_keys_batches_and_skips_missing():
+    plex = FakePlex([])
+    plex.missing = {3}
+
+    items = ops.fetch_items_by_keys(plex, [5, 3, 1, 5, 2], batch_size=2)
+
+    assert [item.ratingKey for item in items] == [5, 1, 2]
+    assert plex.requests == ["GET metadata"] * 2
+
+
+def test_remove_matches_entries_by_key_without_fetching():
+    plex = FakePlex([1, 2, 3])
+
+    ops.plex_remove_playlist_item(plex, [_track(2), _track(7)], "Mix", _log())
+
+    assert plex.keys() == [1, 3]
+    assert "GET metadata" not in plex.requests
@@ -1,7 +1,10 @@
 import importlib
 import sys
+import threading
+import time
 import types
 import unittest
+from datetime import datetime, timedelta, timezone
 
 
 class DummyConfigNode:
@@ -288,6 +291,123 @@ class PlaylistImportTest(unittest.TestCase):
         self.assertEqual(plugin.added, (['match-Q'], 'SearchMix'))
         self.assertEqual(self.search_calls[-1], ('query', 5))
 
+    def test_fetch_sources_keeps_configured_order(self):
+        logger = DummyLogger()
+        plugin = PluginStub(logger)
+        delays = {'https://youtube.com/slow': 0.2, 'https://youtube.com/fast': 0.0}
+
+        def _stub_playlist(url, cache):
+            time.sleep(delays[url])
+            return [{'title': url}]
+
+        self.module.import_yt_playlist = _stub_playlist
+        finished = []
+        results = self.module.fetch_sources(
+            plugin,
+            ['https://youtube.com/slow', 'https://youtube.com/fast', {'type': 'Bogus'}],
+            workers=3,
+            on_done=lambda result: finished.append(result.source),
+        )
+
+        self.assertEqual([r.source for r in results],
+                         ['https://youtube.com/slow', 'https://youtube.com/fast', 'Bogus'])
+        self.assertEqual(results[0].tracks, [{'title': 'https://youtube.com/slow'}])
+        self.assertEqual(finished[-1], 'https://youtube.com/slow')
+
+    def test_fetch_sources_times_out_slow_source(self):
+        logger = DummyLogger()
+        plugin = PluginStub(logger)
+        release = threading.Event()
+
+        def _stub_playlist(url, cache):
+            if 'hang' in url:
+                release.wait(5)
+            return [{'title': url}]
+
+        self.module.import_yt_playlist = _stub_playlist
+        try:
+            results = self.module.fetch_sources(
+                plugin, ['https://youtube.com/hang', 'https://youtube.com/ok'], workers=2, timeout=0.1
+            )
+        finally:
+            release.set()
+
+        self.assertIsInstance(results[0].error, TimeoutError)
+        self.assertEqual(results[0].tracks, [])
+        self.assertEqual(results[1].tracks, [{'title': 'https://youtube.com/ok'}])
+        self.assertTrue(any(level == 'error' for level, _ in logger.messages))
+
+    def test_match_songs_reuses_previous_import(self):
+        logger = DummyLogger()
+
+        class StateCache:
+            def __init__(self):
+                self.state = None
+
+            def get_import_state(self, name):
+                return self.state
+
+            def set_import_state(self, name, song_hash, mapping):
+                self.state = {
+                    'song_hash': song_hash,
+                    'mapping': [[list(k), rk] for k, rk in mapping],
+                    'created_at': datetime.now(timezone.utc).replace(tzinfo=None),
+                }
+
+        class FakePlex:
+            def __init__(self):
+                self.library = {}
+                self.fetches = []
+
+            def fetchItems(self, key):
+                keys = [int(k) for k in key.rsplit('/', 1)[-1].split(',')]
+                self.fetches.append(keys)
+                return [self.library[k] for k in keys if k in self.library]
+
+        class MatchingPlugin(PluginStub):
+            def __init__(self, logger):
+                super().__init__(logger)
+                self.cache = StateCache()
+                self.plex = FakePlex()
+                self.searched = []
+
+            def search_plex_song(self, song, manual_search=False):
+                self.searched.append(song['title'])
+                if song['title'] == 'Missing':
+                    return None
+                track = types.SimpleNamespace(ratingKey=len(self.plex.library) + 100, title=song['title'])
+                self.plex.library[track.ratingKey] = track
+                return track
+
+        plugin = MatchingPlugin(logger)
+        songs = [{'title': 'One'}, {'title': 'Missing'}, {'title': 'Two'}]
+
+        first = self.module.match_songs(plugin, 'Mix', songs)
+        self.assertEqual([t.title for t in first], ['One', 'Two'])
+        self.assertEqual(plugin.searched, ['One', 'Missing', 'Two'])
+
+        # An unchanged song list is not searched again within the retry period
+        plugin.searched.clear()
+        stored = plugin.cache.state
+        again = self.module.match_songs(plugin, 'Mix', songs)
+        self.assertEqual([t.title for t in again], ['One', 'Two'])
+        self.assertEqual(plugin.searched, [])
+        self.assertEqual(plugin.plex.fetches[-1], [100, 101])
+        self.assertIs(plugin.cache.state, stored)
+
+        # Afterwards only the previously unmatched song is searched again
+        stored['created_at'] -= timedelta(days=2)
+        again = self.module.match_songs(plugin, 'Mix', songs)
+        self.assertEqual([t.title for t in again], ['One', 'Two'])
+        self.assertEqual(plugin.searched, ['Missing'])
+
+        # A track that disappeared from Plex is searched again as well
+        plugin.searched.clear()
+        del plugin.plex.library[101]
+        changed = self.module.match_songs(plugin, 'Mix', songs + [{'title': 'Three'}])
+        self.assertEqual(plugin.searched, ['Missing', 'Two', 'Three'])
+        self.assertEqual([t.title for t in changed], ['One', 'Two', 'Three'])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,106 @@
+from beets.library import Item, Library
+
+from beetsplug.core.projection import ProjectedItem, iter_projected_items
+
+
+def _library(tmp_path):
+    # A file path: beets writes migration backups next to the database,
+    # which for ":memory:" means the current directory.
+    lib = Library(str(tmp_path / "library.db"))
+    linked = Item(title="Linked", artist="Artist", album="Album", year=1999)
+    linked.plex_ratingkey = 42
+    linked.plex_userrating = 8.0
+    linked.comments = "not projected"
+    lib.add(linked)
+    lib.add(Item(title="Unlinked", artist="Other", album="Else", year=0))
+    return lib, linked
+
+
+def test_projection_matches_full_items(tmp_path):
+    lib, linked = _library(tmp_path)
+    records = {record.id: record for record in iter_projected_items(lib)}
+
+    record = records[linked.id]
+    assert isinstance(record, ProjectedItem)
+    assert (record.title, record.artist, record.album, record.year) == (
+        "Linked", "Artist", "Album", 1999,
+    )
+    full = lib.get_item(linked.id)
+    assert record.plex_ratingkey == full.plex_ratingkey
+    assert record.plex_userrating == full.plex_userrating
+    assert "plex_userrating" in record
+
+
+def test_missing_flexattr_raises_attribute_error(tmp_path):
+    lib, linked = _library(tmp_path)
+    unlinked = [r for r in iter_projected_items(lib) if r.id != linked.id][0]
+
+    assert not hasattr(unlinked, "plex_ratingkey")
+    assert getattr(unlinked, "plex_userrating", None) is None
+    assert unlinked._item is None
+
+
+def test_other_attributes_hydrate_lazily(tmp_path):
+    lib, linked = _library(tmp_path)
+    record = [r for r in iter_projected_items(lib) if r.id == linked.id][0]
+
+    assert record.comments == "not projected"
+    assert record._item is not None
+
+
+def _filter_library(tmp_path):
+    lib = Library(str(tmp_path / "library.db"))
+    rows = [
+        # year, plex rating, beets rating, genre
+        (1975, 8.0, None, "Rock"),
+        (1985, 3.0, 9, "Pop"),
+        (1995, 0, None, "Jazz"),
+        (0, 7.0, None, "Rock"),
+        (1980, 9.0, None, "Rock"),
+    ]
+    for n, (year, plex_rating, rating, genre) in enumerate(rows, start=1):
+        item = Item(title=f"t{n}", year=year, genres=[genre])
+        item.plex_ratingkey = n
+        item.plex_userrating = plex_rating
+        if rating is not None:
+            item.rating = rating
+        lib.add(item)
+    lib.add(Item(title="unlinked", year=1980))
+    return lib
+
+
+def test_sql_filters_match_in_memory_filters(tmp_path):
+    import types
+
+    from beetsplug.core.features import FeatureTable
+    from beetsplug.plex import smartplaylists as sp
+
+    lib = _filter_library(tmp_path)
+    lookup = {r.plex_ratingkey: r for r in iter_projected_items(lib) if "plex_ratingkey" in r}
+    table = FeatureTable(lookup)
+    ps = types.SimpleNamespace(_log=types.SimpleNamespace(debug=lambda *a, **k: None))
+
+    cases = [
+        ({}, "70s80s_flashback"),
+        ({}, "highly_rated"),
+        ({"min_rating": 5}, "most_played"),
+        ({"include": {"years": {"between": [1970, 1990]}, "genres": ["rock"]}}, "most_played"),
+        ({"exclude": {"years": {"before": 1980}, "genres": ["pop"]}}, "most_played"),
+    ]
+    for filters, playlist_type in cases:
+        rows = table.rows[table.linked]
+        expected = rows[sp._special_filter_mask(table, rows, filters, playlist_type)]
+        if playlist_type == "highly_rated":
+            expected = expected[table.rating[expected] >= 7.0]
+        actual = sp._special_rows(ps, lib, table, filters, playlist_type)
+        assert actual.tolist() == expected.tolist(), (filters, playlist_type)
+
+
+def test_attribute_index_is_created(tmp_path):
+    from beetsplug.core.projection import ATTRIBUTE_INDEX, query_linked_item_ids
+
+    lib = _filter_library(tmp_path)
+    assert len(query_linked_item_ids(lib, {})) == 5
+    with lib.transaction() as tx:
+        names = [row[0] for row in tx.query("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert ATTRIBUTE_INDEX in names
@@ -0,0 +1,32 @@
+import numpy as np
+
+from beetsplug.core.sampling import gumbel_top_k
+
+
+def test_returns_distinct_indices_and_respects_exclusions():
+    logits = np.zeros(10)
+    exclude = np.zeros(10, dtype=bool)
+    exclude[[1, 3, 5]] = True
+
+    chosen = gumbel_top_k(logits, 5, exclude=exclude, seed=0)
+    assert len(chosen) == len(set(chosen)) == 5
+    assert not set(chosen) & {1, 3, 5}
+
+    # Only seven indices are eligible
+    assert len(gumbel_top_k(logits, 20, exclude=exclude, seed=0)) == 7
+    assert len(gumbel_top_k([-np.inf, 0.0], 2, seed=0)) == 1
+    assert len(gumbel_top_k([], 3, seed=0)) == 0
+
+
+def test_seed_reproduces_selection():
+    logits = np.linspace(0, 1, 100)
+    assert list(gumbel_top_k(logits, 10, seed=42)) == list(gumbel_top_k(logits, 10, seed=42))
+
+
+def test_first_draw_follows_softmax():
+    logits = np.log(np.array([0.6, 0.3, 0.1]))
+    rng = np.random.default_rng(1)
+    firsts = np.bincount(
+        [gumbel_top_k(logits, 2, rng=rng)[0] for _ in range(20000)], minlength=3
+    ) / 20000
+    assert np.allclose(firsts, [0.6, 0.3, 0.1], atol=0.02)
@@ -0,0 +1,52 @@
+import types
+from datetime import datetime, timedelta
+from unittest import mock
+
+import numpy as np
+
+from beetsplug.plex import smartplaylists as sp
+
+
+class _ZeroNoise:
+    def normal(self, loc, scale, size=None):
+        return np.zeros(size) if size is not None else 0.0
+
+
+def _tracks():
+    base = datetime(2024, 6, 1, 12, 0, 0)
+    rows = [
+        dict(plex_userrating=8.0, plex_lastviewedat=(base - timedelta(days=3)).timestamp(),
+             plex_viewcount=12, spotify_track_popularity=55, year=2019),
+        dict(plex_userrating=0, plex_viewcount=0, spotify_track_popularity=10, year=1984),
+        dict(plex_userrating=10.0, plex_lastviewedat=(base - timedelta(days=2000)).timestamp(),
+             plex_viewcount=1, year=0),
+        dict(plex_userrating=4.0, plex_lastviewedat="garbage", year="1999"),
+        dict(spotify_track_popularity=80, year=2030),
+    ]
+    return base, [types.SimpleNamespace(**row) for row in rows]
+
+
+def test_vectorized_scores_match_scalar_scores():
+    base, tracks = _tracks()
+    stats = sp._compute_context_stats(tracks, base)
+    for playlist_type in list(sp.DEFAULT_SCORING_WEIGHTS) + [None]:
+        with mock.patch.object(sp, "_module_rng", _ZeroNoise()):
+            expected = [
+                sp.calculate_track_score(
+                    None, t, base, tracks_context_stats=stats, playlist_type=playlist_type
+                )
+                for t in tracks
+            ]
+        actual = sp.calculate_track_scores(
+            tracks, base, playlist_type=playlist_type,
+            tracks_context_stats=stats, rng=_ZeroNoise(),
+        )
+        np.testing.assert_allclose(actual, expected, atol=1e-9)
+
+
+def test_scores_are_clipped_and_unrated_floor_applied():
+    base, tracks = _tracks()
+    scores = sp.calculate_track_scores(tracks, base, playlist_type="forgotten_gems")
+    assert scores.shape == (len(tracks),)
+    assert np.all((scores >= 0) & (scores <= 100))
+    assert scores[1] >= 24  # unrated scores are lifted towards 50
@@ -0,0 +1,87 @@
+import importlib
+import os
+import sys
+import tempfile
+import types
+import unittest
+from datetime import datetime
+from xml.etree import ElementTree
+
+from plexapi.audio import Track
+
+from tests.test_playlist_import import DummyLogger, ensure_stubs
+
+
+class FakeTrack:
+    def __init__(self, key, updated=100, version=1, viewed=None):
+        self.ratingKey = key
+        self.title = f"track {key}"
+        self.updatedAt = datetime.fromtimestamp(updated)
+        self.musicAnalysisVersion = version
+        self.lastViewedAt = datetime.fromtimestamp(viewed or key)
+        self.calls = 0
+
+    def sonicallySimilar(self):
+        self.calls += 1
+        genre = types.SimpleNamespace(tag="Rock")
+        return [types.SimpleNamespace(ratingKey=self.ratingKey * 10, distance=0.2,
+                                      genres=[genre], userRating=None)]
+
+
+class SonicCacheTests(unittest.TestCase):
+    def setUp(self):
+        ensure_stubs({'plexsync': {'sonic_refresh_budget': 1}})
+        sys.modules.setdefault('plexapi.video', types.SimpleNamespace(Video=object))
+        sys.modules.setdefault('plexapi.server', types.SimpleNamespace(PlexServer=object))
+        import beetsplug.core.config as config_module
+        importlib.reload(config_module)
+        import beetsplug.plex.sonic as sonic
+        self.sonic = importlib.reload(sonic)
+        from beetsplug.core.cache import Cache
+
+        self.tempdir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        plugin = types.SimpleNamespace(_log=DummyLogger())
+        self.ps = types.SimpleNamespace(
+            _log=DummyLogger(),
+            cache=Cache(os.path.join(self.tempdir.name, 'cache.db'), plugin),
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_analysis_version_does_not_reload_tracks(self):
+        reloads = []
+        xml = '<Track ratingKey="1" key="/library/metadata/1" type="track" title="t"{}/>'
+        unanalysed = Track(None, ElementTree.fromstring(xml.format('')), '/library/sections/1/all')
+        analysed = Track(None, ElementTree.fromstring(xml.format(' musicAnalysisVersion="1"')),
+                         '/library/sections/1/all')
+        for track in (unanalysed, analysed):
+            track._reload = lambda *args, **kwargs: reloads.append(args)
+
+        self.assertIsNone(self.sonic._analysis_version(unanalysed))
+        self.assertEqual(self.sonic._analysis_version(analysed), "1")
+        self.assertEqual(reloads, [])
+
+    def test_budget_refreshes_most_recent_seed_first(self):
+        old, recent = FakeTrack(1, viewed=10), FakeTrack(2, viewed=20)
+
+        result = self.sonic.get_sonic_neighbors(self.ps, [old, recent])
+
+        self.assertEqual(list(result), [2])
+        self.assertEqual(result[2][0][:3], [20, 0.2, ['rock']])
+        self.assertEqual((old.calls, recent.calls), (0, 1))
+
+    def test_cached_neighbors_reused_until_track_changes(self):
+        track = FakeTrack(3)
+        self.sonic.get_sonic_neighbors(self.ps, [track])
+        self.sonic.get_sonic_neighbors(self.ps, [track])
+        self.assertEqual(track.calls, 1)
+
+        reanalysed = FakeTrack(3, version=2)
+        result = self.sonic.get_sonic_neighbors(self.ps, [reanalysed])
+        self.assertEqual(reanalysed.calls, 1)
+        self.assertIn(3, result)
+
+
+if __name__ == '__main__':
+    unittest.main()
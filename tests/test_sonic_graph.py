@@ -0,0 +1,38 @@
+import numpy as np
+
+from beetsplug.core.sonic_graph import SonicGraph
+
+
+def _graph():
+    # 1 - 2 - 3 - 4 chain plus a 5 - 6 island; only 1 and 3 were ever seeds.
+    return SonicGraph({
+        1: [[2, 0.1, ["rock"], None]],
+        3: [[2, 0.3, ["rock"], 8], [4, 0.2, ["jazz"], None]],
+        5: [[6, 0.1, ["pop"], None]],
+    })
+
+
+def test_graph_symmetrizes_cached_edges():
+    graph = _graph()
+    assert len(graph) == 6
+    assert graph.edge_count == 4
+    assert graph.genres[graph.index[2]] == frozenset({"rock"})
+    assert graph.rating[graph.index[2]] == 8
+    assert graph.distance[graph.index[2]] == 0.1
+
+
+def test_walk_reaches_tracks_beyond_one_hop():
+    ranked = _graph().rank({1: 1.0})
+    keys = [key for key, _ in ranked]
+    # 4 is two hops from any neighbor list of seed 1; the island is unreachable
+    assert keys == [2, 3, 4]
+    scores = [score for _, score in ranked]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_walk_scores_are_a_distribution_and_honour_exclusions():
+    graph = _graph()
+    scores = graph.personalized_pagerank({1: 1.0, 5: 1.0})
+    assert np.isclose(scores.sum(), 1.0)
+    assert [key for key, _ in graph.rank({1: 1.0}, exclude=[3])] == [2, 4]
+    assert graph.rank({99: 1.0}) == []
@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+import spotipy
+
+from beetsplug.providers import http_client
+from beetsplug.providers import spotify
+
+
+@pytest.fixture(autouse=True)
+def fast_limiter(monkeypatch):
+    monkeypatch.setattr(spotify, "_limiter", http_client.TokenBucket(1000))
+
+
+class FakeSpotify:
+    def __init__(self, total):
+        self.total = total
+        self.offsets = []
+        self.lock = threading.Lock()
+
+    def playlist_items(self, playlist_id, additional_types=None, offset=0, limit=100):
+        with self.lock:
+            self.offsets.append(offset)
+        # Later pages answer first to check that pages are put back in order
+        time.sleep(0.01 * (self.total - offset) / self.total)
+        items = [{"track": {"id": str(i)}} for i in range(offset, min(offset + limit, self.total))]
+        return {"items": items, "total": self.total, "limit": limit}
+
+
+def test_get_playlist_tracks_fetches_pages_by_offset():
+    sp = FakeSpotify(450)
+    plugin = type("Plugin", (), {"sp": sp})()
+
+    tracks = spotify.get_playlist_tracks(plugin, "pl")
+
+    assert [t["track"]["id"] for t in tracks] == [str(i) for i in range(450)]
+    assert sorted(sp.offsets) == [0, 100, 200, 300, 400]
+
+
+def test_spotify_call_waits_for_retry_after(monkeypatch):
+    paused = []
+    limiter = spotify.get_limiter()
+    monkeypatch.setattr(limiter, "pause", paused.append)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise spotipy.exceptions.SpotifyException(429, -1, "rate limited", headers={"Retry-After": "2"})
+        return "ok"
+
+    assert spotify.spotify_call(flaky) == "ok"
+    assert paused == [2.0]
+
+
+def test_spotify_call_raises_other_errors():
+    def broken():
+        raise spotipy.exceptions.SpotifyException(404, -1, "not found")
+
+    with pytest.raises(spotipy.exceptions.SpotifyException):
+        spotify.spotify_call(broken)
+
+
+def test_token_bucket_limits_rate():
+    bucket = http_client.TokenBucket(50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_search_spotify_track_raises_when_strategies_fail():
+    class Log:
+        def debug(self, *args):
+            pass
+
+    def search(**kwargs):
+        raise spotipy.exceptions.SpotifyException(500, -1, "server error")
+
+    item = type("Item", (), {"title": "Song", "album": "Album", "artist": "Artist"})()
+    plugin = type("Plugin", (), {"sp": type("Sp", (), {"search": staticmethod(search)})(), "_log": Log()})()
+
+    with pytest.raises(spotify.SpotifySearchError):
+        spotify.search_spotify_track(plugin, item)
+
+
+def test_search_spotify_track_returns_none_without_results():
+    class Log:
+        def debug(self, *args):
+            pass
+
+    item = type("Item", (), {"title": "Song", "album": "Album", "artist": "Artist"})()
+    sp = type("Sp", (), {"search": staticmethod(lambda **kwargs: {"tracks": {"items": []}})})()
+    plugin = type("Plugin", (), {"sp": sp, "_log": Log()})()
+
+    assert spotify.search_spotify_track(plugin, item) is None
@@ -37,10 +37,21 @@ class SpotifyTransferTest(unittest.TestCase):
                     PlexItem(1, 'Album', 'Song'),
                 ]))
                 self.called_auth = False
-                self.sp = types.SimpleNamespace(track=lambda track_id: {
-                    'is_playable': True,
-                    'available_markets': ['US'],
-                })
+                self.checked = []
+                self.sp = types.SimpleNamespace(tracks=self._tracks)
+
+            def _tracks(self, track_ids):
+                self.checked.append(list(track_ids))
+                return {'tracks': [
+                    {'id': track_id, 'is_playable': True, 'available_markets': ['US']}
+                    for track_id in track_ids
+                ]}
+
+            def create_progress_counter(self, *args, **kwargs):
+                return None
+
+            def _build_plex_lookup_and_vector_index(self, lib):
+                return {item.plex_ratingkey: item for item in lib.items()}
 
             def authenticate_spotify(self):
                 self.called_auth = True
@@ -70,6 +81,7 @@ class SpotifyTransferTest(unittest.TestCase):
 
         self.assertTrue(plugin.called_auth)
         self.assertEqual(plugin.sent, ('Mix', ['spotify:track:123']))
+        self.assertEqual(plugin.checked, [['123']])
 
     def test_falls_back_to_search_when_unplayable(self):
         logger = DummyLogger()
@@ -78,14 +90,19 @@ class SpotifyTransferTest(unittest.TestCase):
             def __init__(self):
                 self._log = logger
                 self.plex = types.SimpleNamespace(playlist=lambda name: types.SimpleNamespace(items=lambda: [types.SimpleNamespace(ratingKey=1, parentTitle='Alb', title='Song')]))
-                self.sp = types.SimpleNamespace(track=lambda _id: {
-                    'is_playable': False,
-                    'available_markets': [],
-                })
+                self.sp = types.SimpleNamespace(tracks=lambda ids: {'tracks': [
+                    {'id': 'orig', 'is_playable': False, 'available_markets': []},
+                ]})
 
             def authenticate_spotify(self):
                 pass
 
+            def create_progress_counter(self, *args, **kwargs):
+                return None
+
+            def _build_plex_lookup_and_vector_index(self, lib):
+                return {item.plex_ratingkey: item for item in lib.items()}
+
             def _search_spotify_track(self, beets_item):
                 return 'fallback'
 
@@ -111,6 +128,96 @@ class SpotifyTransferTest(unittest.TestCase):
 
         self.assertEqual(plugin.sent, ['fallback'])
 
+    def test_checks_availability_in_batches_and_searches_misses(self):
+        checked = []
+
+        def tracks(track_ids):
+            checked.append(len(track_ids))
+            return {'tracks': [
+                None if track_id == 'id7' else {'id': track_id, 'available_markets': ['US']}
+                for track_id in track_ids
+            ]}
+
+        searched = []
+        items = [
+            types.SimpleNamespace(spotify_track_id=f'spotify:track:id{i}' if i % 10 else None, title=f'T{i}')
+            for i in range(120)
+        ]
+        plugin = types.SimpleNamespace(
+            _log=DummyLogger(),
+            sp=types.SimpleNamespace(tracks=tracks),
+            _search_spotify_track=lambda item: searched.append(item.title) or f'found-{item.title}',
+        )
+
+        results = self.transfer._resolve_spotify_tracks(plugin, items)
+
+        self.assertEqual(checked, [50, 50, 8])
+        self.assertEqual(sorted(searched), sorted(['T7'] + [f'T{i}' for i in range(0, 120, 10)]))
+        self.assertEqual(results[1], 'spotify:track:id1')
+        self.assertEqual(results[7], 'found-T7')
+        self.assertEqual(results[10], 'found-T10')
+
+    def test_reuses_cached_resolutions(self):
+        class ResolutionCache:
+            def __init__(self):
+                self.entries = {}
+
+            def get_spotify_resolutions(self, item_ids, negative_ttl_days=7):
+                return {item_id: self.entries[item_id] for item_id in item_ids if item_id in self.entries}
+
+            def set_spotify_resolutions(self, entries):
+                for item_id, fingerprint, spotify_id in entries:
+                    self.entries[item_id] = (fingerprint, spotify_id)
+
+        searched = []
+        matches = {'Found': 'sid1'}
+        plugin = types.SimpleNamespace(
+            _log=DummyLogger(),
+            cache=ResolutionCache(),
+            sp=types.SimpleNamespace(tracks=lambda ids: {'tracks': [
+                {'id': track_id, 'available_markets': ['US']} for track_id in ids
+            ]}),
+            _search_spotify_track=lambda item: searched.append(item.title) or matches.get(item.title),
+        )
+        items = [
+            types.SimpleNamespace(id=1, title='Found', artist='A', album='X'),
+            types.SimpleNamespace(id=2, title='Lost', artist='B', album='Y'),
+        ]
+
+        self.assertEqual(self.transfer._resolve_spotify_tracks(plugin, items), ['sid1', None])
+        self.assertEqual(searched, ['Found', 'Lost'])
+
+        searched.clear()
+        self.assertEqual(self.transfer._resolve_spotify_tracks(plugin, items), ['sid1', None])
+        self.assertEqual(searched, [])
+
+        # Retagged items are searched again
+        items[1].title = 'Lost (Remastered)'
+        self.transfer._resolve_spotify_tracks(plugin, items)
+        self.assertEqual(searched, ['Lost (Remastered)'])
+
+    def test_failed_searches_are_not_cached_as_misses(self):
+        stored = []
+        cache = types.SimpleNamespace(
+            get_spotify_resolutions=lambda ids, ttl=7: {},
+            set_spotify_resolutions=stored.extend,
+        )
+
+        def failing_search(item):
+            raise RuntimeError('429 Too Many Requests')
+
+        plugin = types.SimpleNamespace(
+            _log=DummyLogger(),
+            cache=cache,
+            sp=types.SimpleNamespace(tracks=lambda ids: {'tracks': []}),
+            _search_spotify_track=failing_search,
+        )
+        items = [types.SimpleNamespace(id=1, title='T', artist='A', album='X')]
+
+        self.assertEqual(self.transfer._resolve_spotify_tracks(plugin, items), [None])
+        self.assertEqual(stored, [])
+        self.assertTrue(any(level == 'warning' for level, _ in plugin._log.messages))
+
 
 if __name__ == '__main__':
     unittest.main()
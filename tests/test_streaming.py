@@ -0,0 +1,127 @@
+import json
+import types
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from beetsplug.plex import smartplaylists as sp
+from beetsplug.plex import streaming
+
+
+class FakeServer:
+    def __init__(self, total):
+        self.total = total
+        self.pages = []
+
+    def query(self, key, headers=None):
+        start = int(headers["X-Plex-Container-Start"])
+        size = int(headers["X-Plex-Container-Size"])
+        self.pages.append((key, start, size))
+        container = ET.Element("MediaContainer", totalSize=str(self.total))
+        for key in range(start, min(start + size, self.total)):
+            track = ET.SubElement(container, "Track", ratingKey=str(key), year="1999",
+                                  userRating="8.0", lastViewedAt="1700000000")
+            ET.SubElement(track, "Genre", tag="Rock")
+        return container
+
+
+def test_iter_section_tracks_pages_until_total():
+    server = FakeServer(25)
+    records = list(streaming.iter_section_tracks(server, types.SimpleNamespace(key=3), page_size=10))
+
+    assert [r.ratingKey for r in records] == list(range(25))
+    assert [start for _, start, _ in server.pages] == [0, 10, 20]
+    assert server.pages[0][0] == "/library/sections/3/all?type=10"
+    record = records[0]
+    assert (record.year, record.userRating, record.genres[0].tag) == (1999, 8.0, "Rock")
+    assert record.lastViewedAt.year == 2023
+
+
+def test_reservoir_sample_keeps_cap_and_short_inputs():
+    sample = streaming.reservoir_sample(iter(range(1000)), 10, np.random.default_rng(1))
+    assert len(sample) == 10 and len(set(sample)) == 10
+    assert streaming.reservoir_sample(range(3), 10) == [0, 1, 2]
+
+
+def test_records_pass_through_playlist_filters():
+    records = list(streaming.iter_section_tracks(FakeServer(3), types.SimpleNamespace(key=1)))
+    ps = types.SimpleNamespace(_log=types.SimpleNamespace(debug=lambda *a, **k: None,
+                                                        error=lambda *a, **k: None))
+    kept = sp.apply_playlist_filters(ps, records, {"include": {"genres": ["rock"]}, "min_rating": 7})
+    assert len(kept) == 3
+    assert sp.apply_playlist_filters(ps, records, {"exclude": {"genres": ["rock"]}}) == []
+
+
+class FakeSection:
+    key = 7
+
+    def __init__(self, updated):
+        self.updatedAt = updated
+        self.calls = 0
+
+    def searchTracks(self, filters=None):
+        self.calls += 1
+        return [types.SimpleNamespace(ratingKey=key) for key in (4, 1, 3)]
+
+
+def test_filtered_search_is_cached_until_section_changes(tmp_path):
+    from datetime import datetime
+
+    from beetsplug.core.cache import Cache
+
+    log = types.SimpleNamespace(debug=lambda *a, **k: None)
+    ps = types.SimpleNamespace(
+        _log=log,
+        cache=Cache(str(tmp_path / "cache.db"), types.SimpleNamespace(_log=log)),
+        music=FakeSection(datetime.fromtimestamp(1000)),
+    )
+    filters = {"and": [{"track.userRating>>": 6}]}
+
+    sp._search_tracks_persistent(ps, filters, "key")
+    hit = sp._search_tracks_persistent(ps, filters, "key")
+    assert ps.music.calls == 1
+    assert [record.ratingKey for record in hit] == [4, 1, 3]
+
+    ps.music.updatedAt = datetime.fromtimestamp(2000)
+    sp._search_tracks_persistent(ps, filters, "key")
+    assert ps.music.calls == 2
+
+
+def test_volatile_filters_are_queried_fresh_on_every_run(tmp_path):
+    from datetime import datetime
+
+    from beetsplug.core.cache import Cache
+
+    class Section(FakeSection):
+        def __init__(self, updated):
+            super().__init__(updated)
+            self.queries = []
+            self.recent = [1]
+
+        def searchTracks(self, filters=None):
+            self.queries.append(filters)
+            if "lastViewedAt>>" in json.dumps(filters):
+                return [types.SimpleNamespace(ratingKey=key) for key in self.recent]
+            return super().searchTracks(filters)
+
+    log = types.SimpleNamespace(debug=lambda *a, **k: None)
+    cache = Cache(str(tmp_path / "cache.db"), types.SimpleNamespace(_log=log))
+    music = Section(datetime.fromtimestamp(1000))
+
+    def run(filters, exclusion_days):
+        ps = types.SimpleNamespace(_log=log, cache=cache, music=music, _server_query_cache={})
+        tracks = sp._get_library_tracks(ps, None, filters, exclusion_days)
+        return [track.ratingKey for track in tracks]
+
+    genre_filter = {"include": {"genres": ["Rock"]}}
+    assert run(genre_filter, 30) == [4, 3]
+    music.recent = [3]
+    # The genre query comes from the persistent cache, recent plays do not
+    assert run(genre_filter, 30) == [4, 1]
+    assert music.calls == 1
+    assert all("lastViewedAt" not in json.dumps(query) for query in music.queries[:1])
+
+    # Without a time-invariant filter the whole filter goes to the server
+    music.queries.clear()
+    run({}, 30)
+    assert music.queries == [{"and": [{"lastViewedAt<<": "-30d"}]}]